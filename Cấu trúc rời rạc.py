@@ -1,9 +1,24 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
-import json
 import math
-from collections import deque
-import heapq
+import time
+from contextlib import nullcontext
+
+from graph_core import Graph, fmt_num
+import algorithms
+from shortest_path import ShortestPathEngine, METHODS as PATH_METHODS
+from animation import AnimationPlayer, path_steps
+import max_flow
+import connectivity
+import graph_file
+import text_import
+import representations
+from virtual_view import VirtualView
+import viewport
+from highlight import HighlightState, DEFAULT
+from instrumentation import Profile
+from dynamic_forest import DynamicForest
+import layout
 
 # ================== CONSTANTS ==================
 RADIUS = 20
@@ -17,6 +32,11 @@ COLORS = {
     'mst': '#9B59B6',
     'current': '#E67E22'
 }
+EDGE_COLOR = '#34495E'
+# Vai trò màu xoay vòng khi tô từng nhóm (thành phần liên thông mạnh, song liên thông)
+GROUP_ROLES = ('bipartite1', 'bipartite2', 'visited', 'mst', 'path', 'current')
+# Nhịp tối thiểu (ms) giữa hai lần vẽ kết quả bố cục tự động
+LAYOUT_FRAME_MS = 50
 
 # ================== MAIN CLASS ==================
 class GraphVisualizer:
@@ -25,15 +45,31 @@ class GraphVisualizer:
         self.root.title("Graph Visualizer - Đồ Thị")
         self.root.geometry("1200x800")
         
-        self.vertices = []
-        self.edges = []
-        self.weights = {}
+        self.graph = Graph()
+        self.path_engine = ShortestPathEngine(self.graph)
+        self.cut_engine = max_flow.MinCutEngine(self.graph)
+        self.viewport = viewport.Viewport()
+        self.scene = viewport.Scene(self.graph)
+        self.detail = 'full'
+        self._redraw_job = None
+        self._pan_from = None
         self.vertex_items = []
         self.edge_items = {}
+        self.highlight = HighlightState()
+        self.step_ids = []
+        self.profile = None
+        self.last_profile = None
+        self.live = None
+        self._live_shown = False
+        self.layout_worker = None
+        self._layout_job = None
+        self._layout_versions = None
+        self._layout_view = None
         self.selected_vertex = None
         self.animation_speed = 500
-        self.is_directed = False
-        self.is_weighted = False
+        self.player = AnimationPlayer(self.root, self.apply_step_op, self.reset_colors,
+                                      self.on_animation_progress, self.flush_highlight)
+        self._seeking = False
         
         self.setup_ui()
         
@@ -46,9 +82,22 @@ class GraphVisualizer:
         file_menu.add_command(label="New Graph", command=self.clear_graph)
         file_menu.add_command(label="Save Graph", command=self.save_graph)
         file_menu.add_command(label="Load Graph", command=self.load_graph)
+        file_menu.add_command(label="Import Edge List...", command=lambda: self.import_text("edges"))
+        file_menu.add_command(label="Import Adjacency List...", command=lambda: self.import_text("adjacency"))
+        file_menu.add_command(label="Export Profile...", command=self.export_profile)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
         
+        view_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="View", menu=view_menu)
+        view_menu.add_command(label="Zoom In", command=lambda: self.zoom_center(viewport.ZOOM_STEP))
+        view_menu.add_command(label="Zoom Out", command=lambda: self.zoom_center(1 / viewport.ZOOM_STEP))
+        view_menu.add_command(label="Fit to Window", command=self.fit_view)
+        view_menu.add_command(label="Reset Zoom (100%)", command=self.reset_view)
+        view_menu.add_separator()
+        view_menu.add_command(label="Force-Directed Layout", command=self.start_layout)
+        view_menu.add_command(label="Stop Layout", command=self.stop_layout)
+        
         main_container = tk.Frame(self.root)
         main_container.pack(fill=tk.BOTH, expand=True)
         
@@ -64,6 +113,15 @@ class GraphVisualizer:
         self.canvas.bind("<Button-1>", self.on_click)
         self.canvas.bind("<Button-3>", self.on_right_click)
         self.canvas.bind("<B1-Motion>", self.on_drag)
+        # Chỉ vẽ phần trong khung nhìn nên phải vẽ lại khi cửa sổ đổi kích thước
+        self.canvas.bind("<Configure>", lambda e: self.schedule_redraw())
+        # Thu phóng bằng con lăn, kéo chuột giữa (hoặc Shift + chuột trái) để dời khung nhìn
+        self.canvas.bind("<MouseWheel>", self.on_wheel)
+        self.canvas.bind("<Button-4>", self.on_wheel)
+        self.canvas.bind("<Button-5>", self.on_wheel)
+        for press, motion in (("<ButtonPress-2>", "<B2-Motion>"), ("<Shift-ButtonPress-1>", "<Shift-B1-Motion>")):
+            self.canvas.bind(press, self.on_pan_start)
+            self.canvas.bind(motion, self.on_pan)
         
         self.setup_controls(left_panel)
         
@@ -79,21 +137,53 @@ class GraphVisualizer:
         tk.Checkbutton(settings_frame, text="Có trọng số", variable=self.weighted_var,
                       command=self.toggle_weighted, bg='#f0f0f0').pack(anchor=tk.W, padx=5, pady=2)
         
+        self.profile_var = tk.BooleanVar()
+        tk.Checkbutton(settings_frame, text="Đo hiệu năng", variable=self.profile_var,
+                      bg='#f0f0f0').pack(anchor=tk.W, padx=5, pady=2)
+        self.profile_memory_var = tk.BooleanVar()
+        tk.Checkbutton(settings_frame, text="Đo cả bộ nhớ đỉnh (chậm hơn)", variable=self.profile_memory_var,
+                      bg='#f0f0f0').pack(anchor=tk.W, padx=5, pady=2)
+        
         speed_frame = tk.Frame(settings_frame, bg='#f0f0f0')
         speed_frame.pack(fill=tk.X, padx=5, pady=5)
-        # tk.Label(speed_frame, text="Tốc độ:", bg='#f0f0f0').pack(side=tk.LEFT)
-        # self.speed_scale = tk.Scale(speed_frame, from_=100, to=1000, orient=tk.HORIZONTAL,
-        #                            command=self.update_speed, bg='#f0f0f0')
-        # self.speed_scale.set(500)
-        # self.speed_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        tk.Label(speed_frame, text="Tốc độ:", bg='#f0f0f0').pack(side=tk.LEFT)
+        self.speed_scale = tk.Scale(speed_frame, from_=0, to=1000, orient=tk.HORIZONTAL,
+                                   command=self.update_speed, bg='#f0f0f0')
+        self.speed_scale.set(500)
+        self.speed_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        play_frame = tk.LabelFrame(parent, text="Hoạt Ảnh", bg='#f0f0f0', font=('Arial', 10, 'bold'))
+        play_frame.pack(fill=tk.X, padx=10, pady=5)
+        buttons = tk.Frame(play_frame, bg='#f0f0f0')
+        buttons.pack(fill=tk.X, padx=5, pady=2)
+        tk.Button(buttons, text="⏯", command=self.player.toggle_pause, width=3).pack(side=tk.LEFT, expand=True, fill=tk.X)
+        tk.Button(buttons, text="⏭ Bước", command=self.player.step).pack(side=tk.LEFT, expand=True, fill=tk.X)
+        tk.Button(buttons, text="⏩ Kết quả", command=self.player.skip_to_end).pack(side=tk.LEFT, expand=True, fill=tk.X)
+        self.seek_scale = tk.Scale(play_frame, from_=0, to=0, orient=tk.HORIZONTAL, showvalue=False,
+                                   command=self.on_seek, bg='#f0f0f0')
+        self.seek_scale.pack(fill=tk.X, padx=5)
+        self.skip_var = tk.BooleanVar()
+        tk.Checkbutton(play_frame, text="Bỏ qua hoạt ảnh", variable=self.skip_var,
+                      command=self.toggle_skip, bg='#f0f0f0').pack(anchor=tk.W, padx=5)
         
         basic_frame = tk.LabelFrame(parent, text="Thao Tác Cơ Bản", bg='#f0f0f0', font=('Arial', 10, 'bold'))
         basic_frame.pack(fill=tk.X, padx=10, pady=5)
         tk.Button(basic_frame, text="Xóa đồ thị", command=self.clear_graph, bg='#E74C3C', fg='white').pack(fill=tk.X, padx=5, pady=2)
         tk.Button(basic_frame, text="Xóa đỉnh chọn", command=self.delete_selected, bg='#E67E22', fg='white').pack(fill=tk.X, padx=5, pady=2)
+        self.live_var = tk.BooleanVar()
+        tk.Checkbutton(basic_frame, text="Phân tích trực tiếp (liên thông, cây khung)", variable=self.live_var,
+                      command=self.toggle_live, bg='#f0f0f0', wraplength=200, justify=tk.LEFT).pack(anchor=tk.W, padx=5)
+        self.live_label = tk.Label(basic_frame, text="", bg='#f0f0f0', justify=tk.LEFT, wraplength=200)
+        self.live_label.pack(anchor=tk.W, padx=5)
         
         path_frame = tk.LabelFrame(parent, text="Đường Đi Ngắn Nhất", bg='#f0f0f0', font=('Arial', 10, 'bold'))
         path_frame.pack(fill=tk.X, padx=10, pady=5)
+        self.path_algo_var = tk.StringVar(value="Dijkstra")
+        ttk.Combobox(path_frame, textvariable=self.path_algo_var, values=list(PATH_METHODS),
+                     state="readonly").pack(fill=tk.X, padx=5, pady=2)
+        self.apsp_var = tk.BooleanVar()
+        tk.Checkbutton(path_frame, text="Tính trước mọi cặp đỉnh", variable=self.apsp_var,
+                      bg='#f0f0f0').pack(anchor=tk.W, padx=5, pady=2)
         tk.Button(path_frame, text="Tìm đường đi ngắn nhất ", command=self.run_shortest_path, 
                  bg='#27AE60', fg='white', wraplength=200).pack(fill=tk.X, padx=5, pady=2)
         
@@ -103,6 +193,10 @@ class GraphVisualizer:
                  bg='#3498DB', fg='white', wraplength=200).pack(fill=tk.X, padx=5, pady=2)
         tk.Button(traversal_frame, text="DFS (Duyệt theo chiều sâu)", command=self.run_dfs, 
                  bg='#9B59B6', fg='white', wraplength=200).pack(fill=tk.X, padx=5, pady=2)
+        tk.Button(traversal_frame, text="Thành phần liên thông mạnh (Tarjan)", command=self.run_scc, 
+                 bg='#2980B9', fg='white', wraplength=200).pack(fill=tk.X, padx=5, pady=2)
+        tk.Button(traversal_frame, text="Cầu, đỉnh khớp, song liên thông", command=self.run_biconnected, 
+                 bg='#8E44AD', fg='white', wraplength=200).pack(fill=tk.X, padx=5, pady=2)
         
         bipartite_frame = tk.LabelFrame(parent, text="Đồ Thị 2 Phía", bg='#f0f0f0', font=('Arial', 10, 'bold'))
         bipartite_frame.pack(fill=tk.X, padx=10, pady=5)
@@ -124,6 +218,13 @@ class GraphVisualizer:
                  bg='#8E44AD', fg='white', wraplength=200).pack(fill=tk.X, padx=5, pady=2)
         tk.Button(advanced_frame, text="7.2 Kruskal (Cây khung)", command=self.run_kruskal, 
                  bg='#9B59B6', fg='white', wraplength=200).pack(fill=tk.X, padx=5, pady=2)
+        self.flow_algo_var = tk.StringVar(value="Dinic")
+        ttk.Combobox(advanced_frame, textvariable=self.flow_algo_var, values=list(max_flow.METHODS),
+                     state="readonly").pack(fill=tk.X, padx=5, pady=2)
+        self.gomory_hu_var = tk.BooleanVar()
+        tk.Checkbutton(advanced_frame, text="Lát cắt mọi cặp đỉnh (cây Gomory-Hu, đồ thị vô hướng)",
+                      variable=self.gomory_hu_var, bg='#f0f0f0', wraplength=200,
+                      justify=tk.LEFT).pack(anchor=tk.W, padx=5, pady=2)
         tk.Button(advanced_frame, text="7.3 Ford-Fulkerson (Luồng)", command=self.run_ford_fulkerson, 
                  bg='#C0392B', fg='white', wraplength=200).pack(fill=tk.X, padx=5, pady=2)
         tk.Button(advanced_frame, text="7.4 Fleury (Kiểm tra Euler)", command=self.check_euler, 
@@ -132,655 +233,873 @@ class GraphVisualizer:
                  bg='#D35400', fg='white', wraplength=200).pack(fill=tk.X, padx=5, pady=2)
         
     def clear_graph(self):
-        self.vertices = []
-        self.edges = []
-        self.weights = {}
+        self.player.stop()
+        self.stop_layout()
+        self.graph.clear()
+        self.highlight.clear()
         self.vertex_items = []
         self.edge_items = {}
         self.selected_vertex = None
         self.canvas.delete("all")
+        self.rebuild_live()
         
     def toggle_directed(self):
-        self.is_directed = self.directed_var.get()
+        self.player.stop()
+        self.graph.set_directed(self.directed_var.get())
         self.redraw_graph()
+        self.update_live(full=True)
         
     def toggle_weighted(self):
-        self.is_weighted = self.weighted_var.get()
+        self.graph.weighted = self.weighted_var.get()
         self.redraw_graph()
         
     def update_speed(self, val):
         self.animation_speed = int(val)
+        self.player.set_speed(self.animation_speed)
+        
+    def toggle_skip(self):
+        self.player.skip = self.skip_var.get()
+        
+    def on_seek(self, val):
+        if not self._seeking:
+            self.player.pause()
+            self.player.seek(int(val))
+            
+    def on_animation_progress(self, pos, total):
+        if hasattr(self, 'seek_scale'):
+            self._seeking = True
+            self.seek_scale.config(to=total)
+            self.seek_scale.set(pos)
+            self._seeking = False
+            
+    def apply_step_op(self, op):
+        ids = self.step_ids
+        # Chỉ ghi vào trạng thái; bộ phát gọi flush_highlight sau mỗi khung hình
+        if op[0] == 'v':
+            self.highlight.set_vertex(ids[op[1]], op[2])
+        else:
+            for eid in self.graph.edge_ids(ids[op[1]], ids[op[2]]):
+                self.highlight.set_edge(eid, op[3], op[4])
+            
+    def algorithm_csr(self):
+        # Thuật toán chạy trên chỉ số liên tục của CSR; giữ bảng đổi về mã đỉnh để tô màu
+        csr = self.graph.csr()
+        self.step_ids = csr.ids
+        return csr
+        
+    def ask_vertex(self, title, prompt, last=False):
+        # Hỏi mã đỉnh và trả về chỉ số liên tục tương ứng, None nếu không hợp lệ
+        with self.phase('preprocessing'):
+            csr = self.graph.csr()
+        v = simpledialog.askinteger(title, prompt, initialvalue=csr.ids[-1] if last else csr.ids[0])
+        if v is None or not self.graph.is_vertex(v):
+            return None
+        return csr.dense_of[v]
+        
+    def labels(self, seq):
+        return [self.step_ids[i] for i in seq]
         
     def find_vertex(self, x, y):
-        for i, (vx, vy) in enumerate(self.vertices):
-            if math.hypot(vx - x, vy - y) <= RADIUS:
-                return i
-        return None
+        return self.graph.find_vertex(x, y, RADIUS)
         
     def on_click(self, event):
-        v = self.find_vertex(event.x, event.y)
+        x, y = self.viewport.to_world(event.x, event.y)
+        v = self.find_vertex(x, y)
         
         if v is None:
-            self.vertices.append((event.x, event.y))
-            self.draw_vertex(event.x, event.y, len(self.vertices) - 1)
+            idx = self.graph.add_vertex(x, y)
+            self.draw_vertex(x, y, idx)
+            if self.live:
+                self.live.add_vertex(idx)
+                self.update_live()
         else:
             if self.selected_vertex is None:
                 self.selected_vertex = v
-                self.highlight_vertex(v, COLORS['selected'])
+                self.highlight_vertex(v, 'selected')
             else:
                 if self.selected_vertex != v:
-                    edge = (self.selected_vertex, v)
-                    if edge not in self.edges and (not self.is_directed or (v, self.selected_vertex) not in self.edges):
-                        self.edges.append(edge)
-                        
-                        if self.is_weighted:
+                    if not self.graph.has_edge(self.selected_vertex, v):
+                        weight = None
+                        if self.graph.weighted:
                             weight = simpledialog.askinteger("Trọng số cạnh", "Nhập trọng số:", initialvalue=1)
                             if weight is None:
                                 weight = 1
-                            self.weights[edge] = weight
-                        
-                        self.draw_edge(self.selected_vertex, v)
+                        eid = self.graph.add_edge(self.selected_vertex, v, weight)
+                        self.draw_edge(eid)
+                        if self.live:
+                            self.live.add_edge(eid)
+                    elif self.graph.weighted:
+                        # Chọn lại hai đầu của cạnh đã có: đổi trọng số
+                        self.reweight_edge(self.graph.edge_ids(self.selected_vertex, v)[0])
                 
-                self.highlight_vertex(self.selected_vertex, COLORS['default'])
+                self.highlight_vertex(self.selected_vertex, DEFAULT)
                 self.selected_vertex = None
+                self.update_live()
+                
+    def reweight_edge(self, eid):
+        weight = simpledialog.askinteger("Trọng số cạnh", "Nhập trọng số mới:",
+                                         initialvalue=self.graph.edge_weight(eid))
+        if weight is None:
+            return
+        self.graph.set_edge_weight(eid, weight)
+        items = self.edge_items.get(eid)
+        if items and len(items) > 1:
+            self.canvas.itemconfig(items[1], text=str(weight))
+        else:
+            self.schedule_redraw()
+        if self.live:
+            self.live.reweight(eid)
                 
     def on_right_click(self, event):
-        v = self.find_vertex(event.x, event.y)
+        v = self.find_vertex(*self.viewport.to_world(event.x, event.y))
         if v is not None:
             self.selected_vertex = v
-            self.highlight_vertex(v, COLORS['selected'])
+            self.highlight_vertex(v, 'selected')
             
     def delete_selected(self):
+        # Chỉ xóa đỉnh và các cạnh liên thuộc; mã các đỉnh khác giữ nguyên
         if self.selected_vertex is not None:
             v = self.selected_vertex
-            self.vertices.pop(v)
-            self.edges = [(u if u < v else u-1, w if w < v else w-1) 
-                         for u, w in self.edges if u != v and w != v]
-            
-            new_weights = {}
-            for (u, w), weight in self.weights.items():
-                if u != v and w != v:
-                    new_u = u if u < v else u-1
-                    new_w = w if w < v else w-1
-                    new_weights[(new_u, new_w)] = weight
-            self.weights = new_weights
-            
+            self.player.stop()
+            removed = self.graph.remove_vertex(v)
             self.selected_vertex = None
-            self.redraw_graph()
+            self.highlight.discard(v, removed)
+            
+            if self.graph.needs_compaction():
+                # Mã đỉnh/cạnh bị đánh số lại nên bỏ trạng thái tô màu cũ
+                self.graph.compact()
+                self.highlight.clear()
+                self.redraw_graph()
+                self.rebuild_live()
+                return
+            if self.live:
+                self.live.remove_vertex(v, removed)
+                self.update_live()
+            if self.detail == 'cluster':
+                self.schedule_redraw()
+                return
+            for item in self.vertex_items[v] or ():
+                if item is not None:
+                    self.canvas.delete(item)
+            self.vertex_items[v] = None
+            for eid in removed:
+                for item in self.edge_items.pop(eid, ()):
+                    self.canvas.delete(item)
             
-    def draw_vertex(self, x, y, idx, color=None):
-        if color is None:
-            color = COLORS['default']
-        oval = self.canvas.create_oval(x - RADIUS, y - RADIUS, x + RADIUS, y + RADIUS,
-                                      fill=color, outline='#2C3E50', width=2)
-        text = self.canvas.create_text(x, y, text=str(idx), font=('Arial', 12, 'bold'), fill='white')
-        self.vertex_items.append((oval, text))
+    def draw_vertex(self, x, y, idx):
+        # x, y là tọa độ thế giới; màu lấy từ trạng thái tô, nhãn chỉ vẽ ở mức chi tiết đầy đủ
+        if self.detail == 'cluster':
+            self.schedule_redraw()
+            return
+        role = self.highlight.vertex(idx)
+        sx, sy = self.viewport.to_screen(x, y)
+        r = max(2, RADIUS * self.viewport.scale)
+        oval = self.canvas.create_oval(sx - r, sy - r, sx + r, sy + r,
+                                      fill=COLORS[role], outline='#2C3E50', width=2 if self.detail == 'full' else 1,
+                                      tags=self.item_tags('vertex', role))
+        text = None
+        if self.detail == 'full':
+            text = self.canvas.create_text(sx, sy, text=str(idx), font=('Arial', self.font_size(12), 'bold'), fill='white',
+                                           tags='label')
+        if idx == len(self.vertex_items):
+            self.vertex_items.append((oval, text))
+        else:
+            self.vertex_items[idx] = (oval, text)
+        
+    def font_size(self, size):
+        return max(6, round(size * self.viewport.scale))
         
-    def draw_edge(self, u, v, color='#34495E', width=2):
-        x1, y1 = self.vertices[u]
-        x2, y2 = self.vertices[v]
+    def edge_coords(self, u, v):
+        x1, y1 = self.viewport.to_screen(*self.graph.vertices[u])
+        x2, y2 = self.viewport.to_screen(*self.graph.vertices[v])
         
-        if self.is_directed:
+        if self.graph.directed:
+            r = RADIUS * self.viewport.scale
             angle = math.atan2(y2 - y1, x2 - x1)
-            x2_adj = x2 - RADIUS * math.cos(angle)
-            y2_adj = y2 - RADIUS * math.sin(angle)
-            line = self.canvas.create_line(x1, y1, x2_adj, y2_adj, width=width, fill=color, arrow=tk.LAST)
+            x2 -= r * math.cos(angle)
+            y2 -= r * math.sin(angle)
+        return x1, y1, x2, y2
+        
+    def edge_label_coords(self, u, v):
+        x1, y1 = self.viewport.to_screen(*self.graph.vertices[u])
+        x2, y2 = self.viewport.to_screen(*self.graph.vertices[v])
+        return (x1 + x2) / 2, (y1 + y2) / 2
+        
+    def draw_edge(self, eid):
+        if self.detail == 'cluster':
+            self.schedule_redraw()
+            return
+        role, width = self.highlight.edge(eid)
+        color = EDGE_COLOR if role == DEFAULT else COLORS[role]
+        if width is None:
+            width = self.edge_width()
+        u, v = self.graph.edges[eid]
+        tags = self.item_tags('edge', role)
+        if self.graph.directed:
+            line = self.canvas.create_line(*self.edge_coords(u, v), width=width, fill=color, arrow=tk.LAST, tags=tags)
         else:
-            line = self.canvas.create_line(x1, y1, x2, y2, width=width, fill=color)
-        
-        self.edge_items[(u, v)] = [line]
-        
-        if self.is_weighted and (u, v) in self.weights:
-            mx, my = (x1 + x2) / 2, (y1 + y2) / 2
-            weight_text = self.canvas.create_text(mx, my, text=str(self.weights[(u, v)]),
-                                                 font=('Arial', 10, 'bold'), fill='#E74C3C', bg='white')
-            self.edge_items[(u, v)].append(weight_text)
-            
-    def highlight_vertex(self, idx, color):
-        if idx < len(self.vertex_items):
-            oval, _ = self.vertex_items[idx]
-            self.canvas.itemconfig(oval, fill=color)
-            
-    def highlight_edge(self, u, v, color, width=3):
-        if (u, v) in self.edge_items:
-            for item in self.edge_items[(u, v)]:
-                if self.canvas.type(item) == 'line':
-                    self.canvas.itemconfig(item, fill=color, width=width)
-        elif not self.is_directed and (v, u) in self.edge_items:
-            for item in self.edge_items[(v, u)]:
-                if self.canvas.type(item) == 'line':
-                    self.canvas.itemconfig(item, fill=color, width=width)
+            line = self.canvas.create_line(*self.edge_coords(u, v), width=width, fill=color, tags=tags)
+        
+        self.edge_items[eid] = [line]
+        
+        weight = self.graph.edge_weights[eid]
+        if self.graph.weighted and weight is not None and self.detail == 'full':
+            mx, my = self.edge_label_coords(u, v)
+            weight_text = self.canvas.create_text(mx, my, text=str(weight),
+                                                 font=('Arial', self.font_size(10), 'bold'), fill='#E74C3C',
+                                                 tags='label')
+            self.edge_items[eid].append(weight_text)
+            
+    def edge_width(self):
+        return 2 if self.detail == 'full' else 1
+        
+    @staticmethod
+    def item_tags(kind, role):
+        # Tag theo loại ("vertex"/"edge"/"label") và theo vai trò; phần tử đang được tô
+        # có thêm "<loại>:hl" để xóa màu cả nhóm bằng một lệnh
+        if role == DEFAULT:
+            return (kind, f"{kind}:{DEFAULT}")
+        return (kind, f"{kind}:{role}", f"{kind}:hl")
+        
+    def highlight_vertex(self, idx, role):
+        self.highlight.set_vertex(idx, role)
+        self.flush_highlight()
+            
+    def flush_highlight(self):
+        # Chỉ cập nhật các item có vai trò khác lần vẽ trước; item ngoài khung nhìn
+        # sẽ lấy màu từ trạng thái khi được vẽ lại
+        with self.phase('render', memory=False):
+            changed_v, changed_e = self.highlight.flush()
+            if self.profile:
+                self.profile.count('canvas_updates', len(changed_v) + len(changed_e))
+            items = self.vertex_items
+            for v, role in changed_v:
+                if v < len(items) and items[v] is not None:
+                    self.canvas.itemconfig(items[v][0], fill=COLORS[role], tags=self.item_tags('vertex', role))
+            for eid, role, width in changed_e:
+                edge = self.edge_items.get(eid)
+                if edge:
+                    self.canvas.itemconfig(edge[0], fill=EDGE_COLOR if role == DEFAULT else COLORS[role],
+                                           width=self.edge_width() if width is None else width,
+                                           tags=self.item_tags('edge', role))
                     
     def reset_colors(self):
-        for i in range(len(self.vertices)):
-            self.highlight_vertex(i, COLORS['default'])
-        for edge in self.edge_items:
-            self.highlight_edge(edge[0], edge[1], '#34495E', 2)
+        # Vài lệnh theo tag cho mọi phần tử đang được tô, không lặp từng item
+        self.highlight.clear()
+        self._live_shown = False
+        self.canvas.itemconfig('vertex:hl', fill=COLORS[DEFAULT], tags=('vertex', f"vertex:{DEFAULT}"))
+        self.canvas.itemconfig('edge:hl', fill=EDGE_COLOR, width=self.edge_width(), tags=('edge', f"edge:{DEFAULT}"))
             
     def redraw_graph(self):
+        # Chỉ tạo item cho phần nằm trong khung nhìn, mức chi tiết theo tỉ lệ và số phần tử
         self.canvas.delete("all")
-        self.vertex_items = []
+        self.vertex_items = [None] * len(self.graph.vertices)
         self.edge_items = {}
         
-        for u, v in self.edges:
-            self.draw_edge(u, v)
-        for i, (x, y) in enumerate(self.vertices):
-            self.draw_vertex(x, y, i)
-            
-    def build_adj_list(self):
-        adj = {i: [] for i in range(len(self.vertices))}
-        for u, v in self.edges:
-            adj[u].append(v)
-            if not self.is_directed:
-                adj[v].append(u)
-        return adj
+        width, height = self.canvas_size()
+        rect = self.viewport.world_rect(width, height, RADIUS * self.viewport.scale)
+        ids = sorted(self.graph.spatial.query(*rect))
+        csr, xs, ys = self.scene.arrays()
+        edges = viewport.visible_edges(csr, xs, ys, rect)
+        self.detail = self.viewport.level(len(ids), len(edges))
+        
+        if self.detail == 'cluster':
+            self.draw_clusters(csr, ids, edges)
+            return
+        for e in edges:
+            self.draw_edge(csr.edge_ids[e])
+        for i in ids:
+            p = self.graph.vertices[i]
+            self.draw_vertex(p[0], p[1], i)
+            
+    def draw_clusters(self, csr, ids, edges):
+        # Mức xa nhất: mỗi ô lưới màn hình một chấm, cạnh giữa các ô gộp làm một
+        points = self.graph.vertices
+        groups, key = viewport.clusters(self.viewport, points, ids)
+        cell = viewport.CLUSTER_PX / self.viewport.scale
+        
+        def center(k):
+            g = groups.get(k)
+            if g is None:
+                return (k[0] + 0.5) * cell, (k[1] + 0.5) * cell
+            return g[0] / g[2], g[1] / g[2]
+        
+        # Đếm số cạnh giữa mỗi cặp ô; quá nhiều cặp thì chỉ giữ các cặp nhiều cạnh nhất
+        pairs = {}
+        for e in edges:
+            ku = key(*points[csr.ids[csr.eu[e]]])
+            kv = key(*points[csr.ids[csr.ev[e]]])
+            if ku != kv:
+                pair = (ku, kv) if ku < kv else (kv, ku)
+                pairs[pair] = pairs.get(pair, 0) + 1
+        if len(pairs) > viewport.MAX_CLUSTER_EDGES:
+            pairs = sorted(pairs, key=pairs.get, reverse=True)[:viewport.MAX_CLUSTER_EDGES]
+        for ku, kv in pairs:
+            self.canvas.create_line(*self.viewport.to_screen(*center(ku)), *self.viewport.to_screen(*center(kv)),
+                                    fill='#95A5A6', width=1)
+        for k, g in groups.items():
+            sx, sy = self.viewport.to_screen(*center(k))
+            r = min(viewport.CLUSTER_PX / 2, 2 + 1.5 * math.log2(g[2] + 1))
+            self.canvas.create_oval(sx - r, sy - r, sx + r, sy + r, fill=COLORS['default'], outline='')
+            
+    def canvas_size(self):
+        return max(1, self.canvas.winfo_width()), max(1, self.canvas.winfo_height())
+        
+    def schedule_redraw(self):
+        # Gộp nhiều yêu cầu vẽ lại (cuộn, kéo) thành một lần khi rảnh
+        if self._redraw_job is None:
+            self._redraw_job = self.root.after_idle(self._redraw_idle)
+            
+    def _redraw_idle(self):
+        self._redraw_job = None
+        self.redraw_graph()
+        
+    def on_wheel(self, event):
+        factor = viewport.ZOOM_STEP if event.num == 4 or getattr(event, 'delta', 0) > 0 else 1 / viewport.ZOOM_STEP
+        self.viewport.zoom_at(event.x, event.y, factor)
+        self.schedule_redraw()
+        
+    def zoom_center(self, factor):
+        width, height = self.canvas_size()
+        self.viewport.zoom_at(width / 2, height / 2, factor)
+        self.schedule_redraw()
+        
+    def fit_view(self):
+        self.viewport.fit(self.graph.vertices, *self.canvas_size())
+        self.schedule_redraw()
+        
+    def reset_view(self):
+        self.viewport.reset()
+        self.schedule_redraw()
+        
+    def on_pan_start(self, event):
+        self._pan_from = (event.x, event.y)
+        
+    def on_pan(self, event):
+        if self._pan_from is None:
+            return
+        self.viewport.pan(event.x - self._pan_from[0], event.y - self._pan_from[1])
+        self._pan_from = (event.x, event.y)
+        self.schedule_redraw()
+    
+    # ================== PHÂN TÍCH TRỰC TIẾP ==================
+    def toggle_live(self):
+        # Giữ rừng khung nhỏ nhất và số thành phần liên thông, cập nhật theo từng lần sửa
+        if self.live_var.get():
+            self.live = DynamicForest(self.graph)
+            self.update_live(full=True)
+            return
+        if self._live_shown:
+            for eid in self.live.tree:
+                self.highlight.set_edge(eid, DEFAULT)
+            self.flush_highlight()
+        self.live = None
+        self.live_label.config(text="")
+        
+    def rebuild_live(self):
+        # Đồ thị mới hoặc bị đánh số lại: dựng lại từ đầu
+        if self.live is not None:
+            self.live = DynamicForest(self.graph)
+            self.update_live(full=True)
+            
+    def update_live(self, full=False):
+        # Chỉ tô lại các cạnh vừa vào/ra khỏi rừng khung; tô lại toàn bộ khi màu đã bị
+        # xóa (chạy thuật toán khác) hoặc khi đổi có hướng/vô hướng
+        if self.live is None:
+            return
+        changes = self.live.take_changes()
+        if self.graph.directed:
+            # Cây khung nhỏ nhất chỉ có nghĩa với đồ thị vô hướng; vẫn đếm liên thông yếu
+            if full and self._live_shown:
+                for eid in self.live.tree:
+                    self.highlight.set_edge(eid, DEFAULT)
+            self._live_shown = False
+            self.live_label.config(text=f"Thành phần liên thông yếu: {self.live.num_components()}")
+        else:
+            if full or not self._live_shown:
+                changes = [(eid, True) for eid in self.live.tree]
+                self._live_shown = True
+            for eid, inside in changes:
+                if self.graph.edges[eid] is not None:
+                    self.highlight.set_edge(eid, 'mst' if inside else DEFAULT, 4 if inside else None)
+            self.live_label.config(text=f"Thành phần liên thông: {self.live.num_components()}\n"
+                                        f"Rừng khung nhỏ nhất: {len(self.live.tree)} cạnh, "
+                                        f"tổng trọng số {fmt_num(self.live.total)}")
+        self.flush_highlight()
+    
+    # ================== BỐ CỤC TỰ ĐỘNG ==================
+    def start_layout(self):
+        # Tính trong luồng nền; giao diện chỉ lấy kết quả mới nhất theo nhịp vẽ của nó
+        if self.graph.num_vertices() == 0:
+            messagebox.showwarning("Cảnh báo", "Đồ thị rỗng!")
+            return
+        self.stop_layout()
+        csr = self.graph.csr()
+        points = [self.graph.vertices[i] for i in csr.ids]
+        self.layout_worker = layout.LayoutWorker(csr, [p[0] for p in points], [p[1] for p in points])
+        self._layout_versions = (self.graph.version, self.graph.layout_version)
+        self._layout_view = None
+        self.layout_worker.start()
+        self._layout_job = self.root.after(LAYOUT_FRAME_MS, self._poll_layout)
+        
+    def stop_layout(self):
+        if self.layout_worker is not None:
+            self.layout_worker.stop()
+            self.layout_worker = None
+        if self._layout_job is not None:
+            self.root.after_cancel(self._layout_job)
+            self._layout_job = None
+            
+    def _poll_layout(self):
+        self._layout_job = None
+        worker = self.layout_worker
+        if (self.graph.version, self.graph.layout_version) != self._layout_versions:
+            # Đồ thị bị sửa hoặc đỉnh bị kéo trong lúc chạy: dừng, giữ vị trí hiện tại
+            self.stop_layout()
+            return
+        done = worker.done
+        latest = worker.latest()
+        began = time.perf_counter()
+        if latest is not None:
+            self.graph.set_positions(worker.csr.ids, latest[1], latest[2])
+            self._layout_versions = (self.graph.version, self.graph.layout_version)
+            # Khớp khung nhìn theo bố cục cho tới khi người dùng tự thu phóng/dời khung nhìn;
+            # từ đó giữ nguyên khung nhìn của người dùng
+            view = (self.viewport.scale, self.viewport.ox, self.viewport.oy)
+            if self._layout_view in (None, view):
+                self.viewport.fit(self.graph.vertices, *self.canvas_size())
+                self._layout_view = (self.viewport.scale, self.viewport.ox, self.viewport.oy)
+            else:
+                self._layout_view = False
+            self.redraw_graph()
+        if done:
+            self.layout_worker = None
+            return
+        # Vẽ lâu (đồ thị lớn) thì giãn nhịp: việc vẽ chiếm tối đa khoảng 1/5 thời gian,
+        # phần còn lại dành cho luồng tính và thao tác của người dùng
+        delay = max(LAYOUT_FRAME_MS, round(4000 * (time.perf_counter() - began)))
+        self._layout_job = self.root.after(delay, self._poll_layout)
     
     # ================== CÂU 3: SHORTEST PATH ==================
     def run_shortest_path(self):
-        if not self.vertices:
+        n = self.graph.num_vertices()
+        if n == 0:
             messagebox.showwarning("Cảnh báo", "Đồ thị rỗng!")
             return
             
-        start = simpledialog.askinteger("Đường đi ngắn nhất", "Nhập đỉnh bắt đầu:", initialvalue=0)
-        end = simpledialog.askinteger("Đường đi ngắn nhất", "Nhập đỉnh kết thúc:", initialvalue=len(self.vertices)-1)
+        start = self.ask_vertex("Đường đi ngắn nhất", "Nhập đỉnh bắt đầu:")
+        end = self.ask_vertex("Đường đi ngắn nhất", "Nhập đỉnh kết thúc:", last=True)
         
-        if start is None or end is None or start >= len(self.vertices) or end >= len(self.vertices):
+        if start is None or end is None:
             return
+        # Chỉ bắt đầu đo sau khi đã có dữ liệu hợp lệ
+        stats = self.begin_profile(f"Đường đi ngắn nhất ({self.path_algo_var.get()})")
+        with self.phase('preprocessing'):
+            self.algorithm_csr()
             
-        adj = self.build_adj_list()
-        dist = [float("inf")] * len(self.vertices)
-        prev = [None] * len(self.vertices)
-        dist[start] = 0
-        q = deque([start])
-        
-        while q:
-            u = q.popleft()
-            for v in adj[u]:
-                if dist[v] == float("inf"):
-                    dist[v] = dist[u] + 1
-                    prev[v] = u
-                    q.append(v)
-                    
-        if dist[end] == float("inf"):
-            messagebox.showinfo("Kết quả", "Không có đường đi!")
+        method = PATH_METHODS[self.path_algo_var.get()]
+        try:
+            if self.apsp_var.get() and method != "bfs":
+                with self.phase('preprocessing'):
+                    self.path_engine.ensure_all_pairs()
+            with self.phase('compute'):
+                dist, path, settled = self.path_engine.query(start, end, method, stats)
+        except ValueError as e:
+            self.profile = None
+            messagebox.showerror("Lỗi", str(e))
+            return
+        if path is None:
+            self.show_result("Kết quả", "Không có đường đi!")
             return
             
+        result = f"Độ dài: {fmt_num(dist)}\nĐường đi: {' → '.join(map(str, self.labels(path)))}"
+        if settled is not None:
+            result += f"\nSố đỉnh đã xét: {settled}/{n}"
         self.reset_colors()
-        path = []
-        cur = end
-        while cur is not None:
-            path.append(cur)
-            cur = prev[cur]
-        path.reverse()
-        
-        for i in range(len(path)):
-            self.highlight_vertex(path[i], COLORS['path'])
-            if i > 0:
-                self.highlight_edge(path[i-1], path[i], COLORS['path'], 4)
-            self.root.update()
-            self.root.after(self.animation_speed)
-            
-        messagebox.showinfo("Kết quả", f"Độ dài: {dist[end]}\nĐường đi: {' → '.join(map(str, path))}")
+        self.player.start(path_steps(path, 'path'), lambda: self.show_result("Kết quả", result))
     
     # ================== CÂU 4: TRAVERSAL ==================
     def run_bfs(self):
-        if not self.vertices:
+        n = self.graph.num_vertices()
+        if n == 0:
             messagebox.showwarning("Cảnh báo", "Đồ thị rỗng!")
             return
             
-        start = simpledialog.askinteger("BFS", "Nhập đỉnh bắt đầu:", initialvalue=0)
-        if start is None or start >= len(self.vertices):
+        start = self.ask_vertex("BFS", "Nhập đỉnh bắt đầu:")
+        if start is None:
             return
             
+        stats = self.begin_profile("BFS")
         self.reset_colors()
-        adj = self.build_adj_list()
-        visited = [False] * len(self.vertices)
-        q = deque([start])
-        visited[start] = True
-        order = []
-        
-        while q:
-            u = q.popleft()
-            order.append(u)
-            self.highlight_vertex(u, COLORS['visited'])
-            self.root.update()
-            self.root.after(self.animation_speed)
-            
-            for v in adj[u]:
-                if not visited[v]:
-                    visited[v] = True
-                    q.append(v)
-                    self.highlight_edge(u, v, COLORS['path'])
-        
-        messagebox.showinfo("BFS", f"Thứ tự duyệt: {' → '.join(map(str, order))}")
+        steps = []
+        with self.phase('preprocessing'):
+            csr = self.algorithm_csr()
+        with self.phase('compute'):
+            order, _ = algorithms.bfs(csr, start, steps, stats)
+        order = self.labels(order)
+        self.player.start(steps, lambda: self.show_result("BFS", f"Thứ tự duyệt: {' → '.join(map(str, order))}"))
     
     def run_dfs(self):
-        if not self.vertices:
+        n = self.graph.num_vertices()
+        if n == 0:
             messagebox.showwarning("Cảnh báo", "Đồ thị rỗng!")
             return
             
-        start = simpledialog.askinteger("DFS", "Nhập đỉnh bắt đầu:", initialvalue=0)
-        if start is None or start >= len(self.vertices):
+        start = self.ask_vertex("DFS", "Nhập đỉnh bắt đầu:")
+        if start is None:
             return
             
+        stats = self.begin_profile("DFS")
         self.reset_colors()
-        adj = self.build_adj_list()
-        visited = [False] * len(self.vertices)
-        order = []
-        
-        def dfs_visit(u):
-            visited[u] = True
-            order.append(u)
-            self.highlight_vertex(u, COLORS['visited'])
-            self.root.update()
-            self.root.after(self.animation_speed)
-            
-            for v in adj[u]:
-                if not visited[v]:
-                    self.highlight_edge(u, v, COLORS['path'])
-                    dfs_visit(v)
-                    
-        dfs_visit(start)
-        messagebox.showinfo("DFS", f"Thứ tự duyệt: {' → '.join(map(str, order))}")
+        steps = []
+        with self.phase('preprocessing'):
+            csr = self.algorithm_csr()
+        with self.phase('compute'):
+            order, _ = algorithms.dfs(csr, start, steps, stats)
+        order = self.labels(order)
+        self.player.start(steps, lambda: self.show_result("DFS", f"Thứ tự duyệt: {' → '.join(map(str, order))}"))
+    
+    # ================== TARJAN: SCC / CẦU / ĐỈNH KHỚP ==================
+    def run_scc(self):
+        if self.graph.num_vertices() == 0:
+            messagebox.showwarning("Cảnh báo", "Đồ thị rỗng!")
+            return
+        
+        if not self.graph.directed:
+            messagebox.showwarning("Cảnh báo", "Thành phần liên thông mạnh chỉ áp dụng cho đồ thị có hướng!")
+            return
+            
+        self.reset_colors()
+        self.begin_profile("Tarjan (SCC)")
+        with self.phase('preprocessing'):
+            csr = self.algorithm_csr()
+        with self.phase('compute'):
+            comp, count = connectivity.strongly_connected(csr)
+        groups = [[] for _ in range(count)]
+        for v in range(csr.n):
+            groups[comp[v]].append(v)
+        steps = [[('v', v, GROUP_ROLES[c % len(GROUP_ROLES)]) for v in group] for c, group in enumerate(groups)]
+        for u, v in zip(csr.eu, csr.ev):
+            if comp[u] == comp[v] and u != v:
+                steps[comp[u]].append(('e', u, v, GROUP_ROLES[comp[u] % len(GROUP_ROLES)], 3))
+        
+        result = f"Số thành phần liên thông mạnh: {count}\n\n"
+        for c, group in enumerate(groups):
+            result += f"Thành phần {c+1}: {{{', '.join(map(str, self.labels(group)))}}}\n"
+        self.player.start(steps, lambda: self.show_result("Thành Phần Liên Thông Mạnh", result, window=True))
+    
+    def run_biconnected(self):
+        if self.graph.num_vertices() == 0:
+            messagebox.showwarning("Cảnh báo", "Đồ thị rỗng!")
+            return
+        
+        if self.graph.directed:
+            messagebox.showwarning("Cảnh báo", "Cầu và đỉnh khớp chỉ áp dụng cho đồ thị vô hướng!")
+            return
+            
+        self.reset_colors()
+        self.begin_profile("Tarjan (cầu, đỉnh khớp)")
+        with self.phase('preprocessing'):
+            csr = self.algorithm_csr()
+        with self.phase('compute'):
+            bridges, articulation, components = connectivity.biconnected(csr)
+        steps = []
+        for c, comp in enumerate(components):
+            role = GROUP_ROLES[c % len(GROUP_ROLES)]
+            step = []
+            for e in comp:
+                u, v = csr.eu[e], csr.ev[e]
+                step += [('e', u, v, role, 3), ('v', u, role), ('v', v, role)]
+            steps.append(step)
+        cut_vertices = [v for v in range(csr.n) if articulation[v]]
+        steps.append([('e', csr.eu[e], csr.ev[e], 'selected', 4) for e in bridges]
+                     + [('v', v, 'selected') for v in cut_vertices])
+        
+        result = f"Cầu ({len(bridges)}): "
+        result += ", ".join(f"({u}, {v})" for u, v in (self.labels((csr.eu[e], csr.ev[e])) for e in bridges))
+        result += f"\nĐỉnh khớp ({len(cut_vertices)}): {', '.join(map(str, self.labels(cut_vertices)))}\n\n"
+        result += f"Thành phần song liên thông ({len(components)}):\n"
+        for c, comp in enumerate(components):
+            vertices = sorted({x for e in comp for x in self.labels((csr.eu[e], csr.ev[e]))})
+            result += f"Thành phần {c+1}: {{{', '.join(map(str, vertices))}}}\n"
+        self.player.start(steps, lambda: self.show_result("Cầu Và Đỉnh Khớp", result, window=True))
     
     # ================== CÂU 5: BIPARTITE ==================
     def check_bipartite(self):
-        if not self.vertices:
+        if self.graph.num_vertices() == 0:
             messagebox.showwarning("Cảnh báo", "Đồ thị rỗng!")
             return
             
-        adj = self.build_adj_list()
-        color = [-1] * len(self.vertices)
-        
-        for start in range(len(self.vertices)):
-            if color[start] == -1:
-                q = deque([start])
-                color[start] = 0
-                
-                while q:
-                    u = q.popleft()
-                    for v in adj[u]:
-                        if color[v] == -1:
-                            color[v] = 1 - color[u]
-                            q.append(v)
-                        elif color[v] == color[u]:
-                            messagebox.showinfo("Kết quả", "Đồ thị KHÔNG phải đồ thị 2 phía!")
-                            return
+        self.player.stop()
+        self.begin_profile("Kiểm tra 2 phía")
+        with self.phase('preprocessing'):
+            csr = self.algorithm_csr()
+        with self.phase('compute'):
+            color, cycle = algorithms.bipartite(csr)
+        if cycle is not None:
+            # Tô chu trình lẻ làm bằng chứng
+            self.reset_colors()
+            for i, u in enumerate(cycle):
+                a, b = self.step_ids[u], self.step_ids[cycle[i - 1]]
+                self.highlight.set_vertex(a, 'selected')
+                for eid in (*self.graph.edge_ids(a, b), *self.graph.edge_ids(b, a)):
+                    self.highlight.set_edge(eid, 'selected', 4)
+            self.flush_highlight()
+            cycle = self.labels(cycle + cycle[:1])
+            self.show_result("Kết quả", "Đồ thị KHÔNG phải đồ thị 2 phía!\n"
+                             f"Chu trình lẻ: {' → '.join(map(str, cycle))}")
+            return
                             
-        for i in range(len(self.vertices)):
-            self.highlight_vertex(i, COLORS['bipartite1'] if color[i] == 0 else COLORS['bipartite2'])
+        for i in range(len(color)):
+            self.highlight.set_vertex(self.step_ids[i], 'bipartite1' if color[i] == 0 else 'bipartite2')
+        self.flush_highlight()
             
-        messagebox.showinfo("Kết quả", "Đồ thị LÀ đồ thị 2 phía!")
+        self.show_result("Kết quả", "Đồ thị LÀ đồ thị 2 phía!")
     
     # ================== CÂU 6: REPRESENTATIONS ==================
     def show_adj_matrix(self):
-        n = len(self.vertices)
+        n = self.graph.num_vertices()
         if n == 0:
             messagebox.showwarning("Cảnh báo", "Đồ thị rỗng!")
             return
             
-        matrix = [[0] * n for _ in range(n)]
-        
-        for u, v in self.edges:
-            weight = self.weights.get((u, v), 1)
-            matrix[u][v] = weight
-            if not self.is_directed:
-                matrix[v][u] = weight
-                
-        result = "MA TRẬN KỀ:\n\n"
-        result += "   " + " ".join(f"{i:3}" for i in range(n)) + "\n"
-        for i in range(n):
-            result += f"{i:2} " + " ".join(f"{matrix[i][j]:3}" for j in range(n)) + "\n"
-            
-        self.show_text_window("Ma Trận Kề", result)
+        # Chỉ tính các ô đang hiển thị từ CSR, không dựng ma trận n×n
+        VirtualView(self.root, "Ma Trận Kề", representations.AdjacencyMatrixSource(self.graph.csr()))
         
     def show_adj_list(self):
-        if not self.vertices:
+        n = self.graph.num_vertices()
+        if n == 0:
             messagebox.showwarning("Cảnh báo", "Đồ thị rỗng!")
             return
             
-        adj = self.build_adj_list()
-        result = "DANH SÁCH KỀ:\n\n"
-        
-        for u in range(len(self.vertices)):
-            result += f"Đỉnh {u}: "
-            neighbors = []
-            for v in adj[u]:
-                if self.is_weighted:
-                    weight = self.weights.get((u, v), self.weights.get((v, u), 1))
-                    neighbors.append(f"{v}(w={weight})")
-                else:
-                    neighbors.append(str(v))
-            result += " → ".join(neighbors) if neighbors else "∅"
-            result += "\n"
-            
-        self.show_text_window("Danh Sách Kề", result)
+        VirtualView(self.root, "Danh Sách Kề",
+                    representations.AdjacencyListSource(self.graph.csr(), self.graph.weighted))
         
     def show_edge_list(self):
-        if not self.edges:
+        csr = self.graph.csr()
+        if csr.m == 0:
             messagebox.showwarning("Cảnh báo", "Không có cạnh!")
             return
             
-        result = "DANH SÁCH CẠNH:\n\n"
-        
-        for i, (u, v) in enumerate(self.edges):
-            if self.is_weighted:
-                weight = self.weights.get((u, v), 1)
-                result += f"Cạnh {i+1}: ({u}, {v}) - Trọng số: {weight}\n"
-            else:
-                result += f"Cạnh {i+1}: ({u}, {v})\n"
-                
-        self.show_text_window("Danh Sách Cạnh", result)
+        VirtualView(self.root, "Danh Sách Cạnh", representations.EdgeListSource(csr, self.graph.weighted))
     
     # ================== CÂU 7.1: PRIM ==================
     def run_prim(self):
-        if not self.vertices:
+        if self.graph.num_vertices() == 0:
             messagebox.showwarning("Cảnh báo", "Đồ thị rỗng!")
             return
         
-        if self.is_directed:
+        if self.graph.directed:
             messagebox.showwarning("Cảnh báo", "Prim chỉ áp dụng cho đồ thị vô hướng!")
             return
             
         self.reset_colors()
-        adj = self.build_adj_list()
-        in_mst = [False] * len(self.vertices)
-        pq = [(0, 0, -1)]
-        total_weight = 0
-        edges_in_mst = []
-        
-        while pq:
-            weight, u, parent = heapq.heappop(pq)
-            
-            if in_mst[u]:
-                continue
-                
-            in_mst[u] = True
-            total_weight += weight
-            
-            if parent != -1:
-                edges_in_mst.append((parent, u, weight))
-            
-            self.highlight_vertex(u, COLORS['mst'])
-            if parent != -1:
-                self.highlight_edge(parent, u, COLORS['mst'], 4)
-                
-            self.root.update()
-            self.root.after(self.animation_speed)
+        steps = []
+        stats = self.begin_profile("Prim")
+        with self.phase('preprocessing'):
+            csr = self.algorithm_csr()
+        with self.phase('compute'):
+            total_weight, order, components = algorithms.prim(csr, steps, stats)
+        
+        result = f"Prim - Cây Khung Nhỏ Nhất\n\nTổng trọng số: {fmt_num(total_weight)}\n"
+        if len(components) > 1:
+            result += f"\nĐồ thị không liên thông - rừng khung gồm {len(components)} cây:\n"
+            for root, weight, size in components:
+                result += f"Cây gốc {self.step_ids[root]} ({size} đỉnh): {fmt_num(weight)}\n"
+        result += "\nCác cạnh:\n"
+        for u, v, w in order:
+            if u != -1:
+                result += f"({self.step_ids[u]}, {self.step_ids[v]}) - w={fmt_num(w)}\n"
             
-            for v in adj[u]:
-                if not in_mst[v]:
-                    edge_weight = self.weights.get((u, v), self.weights.get((v, u), 1))
-                    heapq.heappush(pq, (edge_weight, v, u))
-        
-        result = f"Prim - Cây Khung Nhỏ Nhất\n\nTổng trọng số: {total_weight}\n\nCác cạnh:\n"
-        for u, v, w in edges_in_mst:
-            result += f"({u}, {v}) - w={w}\n"
-            
-        messagebox.showinfo("Prim", result)
+        self.player.start(steps, lambda: self.show_result("Prim", result))
     
     # ================== CÂU 7.2: KRUSKAL ==================
     def run_kruskal(self):
-        if not self.vertices:
+        if self.graph.num_vertices() == 0:
             messagebox.showwarning("Cảnh báo", "Đồ thị rỗng!")
             return
         
-        if self.is_directed:
+        if self.graph.directed:
             messagebox.showwarning("Cảnh báo", "Kruskal chỉ áp dụng cho đồ thị vô hướng!")
             return
             
         self.reset_colors()
-        
-        parent = list(range(len(self.vertices)))
-        
-        def find(x):
-            if parent[x] != x:
-                parent[x] = find(parent[x])
-            return parent[x]
-            
-        def union(x, y):
-            px, py = find(x), find(y)
-            if px != py:
-                parent[px] = py
-                return True
-            return False
-            
-        edge_list = []
-        for u, v in self.edges:
-            weight = self.weights.get((u, v), 1)
-            edge_list.append((weight, u, v))
-        edge_list.sort()
-        
-        total_weight = 0
-        edges_in_mst = []
-        
-        for weight, u, v in edge_list:
-            if union(u, v):
-                total_weight += weight
-                edges_in_mst.append((u, v, weight))
-                self.highlight_edge(u, v, COLORS['mst'], 4)
-                self.highlight_vertex(u, COLORS['mst'])
-                self.highlight_vertex(v, COLORS['mst'])
-                self.root.update()
-                self.root.after(self.animation_speed)
-        
-        result = f"Kruskal - Cây Khung Nhỏ Nhất\n\nTổng trọng số: {total_weight}\n\nCác cạnh:\n"
+        steps = []
+        stats = self.begin_profile("Kruskal")
+        with self.phase('preprocessing'):
+            csr = self.algorithm_csr()
+        with self.phase('compute'):
+            total_weight, edges_in_mst = algorithms.kruskal(csr, steps, stats)
+        
+        result = f"Kruskal - Cây Khung Nhỏ Nhất\n\nTổng trọng số: {fmt_num(total_weight)}\n\nCác cạnh:\n"
         for u, v, w in edges_in_mst:
-            result += f"({u}, {v}) - w={w}\n"
+            result += f"({self.step_ids[u]}, {self.step_ids[v]}) - w={fmt_num(w)}\n"
                 
-        messagebox.showinfo("Kruskal", result)
+        self.player.start(steps, lambda: self.show_result("Kruskal", result))
     
     # ================== CÂU 7.3: FORD-FULKERSON ==================
     def run_ford_fulkerson(self):
-            if not self.vertices or not self.is_weighted:
+            n = self.graph.num_vertices()
+            if n == 0 or not self.graph.weighted:
                 messagebox.showwarning("Cảnh báo", "Đồ thị phải có trọng số!")
                 return
 
-            if not self.is_directed:
-                messagebox.showwarning("Cảnh báo", "Max Flow cần đồ thị có hướng!")
-                return
-
-            source = simpledialog.askinteger("Max Flow", "Nhập đỉnh nguồn:", initialvalue=0)
-            sink = simpledialog.askinteger(
-                "Max Flow", 
-                "Nhập đỉnh đích:", 
-                initialvalue=len(self.vertices) - 1
-            )
+            # Cây Gomory-Hu (n - 1 lần tính luồng trở lên) chỉ dựng khi người dùng chọn
+            all_pairs = not self.graph.directed and self.gomory_hu_var.get()
+            solver = "Gomory-Hu" if all_pairs else self.flow_algo_var.get()
+            source = self.ask_vertex("Max Flow", "Nhập đỉnh nguồn:")
+            sink = self.ask_vertex("Max Flow", "Nhập đỉnh đích:", last=True)
 
-            if (
-                source is None or sink is None or
-                source < 0 or sink < 0 or
-                source >= len(self.vertices) or
-                sink >= len(self.vertices) or
-                source == sink
-            ):
+            if source is None or sink is None or source == sink:
                 messagebox.showerror("Lỗi", "Đỉnh nguồn hoặc đích không hợp lệ!")
                 return
         
-            self.reset_colors()
-        
-            n = len(self.vertices)
-            capacity = [[0] * n for _ in range(n)]
-        
-            for u, v in self.edges:
-                capacity[u][v] = self.weights.get((u, v), 1)
-        
-            def bfs_find_path(s, t, parent):
-                visited = [False] * n
-                q = deque([s])
-                visited[s] = True
-        
-                while q:
-                    u = q.popleft()
-                    for v in range(n):
-                        if not visited[v] and capacity[u][v] > 0:
-                            visited[v] = True
-                            parent[v] = u
-                            if v == t:
-                                return True
-                            q.append(v)
-                return False
-        
-            parent = [-1] * n
-            max_flow = 0
-        
-            while bfs_find_path(source, sink, parent):
-                path_flow = float('inf')
-                v = sink
-                path = []
-
-                while v != source:
-                    path.append(v)
-                    u = parent[v]
-                    path_flow = min(path_flow, capacity[u][v])
-                    v = u
-                path.append(source)
-                path.reverse()
-
-                v = sink
-                while v != source:
-                    u = parent[v]
-                    capacity[u][v] -= path_flow
-                    capacity[v][u] += path_flow
-                    v = u
+            stats = self.begin_profile(f"Ford-Fulkerson ({solver})")
+            with self.phase('preprocessing'):
+                csr = self.algorithm_csr()
+            if csr.min_weight < 0:
+                self.profile = None
+                messagebox.showerror("Lỗi", "Sức chứa của cạnh không được âm!")
+                return
 
-                max_flow += path_flow
+            if all_pairs:
+                self.show_min_cut(csr, source, sink)
+                return
 
-                # Trực quan hóa đường tăng luồng
-                for i in range(len(path)):
-                    self.highlight_vertex(path[i], COLORS['current'])
-                    if i > 0:
-                        self.highlight_edge(path[i-1], path[i], COLORS['path'], 4)
+            self.reset_colors()
+            # Trực quan hóa từng đường tăng luồng, thông báo kết quả một lần ở cuối
+            steps = []
+            method = max_flow.METHODS[self.flow_algo_var.get()]
+            with self.phase('compute'):
+                value, flows, _, cut = max_flow.max_flow(csr, source, sink, method, steps, stats)
+            source, sink = self.labels((source, sink))
 
-                self.root.update()
-                self.root.after(self.animation_speed)
+            result = f"Luồng cực đại từ {source} đến {sink}: {fmt_num(value)}\n\n"
+            result += f"Lát cắt hẹp nhất ({len(cut)} cạnh):\n"
+            sep = " → " if self.graph.directed else ", "
+            for e in cut:
+                u, v = self.labels((csr.eu[e], csr.ev[e]))
+                result += f"({u}{sep}{v}) - c={fmt_num(csr.ew[e])}\n"
+            result += "\nLuồng trên các cạnh:\n"
+            for e in range(csr.m):
+                f = flows[e]
+                if abs(f) > max_flow.EPS:
+                    u, v = self.labels((csr.eu[e], csr.ev[e]))
+                    # Cạnh vô hướng là hai cung ngược chiều; luồng âm nghĩa là chảy từ v sang u
+                    if f < 0:
+                        u, v, f = v, u, -f
+                    result += f"({u} → {v}): {fmt_num(f)}/{fmt_num(csr.ew[e])}\n"
+            self.player.start(steps, lambda: self.show_result("Ford-Fulkerson", result, window=True))
 
-                parent = [-1] * n
+    
+    def show_min_cut(self, csr, source, sink):
+        # Chế độ lát cắt mọi cặp đỉnh: tra từ cây Gomory-Hu (dựng một lần cho mọi cặp đỉnh)
+        cached = self.cut_engine.has_tree()
+        with self.phase('compute'):
+            value, side, cut = self.cut_engine.query(source, sink)
+        runs = self.cut_engine.tree().flow_runs
+        steps = [[('v', v, 'current') for v in range(csr.n) if side[v]]
+                 + [('e', csr.eu[e], csr.ev[e], 'selected', 4) for e in cut]]
+        source, sink = self.labels((source, sink))
 
-                messagebox.showinfo(
-                "Ford-Fulkerson",
-                f"Luồng cực đại từ {source} đến {sink}: {max_flow}"
-                )
-        
+        result = f"Luồng cực đại giữa {source} và {sink}: {fmt_num(value)}\n"
+        result += "(tra từ cây Gomory-Hu đã có)\n\n" if cached else f"(dựng cây Gomory-Hu: {runs} lần tính luồng)\n\n"
+        result += f"Lát cắt hẹp nhất ({len(cut)} cạnh):\n"
+        for e in cut:
+            u, v = self.labels((csr.eu[e], csr.ev[e]))
+            result += f"({u}, {v}) - c={fmt_num(csr.ew[e])}\n"
+        self.reset_colors()
+        self.player.start(steps, lambda: self.show_result("Ford-Fulkerson", result, window=True))
 
-    
     # ================== CÂU 7.4: FLEURY (KIỂM TRA EULER) ==================
     def check_euler(self):
-        if not self.vertices:
+        if self.graph.num_vertices() == 0:
             messagebox.showwarning("Cảnh báo", "Đồ thị rỗng!")
             return
         
-        adj = self.build_adj_list()
-        
-        if self.is_directed:
-            in_degree = [0] * len(self.vertices)
-            out_degree = [0] * len(self.vertices)
-            
-            for u, v in self.edges:
-                out_degree[u] += 1
-                in_degree[v] += 1
-            
-            start_vertices = sum(1 for i in range(len(self.vertices)) if out_degree[i] - in_degree[i] == 1)
-            end_vertices = sum(1 for i in range(len(self.vertices)) if in_degree[i] - out_degree[i] == 1)
-            balanced = sum(1 for i in range(len(self.vertices)) if in_degree[i] == out_degree[i])
-            
-            if start_vertices == 1 and end_vertices == 1 and balanced == len(self.vertices) - 2:
-                messagebox.showinfo("Fleury", "Đồ thị có ĐƯỜNG ĐI EULER!")
-            elif start_vertices == 0 and end_vertices == 0:
-                messagebox.showinfo("Fleury", "Đồ thị có CHU TRÌNH EULER!")
-            else:
-                messagebox.showinfo("Fleury", "Đồ thị KHÔNG có đường đi hoặc chu trình Euler!")
+        self.begin_profile("Kiểm tra Euler")
+        with self.phase('preprocessing'):
+            csr = self.graph.csr()
+        with self.phase('compute'):
+            kind, _ = algorithms.euler_kind(csr)
+            connected = kind is not None or algorithms.edges_connected(csr)
+        if kind == 'path':
+            self.show_result("Fleury", "Đồ thị có ĐƯỜNG ĐI EULER!")
+        elif kind == 'circuit':
+            self.show_result("Fleury", "Đồ thị có CHU TRÌNH EULER!")
+        elif not connected:
+            self.show_result("Fleury", "Đồ thị không liên thông! Không có đường đi hoặc chu trình Euler.")
         else:
-            degrees = [len(adj[i]) for i in range(len(self.vertices))]
-            odd_vertices = sum(1 for d in degrees if d % 2 == 1)
-            
-            if odd_vertices == 0:
-                messagebox.showinfo("Fleury", "Đồ thị có CHU TRÌNH EULER!")
-            elif odd_vertices == 2:
-                messagebox.showinfo("Fleury", "Đồ thị có ĐƯỜNG ĐI EULER!")
-            else:
-                messagebox.showinfo("Fleury", "Đồ thị KHÔNG có đường đi hoặc chu trình Euler!")
+            self.show_result("Fleury", "Đồ thị KHÔNG có đường đi hoặc chu trình Euler!")
     
     # ================== CÂU 7.5: HIERHOLZER ==================
     def run_hierholzer(self):
-        if not self.vertices:
+        if self.graph.num_vertices() == 0:
             messagebox.showwarning("Cảnh báo", "Đồ thị rỗng!")
             return
         
-        adj = self.build_adj_list()
-        
-        if self.is_directed:
-            in_degree = [0] * len(self.vertices)
-            out_degree = [0] * len(self.vertices)
-            
-            for u, v in self.edges:
-                out_degree[u] += 1
-                in_degree[v] += 1
-            
-            start_vertices = [i for i in range(len(self.vertices)) if out_degree[i] - in_degree[i] == 1]
-            end_vertices = [i for i in range(len(self.vertices)) if in_degree[i] - out_degree[i] == 1]
-            balanced = [i for i in range(len(self.vertices)) if in_degree[i] == out_degree[i]]
-            
-            if len(start_vertices) == 1 and len(end_vertices) == 1 and len(balanced) == len(self.vertices) - 2:
-                start = start_vertices[0]
-                is_circuit = False
-            elif len(start_vertices) == 0 and len(end_vertices) == 0:
-                start = 0
-                is_circuit = True
-            else:
-                messagebox.showinfo("Hierholzer", "Đồ thị KHÔNG có đường đi hoặc chu trình Euler!")
-                return
-        else:
-            degrees = [len(adj[i]) for i in range(len(self.vertices))]
-            odd_vertices = [i for i in range(len(self.vertices)) if degrees[i] % 2 == 1]
-            
-            if len(odd_vertices) == 0:
-                start = 0
-                is_circuit = True
-            elif len(odd_vertices) == 2:
-                start = odd_vertices[0]
-                is_circuit = False
+        self.begin_profile("Hierholzer")
+        with self.phase('preprocessing'):
+            csr = self.algorithm_csr()
+        with self.phase('compute'):
+            kind, start = algorithms.euler_kind(csr)
+        if kind is None:
+            if not algorithms.edges_connected(csr):
+                self.show_result("Hierholzer", "Đồ thị không liên thông! Không tìm được đường đi Euler.")
             else:
-                messagebox.showinfo("Hierholzer", "Đồ thị KHÔNG có đường đi hoặc chu trình Euler!")
-                return
+                self.show_result("Hierholzer", "Đồ thị KHÔNG có đường đi hoặc chu trình Euler!")
+            return
+        is_circuit = kind == 'circuit'
         
         # Thuật toán Hierholzer
-        adj_copy = {i: adj[i][:] for i in range(len(self.vertices))}
-        stack = [start]
-        path = []
-        
-        while stack:
-            u = stack[-1]
-            if adj_copy[u]:
-                v = adj_copy[u].pop()
-                if not self.is_directed:
-                    adj_copy[v].remove(u)
-                stack.append(v)
-            else:
-                path.append(stack.pop())
+        with self.phase('compute'):
+            path = algorithms.hierholzer(csr, start)
         
-        path.reverse()
-        
-        if len(path) != len(self.edges) + 1:
-            messagebox.showinfo("Hierholzer", "Đồ thị không liên thông! Không tìm được đường đi Euler.")
-            return
+        path_str = " → ".join(map(str, self.labels(path)))
+        result_type = "Chu trình Euler" if is_circuit else "Đường đi Euler"
         
         # Trực quan hóa
         self.reset_colors()
+        self.player.start(path_steps(path, 'visited'), lambda: self.show_result("Hierholzer", 
+                           f"Tìm thấy {result_type}!\n\nĐường đi: {path_str}\n\nTổng số cạnh: {len(path)-1}"))
+    
+    # ================== HELPER FUNCTIONS ==================
+    def begin_profile(self, algorithm):
+        # Bắt đầu đo nếu "Đo hiệu năng" được bật; trả về dict bộ đếm truyền cho thuật toán
+        # (None khi không đo, thuật toán bỏ qua việc ghi bộ đếm)
+        if not self.profile_var.get():
+            self.profile = None
+            return None
+        self.profile = Profile(algorithm, self.graph.num_vertices(), self.graph.num_edges(),
+                               memory=self.profile_memory_var.get())
+        return self.profile.counters
+        
+    def phase(self, name, memory=True):
+        return self.profile.phase(name, memory) if self.profile else nullcontext()
+        
+    def show_result(self, title, text, window=False):
+        # Hiện kết quả, kèm số liệu đo khi đang đo; lần đo kết thúc tại đây
+        if self.profile is not None:
+            self.last_profile, self.profile = self.profile, None
+            text += "\n\n" + self.last_profile.summary()
+        if window:
+            self.show_text_window(title, text)
+        else:
+            messagebox.showinfo(title, text)
         
-        for i in range(len(path)):
-            self.highlight_vertex(path[i], COLORS['visited'])
-            if i > 0:
-                self.highlight_edge(path[i-1], path[i], COLORS['path'], 4)
-                self.root.update()
-                self.root.after(self.animation_speed)
+    def export_profile(self):
+        if self.last_profile is None:
+            messagebox.showwarning("Cảnh báo", "Chưa có số liệu đo! Bật \"Đo hiệu năng\" rồi chạy một thuật toán.")
+            return
         
-        path_str = " → ".join(map(str, path))
-        result_type = "Chu trình Euler" if is_circuit else "Đường đi Euler"
-        messagebox.showinfo("Hierholzer", 
-                           f"Tìm thấy {result_type}!\n\nĐường đi: {path_str}\n\nTổng số cạnh: {len(path)-1}")
+        file = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
+        if file:
+            try:
+                self.last_profile.save(file)
+                messagebox.showinfo("Thành công", "Đã xuất số liệu đo!")
+            except Exception as e:
+                messagebox.showerror("Lỗi", f"Không thể lưu file: {str(e)}")
     
-    # ================== HELPER FUNCTIONS ==================
     def show_text_window(self, title, text):
         window = tk.Toplevel(self.root)
         window.title(title)
@@ -798,61 +1117,127 @@ class GraphVisualizer:
     
     # ================== FILE OPERATIONS (CÂU 2: LƯU ĐỒ THỊ) ==================
     def save_graph(self):
-        if not self.vertices:
+        if self.graph.num_vertices() == 0:
             messagebox.showwarning("Cảnh báo", "Đồ thị rỗng!")
             return
         
-        data = {
-            "vertices": self.vertices,
-            "edges": self.edges,
-            "weights": {f"{u},{v}": w for (u, v), w in self.weights.items()},
-            "is_directed": self.is_directed,
-            "is_weighted": self.is_weighted
-        }
-        
         file = filedialog.asksaveasfilename(
             defaultextension=".json", 
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+            filetypes=[("JSON files", "*.json"), ("Đồ thị nhị phân", "*" + graph_file.EXTENSION),
+                       ("All files", "*.*")]
         )
         
         if file:
             try:
-                with open(file, "w", encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
+                graph_file.save_graph_file(self.graph, file)
                 messagebox.showinfo("Thành công", "Đồ thị đã được lưu!")
             except Exception as e:
                 messagebox.showerror("Lỗi", f"Không thể lưu file: {str(e)}")
             
     def load_graph(self):
         file = filedialog.askopenfilename(
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+            filetypes=[("JSON files", "*.json"), ("Đồ thị nhị phân", "*" + graph_file.EXTENSION),
+                       ("All files", "*.*")]
         )
         
         if not file:
             return
         
         try:
-            with open(file, "r", encoding='utf-8') as f:
-                data = json.load(f)
-            
-            self.vertices = data["vertices"]
-            self.edges = data["edges"]
-            self.weights = {tuple(map(int, k.split(','))): v for k, v in data.get("weights", {}).items()}
-            self.is_directed = data.get("is_directed", False)
-            self.is_weighted = data.get("is_weighted", False)
-            
-            self.directed_var.set(self.is_directed)
-            self.weighted_var.set(self.is_weighted)
-            
-            self.redraw_graph()
+            self.set_graph(graph_file.load_graph_file(file))
             messagebox.showinfo("Thành công", "Đồ thị đã được tải!")
         except Exception as e:
             messagebox.showerror("Lỗi", f"Không thể tải file: {str(e)}")
+            
+    def set_graph(self, graph):
+        self.player.stop()
+        self.stop_layout()
+        self.graph = graph
+        self.highlight.clear()
+        self.path_engine = ShortestPathEngine(self.graph)
+        self.cut_engine = max_flow.MinCutEngine(self.graph)
+        self.scene = viewport.Scene(self.graph)
+        
+        self.directed_var.set(self.graph.directed)
+        self.weighted_var.set(self.graph.weighted)
+        
+        # Đồ thị lớn hơn khung vẽ thì thu nhỏ cho vừa, ngược lại giữ tỉ lệ 100%
+        self.viewport.reset()
+        width, height = self.canvas_size()
+        points = [p for p in self.graph.vertices if p is not None]
+        if points and (min(p[0] for p in points) < 0 or min(p[1] for p in points) < 0
+                       or max(p[0] for p in points) > width or max(p[1] for p in points) > height):
+            self.viewport.fit(points, width, height)
+        self.redraw_graph()
+        self.rebuild_live()
+            
+    def import_text(self, fmt):
+        # Đọc từng khối qua root.after() để cửa sổ không bị treo và cập nhật thanh tiến trình
+        file = filedialog.askopenfilename(
+            filetypes=[("Text files", "*.txt *.edges *.adj"), ("All files", "*.*")]
+        )
+        
+        if not file:
+            return
+        
+        importer = text_import.TextImporter(file, fmt, self.graph.directed)
+        window = tk.Toplevel(self.root)
+        window.title("Đang nhập đồ thị")
+        bar = ttk.Progressbar(window, length=300, maximum=max(1, importer.total))
+        bar.pack(padx=10, pady=(10, 5))
+        label = tk.Label(window, text="")
+        label.pack(padx=10, pady=(0, 10))
+        chunks = importer.run()
+        
+        def tick():
+            try:
+                done, total = next(chunks)
+            except StopIteration:
+                done = None
+            except Exception as e:
+                window.destroy()
+                messagebox.showerror("Lỗi", f"Không thể nhập file: {str(e)}")
+                return
+            if done is None:
+                # Đọc xong: dựng đồ thị ngoài nhánh except để lỗi ở bước này vẫn được báo
+                window.destroy()
+                try:
+                    self.set_graph(importer.graph())
+                    messagebox.showinfo("Thành công", f"Đã nhập {self.graph.num_vertices()} đỉnh, "
+                                                      f"{self.graph.num_edges()} cạnh!")
+                except Exception as e:
+                    messagebox.showerror("Lỗi", f"Không thể nhập file: {str(e)}")
+                return
+            bar['value'] = done
+            label.config(text=f"{done / 2**20:.1f} / {total / 2**20:.1f} MB")
+            self.root.after(1, tick)
+        
+        self.root.after(0, tick)
 
     def on_drag(self, event):
-        if self.selected_vertex is not None:
-            self.vertices[self.selected_vertex] = (event.x, event.y)
-            self.redraw_graph()
+        # Chỉ dời đỉnh đang kéo và các cạnh kề với nó, không vẽ lại toàn bộ
+        v = self.selected_vertex
+        if v is None or v >= len(self.vertex_items):
+            return
+        x, y = self.viewport.to_world(event.x, event.y)
+        self.graph.move_vertex(v, x, y)
+        
+        incident = self.graph.incident_edges(v)
+        if self.vertex_items[v] is None or any(eid not in self.edge_items for eid in incident):
+            self.schedule_redraw()
+            return
+        oval, text = self.vertex_items[v]
+        r = max(2, RADIUS * self.viewport.scale)
+        self.canvas.coords(oval, event.x - r, event.y - r, event.x + r, event.y + r)
+        if text is not None:
+            self.canvas.coords(text, event.x, event.y)
+        
+        for eid in incident:
+            edge = self.graph.edges[eid]
+            items = self.edge_items[eid]
+            self.canvas.coords(items[0], *self.edge_coords(*edge))
+            if len(items) > 1:
+                self.canvas.coords(items[1], *self.edge_label_coords(*edge))
 # ================== MAIN ==================
 if __name__ == "__main__":
     root = tk.Tk()
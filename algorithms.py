@@ -0,0 +1,221 @@
+from disjoint_set import DisjointSet
+from frontier import level_bfs
+from indexed_heap import IndexedHeap
+
+INF = float("inf")
+
+
+def _traversal_stats(csr, stats, order, levels=None):
+    # Duyệt xong một đỉnh là đã xét hết các cạnh ra của nó
+    if stats is not None:
+        off = csr.offsets
+        stats.update(vertices_settled=len(order), edges_relaxed=sum(off[u + 1] - off[u] for u in order))
+        if levels is not None:
+            stats["levels"] = len(levels) - 1
+
+
+# ================== CÂU 3: SHORTEST PATH ==================
+def bfs_shortest_path(csr, start, end, stats=None):
+    result = level_bfs(csr, start, target=end)
+    _traversal_stats(csr, stats, result.order, result.levels)
+    if result.dist[end] < 0:
+        return INF, None
+    return result.dist[end], result.path(end)
+
+
+# ================== CÂU 4: TRAVERSAL ==================
+def bfs(csr, start, steps=None, stats=None):
+    # BFS theo tầng (frontier.py); bước tô màu dựng lại từ thứ tự thăm và đỉnh cha
+    result = level_bfs(csr, start)
+    order, parent = result.order, result.parent
+    _traversal_stats(csr, stats, order, result.levels)
+    if steps is not None:
+        children = {}
+        for v in order[1:]:
+            children.setdefault(parent[v], []).append(v)
+        for u in order:
+            step = [('v', u, 'visited')]
+            step.extend(('e', u, v, 'path', 3) for v in children.get(u, ()))
+            steps.append(step)
+    return order, parent
+
+
+def dfs(csr, start, steps=None, stats=None):
+    # Ngăn xếp tường minh; it[u] là vị trí cạnh kế tiếp cần xét của u nên thứ tự
+    # duyệt giống hệt bản đệ quy nhưng không bị giới hạn độ sâu
+    off, tgt = csr.offsets, csr.targets
+    visited = [False] * csr.n
+    parent = [-1] * csr.n
+    it = list(off[:csr.n])
+    visited[start] = True
+    order = [start]
+    if steps is not None:
+        steps.append([('v', start, 'visited')])
+    stack = [start]
+
+    while stack:
+        u = stack[-1]
+        i, end = it[u], off[u + 1]
+        while i < end and visited[tgt[i]]:
+            i += 1
+        if i == end:
+            stack.pop()
+            continue
+        it[u] = i + 1
+        v = tgt[i]
+        visited[v] = True
+        parent[v] = u
+        order.append(v)
+        if steps is not None:
+            steps.append([('e', u, v, 'path', 3), ('v', v, 'visited')])
+        stack.append(v)
+    _traversal_stats(csr, stats, order)
+    return order, parent
+
+
+# ================== CÂU 5: BIPARTITE ==================
+def bipartite(csr):
+    # Tô 2 màu trên đồ thị vô hướng tương ứng (bỏ chiều cạnh); trả về (màu, chu trình lẻ),
+    # chu trình lẻ là None khi đồ thị 2 phía
+    return level_bfs(csr, undirected=True, stop_on_conflict=True).coloring()
+
+
+# ================== CÂU 7.1: PRIM ==================
+def prim(csr, steps=None, stats=None):
+    # Prim "háo hức": mỗi đỉnh ngoài cây có đúng một mục trong heap với khóa là cạnh
+    # nhẹ nhất nối vào cây, cập nhật bằng giảm khóa. Chạy lần lượt từ mọi đỉnh chưa
+    # thuộc cây nên trả về rừng khung nhỏ nhất khi đồ thị không liên thông.
+    # order: (cha, đỉnh, trọng số) theo thứ tự được thêm vào, gốc mỗi cây có cha -1
+    # components: (gốc, tổng trọng số, số đỉnh) của từng cây
+    off, tgt, wts = csr.offsets, csr.targets, csr.weights
+    in_mst = [False] * csr.n
+    parent = [-1] * csr.n
+    heap = IndexedHeap(csr.n)
+    total_weight = 0
+    order = []
+    components = []
+    pushes = 0
+
+    for root in range(csr.n):
+        if in_mst[root]:
+            continue
+        heap.push(root, 0)
+        pushes += 1
+        tree_weight = 0
+        size = 0
+
+        while heap:
+            weight, u = heap.pop()
+            in_mst[u] = True
+            tree_weight += weight
+            size += 1
+            order.append((parent[u], u, weight))
+            if steps is not None:
+                step = [('v', u, 'mst')]
+                if parent[u] != -1:
+                    step.append(('e', parent[u], u, 'mst', 4))
+                steps.append(step)
+
+            for i in range(off[u], off[u + 1]):
+                v = tgt[i]
+                if not in_mst[v] and heap.push(v, wts[i]):
+                    parent[v] = u
+                    pushes += 1
+
+        total_weight += tree_weight
+        components.append((root, tree_weight, size))
+    if stats is not None:
+        # Mỗi đỉnh được lấy khỏi heap đúng một lần; đẩy gồm cả thêm mới và giảm khóa
+        stats.update(vertices_settled=csr.n, edges_relaxed=len(tgt), heap_pushes=pushes, heap_pops=csr.n)
+    return total_weight, order, components
+
+
+# ================== CÂU 7.2: KRUSKAL ==================
+def kruskal(csr, steps=None, stats=None):
+    # Sắp chỉ số cạnh theo trọng số, dừng khi đã nhận đủ n - 1 cạnh
+    eu, ev, ew = csr.eu, csr.ev, csr.ew
+    dsu = DisjointSet(csr.n)
+    total_weight = 0
+    edges_in_mst = []
+    examined = 0
+
+    for e in sorted(range(csr.m), key=ew.__getitem__):
+        examined += 1
+        u, v = eu[e], ev[e]
+        if dsu.union(u, v):
+            total_weight += ew[e]
+            edges_in_mst.append((u, v, ew[e]))
+            if steps is not None:
+                steps.append([('e', u, v, 'mst', 4), ('v', u, 'mst'), ('v', v, 'mst')])
+            if len(edges_in_mst) == csr.n - 1:
+                break
+    if stats is not None:
+        # Mỗi lần hợp gọi find cho hai đầu cạnh
+        stats.update(edges_relaxed=examined, dsu_finds=2 * examined)
+    return total_weight, edges_in_mst
+
+
+# ================== CÂU 7.4 / 7.5: EULER ==================
+def edges_connected(csr):
+    # Mọi đỉnh có cạnh đều nằm trong cùng một thành phần liên thông
+    # (đồ thị có hướng xét liên thông yếu nên bỏ qua chiều cạnh)
+    dsu = DisjointSet(csr.n)
+    for u, v in zip(csr.eu, csr.ev):
+        dsu.union(u, v)
+    roots = {dsu.find(u) for u in csr.eu}
+    return len(roots) <= 1
+
+
+def euler_kind(csr):
+    # Trả về ('circuit' | 'path' | None, đỉnh bắt đầu)
+    n = csr.n
+    if csr.m == 0:
+        return 'circuit', 0
+    if not edges_connected(csr):
+        return None, None
+
+    if csr.directed:
+        in_degree = csr.in_degrees()
+        diff = [csr.degree(i) - in_degree[i] for i in range(n)]
+        start_vertices = [i for i in range(n) if diff[i] == 1]
+        end_vertices = [i for i in range(n) if diff[i] == -1]
+        balanced = sum(1 for d in diff if d == 0)
+
+        if len(start_vertices) == 1 and len(end_vertices) == 1 and balanced == n - 2:
+            return 'path', start_vertices[0]
+        if balanced == n:
+            return 'circuit', 0 if csr.degree(0) else csr.eu[0]
+        return None, None
+
+    odd_vertices = [i for i in range(n) if csr.degree(i) % 2 == 1]
+    if len(odd_vertices) == 0:
+        return 'circuit', 0 if csr.degree(0) else csr.eu[0]
+    if len(odd_vertices) == 2:
+        return 'path', odd_vertices[0]
+    return None, None
+
+
+def hierholzer(csr, start):
+    # Đánh dấu cạnh đã dùng theo chỉ số cạnh; it[u] lùi dần từ cuối hàng CSR của u
+    # nên mỗi vị trí kề chỉ bị xét một lần: O(V + E)
+    off, tgt, slot_edges = csr.offsets, csr.targets, csr.slot_edges
+    used = bytearray(csr.m)
+    it = list(off[1:csr.n + 1])
+    stack = [start]
+    path = []
+
+    while stack:
+        u = stack[-1]
+        i, begin = it[u], off[u]
+        while i > begin and used[slot_edges[i - 1]]:
+            i -= 1
+        if i == begin:
+            it[u] = i
+            path.append(stack.pop())
+        else:
+            it[u] = i - 1
+            used[slot_edges[i - 1]] = 1
+            stack.append(tgt[i - 1])
+
+    path.reverse()
+    return path
@@ -0,0 +1,129 @@
+# ================== ANIMATION SCHEDULER ==================
+# Thuật toán chạy hết với tốc độ tối đa và ghi lại các bước; mỗi bước là một
+# danh sách thao tác tô màu:
+#   ('v', đỉnh, vai trò)                 tô đỉnh
+#   ('e', u, v, vai trò, độ dày)         tô cạnh
+# Bộ lập lịch phát lại các bước bằng root.after() nên cửa sổ không bị treo.
+# Nếu có flush, nó được gọi một lần sau mỗi đoạn bước được áp (một khung hình,
+# hoặc cả đoạn khi tua/bỏ qua) để giao diện chỉ vẽ lại phần thay đổi.
+
+class AnimationPlayer:
+    def __init__(self, root, apply_op, reset, on_progress=None, flush=None):
+        self.root = root
+        self.apply_op = apply_op
+        self.reset = reset
+        self.on_progress = on_progress
+        self.flush = flush
+        self.speed = 500
+        self.skip = False
+        self.paused = False
+        self.steps = []
+        self.pos = 0
+        self._job = None
+        self._on_finish = None
+
+    def start(self, steps, on_finish=None):
+        # steps có thể là list hoặc generator; được lưu lại để tua
+        self.stop()
+        self.steps = list(steps)
+        self.pos = 0
+        self._on_finish = on_finish
+        self.paused = False
+        self._progress()
+        if self.skip:
+            self.skip_to_end()
+        else:
+            self._schedule(0)
+
+    def stop(self):
+        self._cancel()
+        self.steps = []
+        self.pos = 0
+        self._on_finish = None
+        self._progress()
+
+    def is_running(self):
+        return self._on_finish is not None
+
+    def set_speed(self, ms):
+        self.speed = ms
+
+    def pause(self):
+        self.paused = True
+        self._cancel()
+
+    def resume(self):
+        if self.paused and self.is_running():
+            self.paused = False
+            self._schedule(0)
+
+    def toggle_pause(self):
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def step(self):
+        self.pause()
+        if self.pos < len(self.steps):
+            self._apply(self.pos, self.pos + 1)
+        elif self.is_running():
+            self._finish()
+
+    def seek(self, k):
+        k = max(0, min(k, len(self.steps)))
+        if k < self.pos:
+            self.reset()
+            self.pos = 0
+        self._apply(self.pos, k)
+
+    def skip_to_end(self):
+        self._cancel()
+        self._apply(self.pos, len(self.steps))
+        if self.is_running():
+            self._finish()
+
+    def _apply(self, start, end):
+        for i in range(start, end):
+            for op in self.steps[i]:
+                self.apply_op(op)
+        if self.flush:
+            self.flush()
+        self.pos = end
+        self._progress()
+
+    def _tick(self):
+        self._job = None
+        if self.pos >= len(self.steps):
+            self._finish()
+            return
+        self._apply(self.pos, self.pos + 1)
+        self._schedule(self.speed)
+
+    def _schedule(self, delay):
+        self._cancel()
+        self._job = self.root.after(delay, self._tick)
+
+    def _cancel(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+
+    def _finish(self):
+        self._cancel()
+        callback = self._on_finish
+        self._on_finish = None
+        if callback:
+            callback()
+
+    def _progress(self):
+        if self.on_progress:
+            self.on_progress(self.pos, len(self.steps))
+
+
+def path_steps(path, vertex_role, edge_role='path', width=4):
+    for i in range(len(path)):
+        step = [('v', path[i], vertex_role)]
+        if i > 0:
+            step.append(('e', path[i-1], path[i], edge_role, width))
+        yield step
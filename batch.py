@@ -0,0 +1,247 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import algorithms
+import connectivity
+import max_flow
+from graph_file import EXTENSION, load_graph_file
+from shortest_path import INF, METHODS as PATH_METHODS, ShortestPathEngine
+
+# ================== HEADLESS BATCH ==================
+# Chạy một thuật toán trên mọi file đồ thị (.json / .grb) trong một thư mục, không
+# cần Tkinter. Mỗi file là một việc trong process pool; kết quả được in ngay khi
+# xong, mỗi dòng một đối tượng JSON:
+#   {"file", "algorithm", "n", "m", "directed", "weighted", "ok", "seconds", "result"}
+# hoặc {"file", "algorithm", "ok": false, "error"} khi file lỗi.
+# Mã đỉnh trong tham số và kết quả là mã đỉnh ổn định như trên giao diện.
+#
+#   python batch.py do_thi/ shortest_path --source 0 --target 5 --method dijkstra
+#   python batch.py do_thi/ max_flow --source 0 --sink 9 -j 8 -o ket_qua.jsonl
+FILE_EXTENSIONS = (".json", EXTENSION)
+IN_FLIGHT_PER_PROCESS = 4
+
+
+def _vertex(graph, csr, v, name, last=False):
+    # Mã đỉnh ổn định -> chỉ số CSR; mặc định là đỉnh đầu (hoặc cuối) như hộp thoại giao diện
+    if v is None:
+        v = csr.ids[-1] if last else csr.ids[0]
+    if not graph.is_vertex(v):
+        raise ValueError(f"Đỉnh {name} không tồn tại: {v}")
+    return csr.dense_of[v]
+
+
+def _labels(csr, seq):
+    return [csr.ids[i] for i in seq]
+
+
+def _number(x):
+    # Như fmt_num nhưng giữ kiểu số: số thực nguyên in thành số nguyên; JSON không có vô cực
+    if x == INF:
+        return None
+    if isinstance(x, float) and x.is_integer():
+        return int(x)
+    return x
+
+
+# ================== THUẬT TOÁN ==================
+def run_bfs(graph, csr, params):
+    order, _ = algorithms.bfs(csr, _vertex(graph, csr, params.start, "bắt đầu"))
+    return {"order": _labels(csr, order)}
+
+
+def run_dfs(graph, csr, params):
+    order, _ = algorithms.dfs(csr, _vertex(graph, csr, params.start, "bắt đầu"))
+    return {"order": _labels(csr, order)}
+
+
+def run_shortest_path(graph, csr, params):
+    source = _vertex(graph, csr, params.source, "nguồn")
+    target = _vertex(graph, csr, params.target, "đích", last=True)
+    method = params.method or "dijkstra"
+    if method not in PATH_METHODS.values():
+        raise ValueError(f"Phương pháp không hỗ trợ: {method}")
+    dist, path, _ = ShortestPathEngine(graph).query(source, target, method)
+    return {"distance": _number(dist), "path": _labels(csr, path) if path is not None else None}
+
+
+def run_bipartite(graph, csr, params):
+    color, cycle = algorithms.bipartite(csr)
+    if cycle is not None:
+        return {"bipartite": False, "odd_cycle": _labels(csr, cycle)}
+    return {"bipartite": True,
+            "sides": [[csr.ids[v] for v in range(csr.n) if color[v] == c] for c in (0, 1)]}
+
+
+def run_prim(graph, csr, params):
+    total, order, components = algorithms.prim(csr)
+    return {"total": _number(total),
+            "edges": [[csr.ids[p], csr.ids[u], _number(w)] for p, u, w in order if p != -1],
+            "trees": [{"root": csr.ids[r], "weight": _number(w), "size": size} for r, w, size in components]}
+
+
+def run_kruskal(graph, csr, params):
+    total, edges = algorithms.kruskal(csr)
+    return {"total": _number(total), "edges": [[csr.ids[u], csr.ids[v], _number(w)] for u, v, w in edges]}
+
+
+def run_euler(graph, csr, params):
+    kind, start = algorithms.euler_kind(csr)
+    if kind is None:
+        return {"kind": None, "walk": None}
+    return {"kind": kind, "walk": _labels(csr, algorithms.hierholzer(csr, start))}
+
+
+def run_scc(graph, csr, params):
+    comp, count = connectivity.strongly_connected(csr)
+    groups = [[] for _ in range(count)]
+    for v in range(csr.n):
+        groups[comp[v]].append(csr.ids[v])
+    return {"count": count, "components": groups}
+
+
+def run_biconnected(graph, csr, params):
+    bridges, articulation, components = connectivity.biconnected(csr)
+
+    def edge(e):
+        return [csr.ids[csr.eu[e]], csr.ids[csr.ev[e]]]
+
+    return {"bridges": [edge(e) for e in bridges],
+            "articulation": [csr.ids[v] for v in range(csr.n) if articulation[v]],
+            "components": [sorted({x for e in comp for x in edge(e)}) for comp in components]}
+
+
+def run_max_flow(graph, csr, params):
+    source = _vertex(graph, csr, params.source, "nguồn")
+    sink = _vertex(graph, csr, params.sink, "đích", last=True)
+    method = params.method or "dinic"
+    if method not in max_flow.METHODS.values():
+        raise ValueError(f"Phương pháp không hỗ trợ: {method}")
+    if source == sink:
+        raise ValueError("Đỉnh nguồn và đích phải khác nhau")
+    if csr.min_weight < 0:
+        raise ValueError("Sức chứa của cạnh không được âm")
+    value, flows, _, cut = max_flow.max_flow(csr, source, sink, method)
+    return {"value": _number(value),
+            "cut": [[csr.ids[csr.eu[e]], csr.ids[csr.ev[e]], _number(csr.ew[e])] for e in cut],
+            "flows": [[csr.ids[csr.eu[e]], csr.ids[csr.ev[e]], _number(flows[e])]
+                      for e in range(csr.m) if abs(flows[e]) > max_flow.EPS]}
+
+
+def run_gomory_hu(graph, csr, params):
+    if csr.directed:
+        raise ValueError("Cây Gomory-Hu chỉ áp dụng cho đồ thị vô hướng")
+    if csr.min_weight < 0:
+        raise ValueError("Sức chứa của cạnh không được âm")
+    # Đã chạy song song theo file nên mỗi cây dựng trong một tiến trình
+    tree = max_flow.gomory_hu(csr, processes=1)
+    return {"tree": [[csr.ids[v], csr.ids[tree.parent[v]], _number(tree.weight[v])]
+                     for v in range(csr.n) if tree.parent[v] >= 0]}
+
+
+ALGORITHMS = {
+    "bfs": run_bfs,
+    "dfs": run_dfs,
+    "shortest_path": run_shortest_path,
+    "bipartite": run_bipartite,
+    "prim": run_prim,
+    "kruskal": run_kruskal,
+    "euler": run_euler,
+    "scc": run_scc,
+    "biconnected": run_biconnected,
+    "max_flow": run_max_flow,
+    "gomory_hu": run_gomory_hu,
+}
+
+
+# ================== CHẠY THEO LÔ ==================
+def run_file(path, params):
+    # Việc của một tiến trình: luôn trả về một bản ghi, lỗi cũng được ghi lại
+    record = {"file": path, "algorithm": params.algorithm}
+    try:
+        began = time.perf_counter()
+        graph = load_graph_file(path)
+        if graph.num_vertices() == 0:
+            raise ValueError("Đồ thị rỗng")
+        csr = graph.csr()
+        record.update(n=csr.n, m=csr.m, directed=graph.directed, weighted=graph.weighted)
+        result = ALGORITHMS[params.algorithm](graph, csr, params)
+        record.update(ok=True, seconds=round(time.perf_counter() - began, 6), result=result)
+    except Exception as e:
+        record.update(ok=False, error=f"{type(e).__name__}: {e}")
+    return record
+
+
+def graph_files(directory, recursive=False):
+    if recursive:
+        found = [os.path.join(root, name) for root, _, names in os.walk(directory) for name in names]
+    else:
+        found = [os.path.join(directory, name) for name in os.listdir(directory)]
+    return sorted(p for p in found if p.lower().endswith(FILE_EXTENSIONS) and os.path.isfile(p))
+
+
+def run_batch(files, params, processes=None):
+    # Generator: trả về bản ghi theo thứ tự hoàn thành; chỉ giữ một số việc đang chạy
+    # cố định để danh sách hàng nghìn file không bị nộp hết vào pool một lúc
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(files) <= 1:
+        for path in files:
+            yield run_file(path, params)
+        return
+    with ProcessPoolExecutor(processes) as pool:
+        pending = set()
+        files = iter(files)
+        limit = processes * IN_FLIGHT_PER_PROCESS
+        while True:
+            for path in files:
+                pending.add(pool.submit(run_file, path, params))
+                if len(pending) >= limit:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Chạy một thuật toán đồ thị trên mọi file .json/.grb trong thư mục, in kết quả dạng JSON lines.")
+    parser.add_argument("directory", help="thư mục chứa file đồ thị")
+    parser.add_argument("algorithm", choices=sorted(ALGORITHMS))
+    parser.add_argument("--start", type=int, help="đỉnh bắt đầu (bfs, dfs)")
+    parser.add_argument("--source", type=int, help="đỉnh nguồn (shortest_path, max_flow)")
+    parser.add_argument("--target", type=int, help="đỉnh đích (shortest_path)")
+    parser.add_argument("--sink", type=int, help="đỉnh thu (max_flow)")
+    parser.add_argument("--method", help="dijkstra | bidirectional | astar | bfs (shortest_path); "
+                                         "dinic | push_relabel | edmonds_karp (max_flow)")
+    parser.add_argument("-j", "--processes", type=int, help="số tiến trình (mặc định: số CPU)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="tìm cả trong thư mục con")
+    parser.add_argument("-o", "--output", help="ghi ra file thay vì stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    params = parse_args(argv)
+    if not os.path.isdir(params.directory):
+        sys.exit(f"Không tìm thấy thư mục: {params.directory}")
+    files = graph_files(params.directory, params.recursive)
+    out = open(params.output, "w", encoding='utf-8') if params.output else sys.stdout
+    failed = 0
+    try:
+        for record in run_batch(files, params, params.processes):
+            failed += not record["ok"]
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{len(files)} file, {failed} lỗi", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+
+import algorithms
+import connectivity
+import frontier
+import generators
+import max_flow
+import shortest_path
+from graph_core import build_csr
+
+# ================== BENCHMARK ==================
+# Đo thời gian các thuật toán (không cần giao diện) trên các họ đồ thị sinh theo
+# seed, quét nhiều kích thước, đối chiếu kết quả giữa các cách cài đặt khác nhau
+# và ghi báo cáo JSON để so sánh giữa hai lần chạy:
+#   python benchmark.py -o truoc.json
+#   python benchmark.py --compare truoc.json          # báo các trường hợp chậm đi
+# Kích thước là số cạnh xấp xỉ của đồ thị; mỗi họ tự chọn số đỉnh tương ứng.
+SIZES = (1000, 10000, 100000)
+REPEATS = 3
+TOLERANCE = 0.25
+# Thời gian quá nhỏ thì sai số đo lớn hơn chênh lệch nên không đem so sánh
+MIN_COMPARABLE = 0.005
+# Kích thước lớn nhất cho thuật toán quá chậm ở kích thước lớn (O(V E^2))
+MAX_SIZE = {"max_flow_edmonds_karp": 10000}
+
+
+# ================== HỌ ĐỒ THỊ ==================
+def _grid(size, seed):
+    side = max(2, round(math.sqrt(size / 2)))
+    return generators.grid(side, side, seed)
+
+
+def _flow(size, seed):
+    width = max(2, round(math.sqrt(size / 3)))
+    return generators.flow_network(max(2, size // (3 * width)), width, 3, seed)
+
+
+FAMILIES = {
+    "grid": _grid,
+    "erdos_renyi": lambda size, seed: generators.erdos_renyi(max(10, size // 4), size, seed),
+    "scale_free": lambda size, seed: generators.scale_free(max(5, size // 3), 3, seed),
+    "complete": lambda size, seed: generators.complete(max(3, round(math.sqrt(2 * size))), seed),
+    "eulerian": lambda size, seed: generators.eulerian(max(3, size // 4), size, seed),
+    "flow": _flow,
+}
+
+
+# ================== ĐỐI CHIẾU KẾT QUẢ ==================
+# Mỗi hàm kiểm tra trả về None nếu khớp, ngược lại là chuỗi mô tả chỗ sai
+def _without_numpy(fn):
+    saved = frontier.np
+    frontier.np = None
+    try:
+        return fn()
+    finally:
+        frontier.np = saved
+
+
+def check_bfs(graph, csr, result):
+    order, parent = result
+    if frontier.np is not None:
+        other = _without_numpy(lambda: algorithms.bfs(csr, 0))
+        if other != result:
+            return "numpy và Python cho thứ tự BFS khác nhau"
+    dist = [-1] * csr.n
+    for v in order:
+        dist[v] = 0 if parent[v] == -1 else dist[parent[v]] + 1
+    for u, v in zip(csr.eu, csr.ev):
+        if dist[u] >= 0 and (dist[v] < 0 or abs(dist[u] - dist[v]) > 1):
+            return f"cạnh ({u}, {v}) nối hai tầng cách nhau quá 1"
+    return None
+
+
+def check_dfs(graph, csr, result):
+    order, _ = result
+    reach, _ = algorithms.bfs(csr, 0)
+    if sorted(order) != sorted(reach):
+        return "DFS và BFS tới được các tập đỉnh khác nhau"
+    return None
+
+
+def check_bipartite(graph, csr, result):
+    color, cycle = result
+    if frontier.np is not None and _without_numpy(lambda: algorithms.bipartite(csr)) != result:
+        return "numpy và Python cho kết quả tô 2 màu khác nhau"
+    edges = {(u, v) for u, v in zip(csr.eu, csr.ev)}
+    edges |= {(v, u) for u, v in edges}
+    if cycle is None:
+        if any(color[u] == color[v] for u, v in edges):
+            return "hai đầu một cạnh cùng màu"
+        return None
+    if len(cycle) % 2 == 0 or any((cycle[i - 1], cycle[i]) not in edges for i in range(len(cycle))):
+        return "chu trình lẻ không hợp lệ"
+    return None
+
+
+def check_prim(graph, csr, result):
+    total, _ = algorithms.kruskal(csr)
+    if abs(total - result[0]) > 1e-6:
+        return f"Prim {result[0]} khác Kruskal {total}"
+    return None
+
+
+def check_kruskal(graph, csr, result):
+    total, _, _ = algorithms.prim(csr)
+    if abs(total - result[0]) > 1e-6:
+        return f"Kruskal {result[0]} khác Prim {total}"
+    return None
+
+
+def check_hierholzer(graph, csr, result):
+    walk = result
+    if len(walk) != csr.m + 1:
+        return f"đường đi có {len(walk) - 1} cạnh, đồ thị có {csr.m}"
+    remaining = {}
+    for u, v in zip(csr.eu, csr.ev):
+        key = (u, v) if csr.directed or u <= v else (v, u)
+        remaining[key] = remaining.get(key, 0) + 1
+    for u, v in zip(walk, walk[1:]):
+        key = (u, v) if csr.directed or u <= v else (v, u)
+        if not remaining.get(key):
+            return f"cạnh ({u}, {v}) không có hoặc bị dùng hai lần"
+        remaining[key] -= 1
+    return None
+
+
+def check_shortest_path(graph, csr, result):
+    # Khoảng cách Dijkstra tới đỉnh cuối so với Dijkstra hai chiều và A*
+    t = csr.n - 1
+    expected = result[0][t]
+    bidirectional, _, _ = shortest_path.bidirectional_dijkstra(csr, 0, t)
+    xs, ys, scale = shortest_path.ShortestPathEngine(graph).geometry()
+    astar, _, _ = shortest_path.astar(csr, xs, ys, scale, 0, t)
+    if abs(bidirectional - expected) > 1e-6 or abs(astar - expected) > 1e-6:
+        return f"Dijkstra {expected}, hai chiều {bidirectional}, A* {astar}"
+    return None
+
+
+def _flow_check(method):
+    def check(graph, csr, result):
+        # So với Dinic (Dinic so với đẩy - nâng nhãn)
+        other = "push_relabel" if method == "dinic" else "dinic"
+        value = max_flow.max_flow(csr, 0, csr.n - 1, other)[0]
+        if abs(value - result[0]) > 1e-6:
+            return f"{method} {result[0]} khác {other} {value}"
+        return None
+    return check
+
+
+# ================== CÁC TRƯỜNG HỢP ==================
+# tên: (họ đồ thị áp dụng, hàm chạy(graph, csr), hàm đối chiếu hoặc None)
+UNDIRECTED = ("grid", "erdos_renyi", "scale_free", "complete", "eulerian")
+WEIGHTED = ("grid", "erdos_renyi", "scale_free", "complete")
+
+CASES = {
+    "csr": (UNDIRECTED + ("flow",),
+            lambda g, csr: build_csr(g.vertices, g.edges, g.edge_weights, g.directed), None),
+    "bfs": (UNDIRECTED, lambda g, csr: algorithms.bfs(csr, 0), check_bfs),
+    "dfs": (UNDIRECTED, lambda g, csr: algorithms.dfs(csr, 0), check_dfs),
+    "bipartite": (UNDIRECTED, lambda g, csr: algorithms.bipartite(csr), check_bipartite),
+    "prim": (WEIGHTED, lambda g, csr: algorithms.prim(csr), check_prim),
+    "kruskal": (WEIGHTED, lambda g, csr: algorithms.kruskal(csr), check_kruskal),
+    "dijkstra": (("grid", "erdos_renyi", "scale_free"),
+                 lambda g, csr: shortest_path.dijkstra(csr, 0), check_shortest_path),
+    "hierholzer": (("eulerian",),
+                   lambda g, csr: algorithms.hierholzer(csr, algorithms.euler_kind(csr)[1]), check_hierholzer),
+    "scc": (("flow",), lambda g, csr: connectivity.strongly_connected(csr), None),
+    "biconnected": (UNDIRECTED, lambda g, csr: connectivity.biconnected(csr), None),
+}
+for _method in max_flow.METHODS.values():
+    CASES["max_flow_" + _method] = (("flow",), lambda g, csr, m=_method: max_flow.max_flow(csr, 0, csr.n - 1, m),
+                                    _flow_check(_method))
+
+
+def measure(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        began = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - began)
+    return result, times
+
+
+def run(sizes=SIZES, cases=None, families=None, repeats=REPEATS, seed=0, log=None):
+    # Generator: một dòng kết quả cho mỗi (thuật toán, họ đồ thị, kích thước)
+    cases = cases or list(CASES)
+    families = families or list(FAMILIES)
+    for family in families:
+        wanted = [c for c in cases if family in CASES[c][0]]
+        if not wanted:
+            continue
+        for size in sizes:
+            graph, build_times = measure(lambda: FAMILIES[family](size, seed), 1)
+            csr = graph.csr()
+            if log:
+                log(f"{family} {size}: n={csr.n} m={csr.m} ({build_times[0]:.2f}s)")
+            for name in wanted:
+                if size > MAX_SIZE.get(name, size):
+                    continue
+                _, fn, check = CASES[name]
+                result, times = measure(lambda: fn(graph, csr), repeats)
+                error = check(graph, csr, result) if check else None
+                yield {"algorithm": name, "family": family, "size": size, "n": csr.n, "m": csr.m,
+                       "min": min(times), "median": statistics.median(times), "repeats": repeats,
+                       "check": "-" if check is None else "ok" if error is None else "mismatch",
+                       "error": error}
+
+
+def metadata(seed, repeats):
+    numpy = getattr(frontier.np, "__version__", None)
+    return {"python": platform.python_version(), "numpy": numpy, "platform": platform.platform(),
+            "processor": platform.processor(), "seed": seed, "repeats": repeats,
+            "date": time.strftime("%Y-%m-%d %H:%M:%S")}
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    # Các dòng chậm hơn báo cáo cũ quá tolerance (theo thời gian nhỏ nhất)
+    old = {(r["algorithm"], r["family"], r["size"]): r for r in baseline["results"]}
+    slower = []
+    for r in results:
+        before = old.get((r["algorithm"], r["family"], r["size"]))
+        if before is None or max(before["min"], r["min"]) < MIN_COMPARABLE:
+            continue
+        ratio = r["min"] / max(before["min"], 1e-12)
+        if ratio > 1 + tolerance:
+            slower.append((r, before, ratio))
+    return slower
+
+
+def format_row(r):
+    return (f"{r['algorithm']:<24}{r['family']:<13}{r['n']:>9}{r['m']:>10}"
+            f"{r['min'] * 1000:>12.2f}{r['median'] * 1000:>12.2f}  {r['check']}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark các thuật toán đồ thị trên đồ thị sinh ngẫu nhiên.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="số cạnh xấp xỉ")
+    parser.add_argument("--algorithms", nargs="+", choices=sorted(CASES), help="mặc định: tất cả")
+    parser.add_argument("--families", nargs="+", choices=sorted(FAMILIES), help="mặc định: tất cả")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="ghi báo cáo JSON")
+    parser.add_argument("--compare", help="báo cáo JSON cũ để so sánh")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="mức chậm đi cho phép (0.25 = 25%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    params = parse_args(argv)
+    log = lambda text: print(text, file=sys.stderr)
+    print(f"{'thuật toán':<24}{'họ':<13}{'n':>9}{'m':>10}{'min (ms)':>12}{'median (ms)':>12}  đối chiếu")
+    results = []
+    for row in run(params.sizes, params.algorithms, params.families, params.repeats, params.seed, log):
+        results.append(row)
+        print(format_row(row), flush=True)
+        if row["error"]:
+            print(f"    !! {row['error']}")
+
+    report = {"meta": metadata(params.seed, params.repeats), "results": results}
+    if params.output:
+        with open(params.output, "w", encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    failed = sum(r["check"] == "mismatch" for r in results)
+    slower = []
+    if params.compare:
+        with open(params.compare, "r", encoding='utf-8') as f:
+            slower = compare(results, json.load(f), params.tolerance)
+        print(f"\nSo với {params.compare}: {len(slower)} trường hợp chậm hơn {params.tolerance:.0%}")
+        for r, before, ratio in slower:
+            print(f"  {r['algorithm']} / {r['family']} / {r['size']}: "
+                  f"{before['min'] * 1000:.2f} -> {r['min'] * 1000:.2f} ms (x{ratio:.2f})")
+    if failed:
+        print(f"\n{failed} trường hợp kết quả không khớp")
+    return 1 if failed or slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# ================== DFS ANALYSES (TARJAN) ==================
+# Mọi thuật toán duyệt bằng ngăn xếp tường minh với con trỏ cạnh kế tiếp it[u]
+# trên CSR nên chạy tuyến tính và không bị giới hạn độ sâu đệ quy của Python.
+
+
+def strongly_connected(csr):
+    # Tarjan: trả về (comp, số thành phần); comp[v] là số hiệu thành phần của v,
+    # đánh số theo thứ tự topo ngược của đồ thị các thành phần
+    n = csr.n
+    off, tgt = csr.offsets, csr.targets
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    comp = [-1] * n
+    it = list(off[:n])
+    stack = []
+    count = 0
+    t = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = t
+        t += 1
+        stack.append(root)
+        on_stack[root] = True
+        call = [root]
+
+        while call:
+            u = call[-1]
+            i = it[u]
+            if i < off[u + 1]:
+                it[u] = i + 1
+                v = tgt[i]
+                if index[v] == -1:
+                    index[v] = low[v] = t
+                    t += 1
+                    stack.append(v)
+                    on_stack[v] = True
+                    call.append(v)
+                elif on_stack[v] and index[v] < low[u]:
+                    low[u] = index[v]
+                continue
+
+            call.pop()
+            if call:
+                p = call[-1]
+                if low[u] < low[p]:
+                    low[p] = low[u]
+            if low[u] == index[u]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    comp[w] = count
+                    if w == u:
+                        break
+                count += 1
+    return comp, count
+
+
+def biconnected(csr):
+    # Đồ thị vô hướng: trả về (cầu, đỉnh khớp, thành phần song liên thông)
+    # cầu và thành phần song liên thông là danh sách chỉ số cạnh CSR; bỏ qua
+    # cạnh cha theo chỉ số cạnh nên cạnh song song không bị coi là cầu
+    n = csr.n
+    off, tgt, slot_edges = csr.offsets, csr.targets, csr.slot_edges
+    disc = [-1] * n
+    low = [0] * n
+    parent_edge = [-1] * n
+    it = list(off[:n])
+    articulation = [False] * n
+    bridges = []
+    components = []
+    edge_stack = []
+    t = 0
+
+    for root in range(n):
+        if disc[root] != -1:
+            continue
+        disc[root] = low[root] = t
+        t += 1
+        root_children = 0
+        call = [root]
+
+        while call:
+            u = call[-1]
+            i = it[u]
+            if i < off[u + 1]:
+                it[u] = i + 1
+                e = slot_edges[i]
+                if e == parent_edge[u]:
+                    continue
+                v = tgt[i]
+                if disc[v] == -1:
+                    disc[v] = low[v] = t
+                    t += 1
+                    parent_edge[v] = e
+                    edge_stack.append(e)
+                    call.append(v)
+                    if u == root:
+                        root_children += 1
+                elif disc[v] < disc[u]:
+                    # Cạnh ngược lên tổ tiên (mỗi cạnh ngược chỉ được đẩy một lần)
+                    edge_stack.append(e)
+                    if disc[v] < low[u]:
+                        low[u] = disc[v]
+                continue
+
+            call.pop()
+            if not call:
+                break
+            p = call[-1]
+            if low[u] < low[p]:
+                low[p] = low[u]
+            if low[u] > disc[p]:
+                bridges.append(parent_edge[u])
+            if low[u] >= disc[p]:
+                if p != root:
+                    articulation[p] = True
+                comp = []
+                while True:
+                    e = edge_stack.pop()
+                    comp.append(e)
+                    if e == parent_edge[u]:
+                        break
+                components.append(comp)
+
+        if root_children > 1:
+            articulation[root] = True
+    return bridges, articulation, components
@@ -0,0 +1,33 @@
+from array import array
+
+# ================== DISJOINT SET (UNION-FIND) ==================
+class DisjointSet:
+    # parent/rank lưu trong mảng; hợp theo hạng và nén nửa đường đi khi tìm gốc,
+    # không dùng đệ quy nên an toàn với chuỗi dài
+    def __init__(self, n):
+        self.parent = array('l', range(n))
+        self.rank = bytearray(n)
+        self.count = n
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, x, y):
+        # Trả về True nếu x, y vốn thuộc hai tập khác nhau
+        x, y = self.find(x), self.find(y)
+        if x == y:
+            return False
+        if self.rank[x] < self.rank[y]:
+            x, y = y, x
+        self.parent[y] = x
+        if self.rank[x] == self.rank[y]:
+            self.rank[x] += 1
+        self.count -= 1
+        return True
+
+    def connected(self, x, y):
+        return self.find(x) == self.find(y)
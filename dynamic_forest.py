@@ -0,0 +1,192 @@
+from disjoint_set import DisjointSet
+
+# ================== DYNAMIC MINIMUM SPANNING FOREST ==================
+# Rừng khung nhỏ nhất của đồ thị vô hướng tương ứng (đồ thị có hướng: bỏ chiều
+# cạnh, nên số cây là số thành phần liên thông yếu), cập nhật theo từng thao tác
+# sửa đồ thị thay vì chạy lại Kruskal/Prim:
+#   thêm cạnh     khác cây: nối hai cây; cùng cây: cạnh nặng nhất trên đường nối
+#                 hai đầu trong cây bị thay nếu nặng hơn cạnh mới (tính chất chu trình)
+#   xóa cạnh cây  cây tách làm hai; cạnh nhẹ nhất nối hai phần (tìm từ phần nhỏ
+#                 hơn) thay vào, không có thì số thành phần tăng thêm một
+#   đổi trọng số  cạnh cây nặng lên: như xóa rồi tìm cạnh thay (kể cả chính nó);
+#                 cạnh ngoài cây nhẹ đi: như thêm cạnh
+# Mỗi cây giữ con trỏ cha nên đường nối hai đỉnh tìm được bằng cách đi lên từ hai
+# đầu (chi phí tỉ lệ độ sâu); tìm cạnh thay thế duyệt xen kẽ từ hai phần của cây
+# vừa cắt nên chi phí tỉ lệ phần nhỏ hơn (và bậc của nó). Không thao tác nào phụ
+# thuộc tổng số cạnh của đồ thị.
+# Các cạnh vào/ra khỏi cây được ghi vào changes theo thứ tự để giao diện chỉ tô lại
+# phần thay đổi.
+
+
+class DynamicForest:
+    def __init__(self, graph):
+        self.graph = graph
+        self.rebuild()
+
+    def rebuild(self):
+        # Dựng lại từ đầu bằng Kruskal (khi bật chế độ, tải đồ thị, đánh số lại)
+        graph = self.graph
+        self.adj = {v: {} for v in range(len(graph.vertices)) if graph.vertices[v] is not None}
+        self.parent = dict.fromkeys(self.adj)
+        self.tree = {}
+        self.total = 0
+        self.changes = []
+        edges = sorted(graph.edge_items(), key=lambda item: graph.edge_weight(item[0]))
+        dsu = DisjointSet(len(graph.vertices))
+        for eid, u, v in edges:
+            if dsu.union(u, v):
+                self._link(eid, u, v, graph.edge_weight(eid))
+        # Hướng các cây từ gốc bằng BFS (nối lần lượt bằng _attach có thể tốn O(n) mỗi lần)
+        seen = set()
+        for root in self.adj:
+            if root in seen:
+                continue
+            seen.add(root)
+            queue = [root]
+            for x in queue:
+                for y, eid in self.adj[x].items():
+                    if y not in seen:
+                        seen.add(y)
+                        self.parent[y] = (x, eid)
+                        queue.append(y)
+
+    def num_components(self):
+        return len(self.adj) - len(self.tree)
+
+    def take_changes(self):
+        # [(mã cạnh, True nếu vào cây / False nếu ra khỏi cây)] từ lần gọi trước
+        changes, self.changes = self.changes, []
+        return changes
+
+    def _link(self, eid, u, v, w):
+        self.adj[u][v] = eid
+        self.adj[v][u] = eid
+        self.tree[eid] = (u, v, w)
+        self.total += w
+        self.changes.append((eid, True))
+
+    def _cut(self, eid):
+        u, v, w = self.tree.pop(eid)
+        del self.adj[u][v]
+        del self.adj[v][u]
+        if self.parent[u] == (v, eid):
+            self.parent[u] = None
+        else:
+            self.parent[v] = None
+        self.total -= w
+        self.changes.append((eid, False))
+
+    def _attach(self, eid, u, v, w):
+        # Nối cây chứa u vào v: đổi gốc cây của u về u (đảo con trỏ cha trên đường u -> gốc)
+        child, x, via = None, u, None
+        while True:
+            up = self.parent[x]
+            self.parent[x] = None if child is None else (child, via)
+            if up is None:
+                break
+            child, (x, via) = x, up
+        self.parent[u] = (v, eid)
+        self._link(eid, u, v, w)
+
+    def _up(self, x):
+        # Đường từ x lên gốc: [(đỉnh, mã cạnh tới cha)], phần tử cuối là (gốc, None)
+        path = []
+        while True:
+            up = self.parent[x]
+            if up is None:
+                path.append((x, None))
+                return path
+            path.append((x, up[1]))
+            x = up[0]
+
+    def _smaller_side(self, a, b):
+        # a, b ở hai cây khác nhau: duyệt xen kẽ từ hai phía, trả về tập đỉnh của cây
+        # duyệt hết trước
+        seen = ({a}, {b})
+        queues = ([a], [b])
+        heads = [0, 0]
+        side = 0
+        while heads[side] < len(queues[side]):
+            queue, mine = queues[side], seen[side]
+            x = queue[heads[side]]
+            heads[side] += 1
+            for y in self.adj[x]:
+                if y not in mine:
+                    mine.add(y)
+                    queue.append(y)
+            side = 1 - side
+        return seen[side]
+
+    def _insert(self, eid, u, v, w):
+        if u == v:
+            return
+        a, b = self._up(u), self._up(v)
+        if len(a) > len(b):
+            u, v, a, b = v, u, b, a
+        if a[-1][0] != b[-1][0]:
+            self._attach(eid, u, v, w)
+            return
+        # Cùng cây: đường u - v đi qua tổ tiên chung thấp nhất
+        depth = {x: i for i, (x, _) in enumerate(a)}
+        j = next(j for j, (x, _) in enumerate(b) if x in depth)
+        path = [e for _, e in a[:depth[b[j][0]]]] + [e for _, e in b[:j]]
+        heaviest = max(path, key=lambda e: self.tree[e][2])
+        if self.tree[heaviest][2] > w:
+            self._cut(heaviest)
+            self._attach(eid, u, v, w)
+
+    def _replace(self, u, v):
+        # Sau khi cắt cạnh cây (u, v): nối lại hai phần bằng cạnh nhẹ nhất giữa chúng
+        side = self._smaller_side(u, v)
+        graph = self.graph
+        best, best_w = None, None
+        for x in side:
+            for eid in graph.incident_edges(x):
+                if eid in self.tree:
+                    continue
+                a, b = graph.edges[eid]
+                if a in side and b in side:
+                    continue
+                w = graph.edge_weight(eid)
+                if best is None or w < best_w:
+                    best, best_w = eid, w
+        if best is not None:
+            a, b = graph.edges[best]
+            if b in side:
+                a, b = b, a
+            self._attach(best, a, b, best_w)
+
+    # ================== THAO TÁC SỬA ĐỒ THỊ ==================
+    # Gọi sau khi đồ thị đã được sửa
+    def add_vertex(self, v):
+        self.adj[v] = {}
+        self.parent[v] = None
+
+    def add_edge(self, eid):
+        u, v = self.graph.edges[eid]
+        self._insert(eid, u, v, self.graph.edge_weight(eid))
+
+    def remove_edges(self, eids):
+        # Cạnh ngoài cây không ảnh hưởng tới rừng
+        for eid in eids:
+            if eid in self.tree:
+                u, v, _ = self.tree[eid]
+                self._cut(eid)
+                self._replace(u, v)
+
+    def remove_vertex(self, v, eids):
+        self.remove_edges(eids)
+        del self.adj[v]
+        del self.parent[v]
+
+    def reweight(self, eid):
+        u, v = self.graph.edges[eid]
+        w = self.graph.edge_weight(eid)
+        if eid not in self.tree:
+            self._insert(eid, u, v, w)
+        elif w > self.tree[eid][2]:
+            self._cut(eid)
+            self._replace(u, v)
+        else:
+            self.total += w - self.tree[eid][2]
+            self.tree[eid] = (u, v, w)
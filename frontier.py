@@ -0,0 +1,295 @@
+from array import array
+
+from graph_core import np_view
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ================== LEVEL-SYNCHRONOUS BFS ==================
+# BFS mở rộng cả tầng một lúc bằng phép toán vector trên mảng CSR:
+#   top-down   gom mọi ô kề của tầng hiện tại, giữ lần xuất hiện đầu tiên của mỗi
+#              đỉnh chưa thăm
+#   bottom-up  mỗi đỉnh chưa thăm tìm cạnh vào từ tầng hiện tại (các ô của đỉnh đã
+#              thăm được loại dần nên chi phí tỉ lệ với số cạnh vào còn lại)
+# Mỗi tầng chọn một phía (direction-optimizing): bottom-up khi số ô của tầng vượt
+# BOTTOM_UP_RATIO lần số ô vào còn lại (bottom-up không dừng sớm được như bản tuần
+# tự và còn phải lọc lại mảng ô nên chỉ có lợi khi tầng rất lớn). Cả hai phía chọn
+# cha theo cặp (vị trí cha trong tầng, vị trí ô kề) nhỏ nhất nên thứ tự thăm, cha
+# và khoảng cách trùng hoàn toàn với BFS dùng hàng đợi.
+# Không có numpy thì chạy BFS theo tầng bằng Python thuần với cùng kết quả.
+BOTTOM_UP_RATIO = 4.0
+_NONE = 2 ** 63 - 1
+
+
+class BFSResult:
+    # order: thứ tự thăm; dist: số cạnh từ gốc (-1 nếu không tới được);
+    # parent: đỉnh cha (-1 ở gốc và đỉnh không tới được);
+    # levels: vị trí bắt đầu từng tầng trong order, phần tử cuối là len(order);
+    # roots: gốc của từng lần duyệt (một gốc mỗi thành phần khi duyệt cả đồ thị);
+    # conflict: cạnh nối hai đỉnh cùng tầng khiến lần duyệt dừng sớm (stop_on_conflict)
+    def __init__(self, order, dist, parent, levels, roots, offsets, targets, conflict=None):
+        self.order = order
+        self.dist = dist
+        self.parent = parent
+        self.levels = levels
+        self.roots = roots
+        self.conflict = conflict
+        self._offsets = offsets
+        self._targets = targets
+
+    def path(self, v):
+        if self.dist[v] < 0:
+            return None
+        path = []
+        while v != -1:
+            path.append(v)
+            v = self.parent[v]
+        path.reverse()
+        return path
+
+    def coloring(self):
+        # Tô 2 màu theo tính chẵn lẻ của tầng (-1 nếu chưa thăm). Cạnh nối hai đỉnh cùng
+        # màu thì cùng tầng; hai nhánh cây BFS từ hai đầu tới tổ tiên chung cùng cạnh đó
+        # tạo chu trình lẻ. Trả về (màu, chu trình lẻ hoặc None)
+        dist = self.dist
+        color = [d & 1 if d >= 0 else -1 for d in dist]
+        conflict = self.conflict or self._conflict(color)
+        if conflict is None:
+            return color, None
+        u, v = conflict
+        left, right = [u], [v]
+        while u != v:
+            u, v = self.parent[u], self.parent[v]
+            left.append(u)
+            right.append(v)
+        right.pop()
+        right.reverse()
+        return color, left + right
+
+    def _conflict(self, color):
+        off, tgt = self._offsets, self._targets
+        if np is not None:
+            off, tgt = _np_arrays(off, tgt)
+            c = np.asarray(color)
+            src = np.repeat(np.arange(len(color)), np.diff(off))
+            bad = np.flatnonzero((c[src] == c[tgt]) & (c[src] >= 0))
+            if bad.size == 0:
+                return None
+            return int(src[bad[0]]), int(tgt[bad[0]])
+        for u in range(len(color)):
+            if color[u] < 0:
+                continue
+            for i in range(off[u], off[u + 1]):
+                if color[tgt[i]] == color[u]:
+                    return u, tgt[i]
+        return None
+
+
+def level_bfs(csr, start=None, target=None, undirected=False, stop_on_conflict=False):
+    # start None: duyệt mọi thành phần, mỗi lần bắt đầu từ đỉnh chưa thăm có chỉ số nhỏ nhất
+    # target: dừng ngay sau tầng chứa target
+    # undirected: bỏ qua chiều cạnh của đồ thị có hướng (dùng khi tô 2 màu)
+    # stop_on_conflict: dừng ở cạnh đầu tiên nối hai đỉnh cùng tầng (đồ thị không 2 phía)
+    off, tgt = csr.offsets, csr.targets
+    if undirected and csr.directed:
+        off, tgt = _symmetric(csr.n, off, tgt)
+    if np is None:
+        return _bfs_python(csr.n, off, tgt, start, target, stop_on_conflict)
+    return _bfs_numpy(csr.n, off, tgt, start, target, stop_on_conflict)
+
+
+def _np_arrays(off, tgt):
+    if isinstance(off, array):
+        return np_view(off), np_view(tgt)
+    return off, tgt
+
+
+def _symmetric(n, off, tgt):
+    # Danh sách kề vô hướng: các cạnh ra của u theo thứ tự cũ, sau đó các cạnh vào
+    if np is not None:
+        off, tgt = _np_arrays(off, tgt)
+        src = np.repeat(np.arange(n), np.diff(off))
+        a = np.concatenate((src, tgt))
+        b = np.concatenate((tgt, src))
+        order = np.argsort(a, kind='stable')
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(a, minlength=n), out=offsets[1:])
+        return offsets, b[order]
+    adj = [list(tgt[off[u]:off[u + 1]]) for u in range(n)]
+    for u in range(n):
+        for i in range(off[u], off[u + 1]):
+            adj[tgt[i]].append(u)
+    offsets = array('l', [0])
+    targets = array('l')
+    for nbrs in adj:
+        targets.extend(nbrs)
+        offsets.append(len(targets))
+    return offsets, targets
+
+
+def _bfs_python(n, off, tgt, start, target, check):
+    dist = [-1] * n
+    parent = [-1] * n
+    order = []
+    levels = [0]
+    roots = []
+    next_root = 0
+    while True:
+        if start is not None:
+            if roots:
+                break
+            root = start
+        else:
+            while next_root < n and dist[next_root] != -1:
+                next_root += 1
+            if next_root == n:
+                break
+            root = next_root
+        roots.append(root)
+        dist[root] = 0
+        frontier = [root]
+        depth = 0
+        while frontier:
+            order.extend(frontier)
+            levels.append(len(order))
+            if target is not None and dist[target] != -1:
+                return BFSResult(order, dist, parent, levels, roots, off, tgt)
+            depth += 1
+            nxt = []
+            for u in frontier:
+                for i in range(off[u], off[u + 1]):
+                    v = tgt[i]
+                    if dist[v] == -1:
+                        dist[v] = depth
+                        parent[v] = u
+                        nxt.append(v)
+                    elif check and dist[v] == depth - 1:
+                        # Bỏ phần tầng mới đang dở để kết quả giống bản numpy
+                        for w in nxt:
+                            dist[w] = parent[w] = -1
+                        return BFSResult(order, dist, parent, levels, roots, off, tgt, (u, v))
+            frontier = nxt
+    return BFSResult(order, dist, parent, levels, roots, off, tgt)
+
+
+class _Frontier:
+    # Trạng thái của một lần BFS bằng numpy
+    def __init__(self, n, off, tgt):
+        self.n = n
+        self.off, self.tgt = _np_arrays(off, tgt)
+        self.deg = np.diff(self.off)
+        self.dist = np.full(n, -1, dtype=np.int64)
+        self.parent = np.full(n, -1, dtype=np.int64)
+        self.pos = np.full(n, -1, dtype=np.int64)
+        self.best = np.full(n, _NONE, dtype=np.int64)
+        self.in_deg = np.bincount(self.tgt, minlength=n)
+        self.unvisited_slots = len(self.tgt)
+        self._reverse = None
+
+    def visit(self, vertices, parents, depth):
+        self.dist[vertices] = depth
+        self.parent[vertices] = parents
+        self.unvisited_slots -= int(self.in_deg[vertices].sum())
+
+    def expand(self, frontier, check=False):
+        # Trả về (đỉnh mới theo thứ tự thăm, cha tương ứng, cạnh nối hai đỉnh cùng tầng
+        # hoặc None). Khi cần tìm cạnh cùng tầng thì luôn top-down vì đằng nào cũng
+        # phải quét các ô của tầng hiện tại
+        frontier_slots = int(self.deg[frontier].sum())
+        if frontier_slots == 0:
+            return frontier[:0], frontier[:0], None
+        if not check and frontier_slots > BOTTOM_UP_RATIO * self.unvisited_slots:
+            return self.bottom_up(frontier) + (None,)
+        return self.top_down(frontier, frontier_slots, check)
+
+    def top_down(self, frontier, total, check):
+        counts = self.deg[frontier]
+        base = self.off[frontier] - (np.cumsum(counts) - counts)
+        slots = np.arange(total) + np.repeat(base, counts)
+        src = np.repeat(frontier, counts)
+        dst = self.tgt[slots]
+        seen = self.dist[dst]
+        conflict = None
+        if check:
+            same = np.flatnonzero(seen == self.dist[frontier[0]])
+            if same.size:
+                conflict = int(src[same[0]]), int(dst[same[0]])
+        # Khóa là vị trí trong dãy ô đã gom, vốn tăng dần theo (vị trí cha, vị trí ô)
+        key = np.flatnonzero(seen == -1)
+        new, key = self._first(dst[key], key, True)
+        return new, src[key], conflict
+
+    def bottom_up(self, frontier):
+        # Các ô (nguồn, đích, vị trí ô) có đích chưa thăm; dựng lần đầu rồi lọc dần
+        if self._reverse is None:
+            src = np.repeat(np.arange(self.n), self.deg)
+            self._reverse = (src, self.tgt, np.arange(len(self.tgt)))
+        src, dst, slot = self._reverse
+        alive = self.dist[dst] == -1
+        src, dst, slot = src[alive], dst[alive], slot[alive]
+        self._reverse = (src, dst, slot)
+
+        pos = self.pos
+        pos[frontier] = np.arange(len(frontier))
+        hit = np.flatnonzero(pos[src] >= 0)
+        width = len(self.tgt) + 1
+        key = pos[src[hit]] * width + slot[hit]
+        pos[frontier] = -1
+        new, key = self._first(dst[hit], key, False)
+        return new, frontier[key // width]
+
+    def _first(self, dst, key, ordered):
+        # Mỗi đỉnh giữ ô có khóa nhỏ nhất; kết quả sắp theo khóa
+        best = self.best
+        np.minimum.at(best, dst, key)
+        win = best[dst] == key
+        dst, key = dst[win], key[win]
+        best[dst] = _NONE
+        if not ordered:
+            rank = np.argsort(key)
+            dst, key = dst[rank], key[rank]
+        return dst, key
+
+
+def _bfs_numpy(n, off, tgt, start, target, check):
+    state = _Frontier(n, off, tgt)
+    dist = state.dist
+    chunks = []
+    levels = [0]
+    roots = []
+    count = 0
+    next_root = 0
+    conflict = None
+    done = False
+    while not done:
+        if start is not None:
+            if roots:
+                break
+            root = start
+        else:
+            while next_root < n and dist[next_root] != -1:
+                next_root += 1
+            if next_root == n:
+                break
+            root = next_root
+        roots.append(root)
+        frontier = np.array([root], dtype=np.int64)
+        state.visit(frontier, -1, 0)
+        depth = 0
+        while frontier.size:
+            chunks.append(frontier)
+            count += frontier.size
+            levels.append(count)
+            if target is not None and dist[target] != -1:
+                done = True
+                break
+            depth += 1
+            frontier, parents, conflict = state.expand(frontier, check)
+            if conflict is not None:
+                done = True
+                break
+            state.visit(frontier, parents, depth)
+    order = np.concatenate(chunks).tolist() if chunks else []
+    return BFSResult(order, dist.tolist(), state.parent.tolist(), levels, roots, state.off, state.tgt, conflict)
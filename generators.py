@@ -0,0 +1,133 @@
+import math
+import random
+from array import array
+
+from graph_core import Graph
+
+# ================== SYNTHETIC GRAPHS ==================
+# Các họ đồ thị sinh ngẫu nhiên theo seed (cùng seed -> cùng đồ thị) dùng cho
+# benchmark và thử nghiệm. Trọng số là số nguyên 1..MAX_WEIGHT; tọa độ đỉnh được
+# đặt sao cho mở được trên giao diện và dùng được cho A*.
+SPACING = 60
+MAX_WEIGHT = 100
+
+
+def _graph(vertices, edges, rng, directed=False, weighted=True):
+    eu = array('l', (u for u, _ in edges))
+    ev = array('l', (v for _, v in edges))
+    weights = [rng.randint(1, MAX_WEIGHT) for _ in edges] if weighted else [None] * len(edges)
+    return Graph.from_arrays(vertices, eu, ev, weights, directed, weighted)
+
+
+def _scatter(n, rng):
+    # Đỉnh rải đều trong hình vuông có mật độ giống lưới SPACING
+    side = SPACING * max(1, math.ceil(math.sqrt(n)))
+    return [(rng.uniform(0, side), rng.uniform(0, side)) for _ in range(n)]
+
+
+def _key(u, v, directed):
+    return (u, v) if directed or u < v else (v, u)
+
+
+def grid(rows, cols, seed=0, weighted=True):
+    # Lưới 4 láng giềng rows x cols
+    rng = random.Random(seed)
+    vertices = [(SPACING // 2 + c * SPACING, SPACING // 2 + r * SPACING) for r in range(rows) for c in range(cols)]
+    edges = []
+    for r in range(rows):
+        for c in range(cols):
+            v = r * cols + c
+            if c + 1 < cols:
+                edges.append((v, v + 1))
+            if r + 1 < rows:
+                edges.append((v, v + cols))
+    return _graph(vertices, edges, rng, weighted=weighted)
+
+
+def erdos_renyi(n, m, seed=0, directed=False, weighted=True):
+    # G(n, m): m cạnh phân biệt chọn đều, không có khuyên
+    rng = random.Random(seed)
+    limit = n * (n - 1) if directed else n * (n - 1) // 2
+    m = min(m, limit)
+    seen = set()
+    edges = []
+    while len(edges) < m:
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u == v:
+            continue
+        key = _key(u, v, directed)
+        if key not in seen:
+            seen.add(key)
+            edges.append(key)
+    return _graph(_scatter(n, rng), edges, rng, directed, weighted)
+
+
+def scale_free(n, k=3, seed=0, weighted=True):
+    # Barabási–Albert: mỗi đỉnh mới nối với k đỉnh cũ chọn theo tỉ lệ bậc
+    rng = random.Random(seed)
+    k = max(1, min(k, n - 1))
+    edges = [(u, v) for u in range(k + 1) for v in range(u + 1, k + 1)]
+    pool = [x for e in edges for x in e]
+    for v in range(k + 1, n):
+        chosen = set()
+        while len(chosen) < k:
+            chosen.add(pool[rng.randrange(len(pool))])
+        for u in chosen:
+            edges.append((u, v))
+            pool.extend((u, v))
+    return _graph(_scatter(n, rng), edges, rng, weighted=weighted)
+
+
+def complete(n, seed=0, weighted=True):
+    # Đỉnh xếp trên đường tròn
+    rng = random.Random(seed)
+    radius = max(SPACING, n * SPACING / (2 * math.pi))
+    vertices = [(radius * (1 + math.cos(2 * math.pi * i / n)), radius * (1 + math.sin(2 * math.pi * i / n)))
+                for i in range(n)]
+    edges = [(u, v) for u in range(n) for v in range(u + 1, n)]
+    return _graph(vertices, edges, rng, weighted=weighted)
+
+
+def eulerian(n, m, seed=0, directed=False, weighted=True):
+    # Chu trình Hamilton qua mọi đỉnh (liên thông, bậc chẵn / cân bằng) rồi thêm các
+    # tam giác không trùng cạnh; mỗi tam giác giữ nguyên tính chẵn của bậc nên đồ thị
+    # luôn có chu trình Euler
+    rng = random.Random(seed)
+    n = max(3, n)
+    order = list(range(n))
+    rng.shuffle(order)
+    edges = [(order[i], order[(i + 1) % n]) for i in range(n)]
+    seen = {_key(u, v, directed) for u, v in edges}
+    attempts = 0
+    while len(edges) + 3 <= m and attempts < 20 * m:
+        attempts += 1
+        a, b, c = rng.sample(range(n), 3)
+        tri = [(a, b), (b, c), (c, a)]
+        keys = [_key(u, v, directed) for u, v in tri]
+        if any(key in seen for key in keys):
+            continue
+        seen.update(keys)
+        edges.extend(tri)
+    return _graph(_scatter(n, rng), edges, rng, directed, weighted)
+
+
+def flow_network(layers, width, degree=3, seed=0):
+    # Mạng phân tầng có hướng: nguồn 0 -> tầng 1 -> ... -> tầng cuối -> đích n - 1;
+    # mỗi đỉnh nối tới degree đỉnh ngẫu nhiên của tầng sau, sức chứa 1..MAX_WEIGHT
+    rng = random.Random(seed)
+    n = layers * width + 2
+    sink = n - 1
+    vertices = [(SPACING // 2, SPACING * (width + 1) / 2)]
+    for layer in range(layers):
+        vertices.extend((SPACING * (layer + 1.5), SPACING * (i + 1)) for i in range(width))
+    vertices.append((SPACING * (layers + 1.5), SPACING * (width + 1) / 2))
+
+    edges = [(0, 1 + i) for i in range(width)]
+    for layer in range(layers - 1):
+        base = 1 + layer * width
+        for i in range(width):
+            for j in rng.sample(range(width), min(degree, width)):
+                edges.append((base + i, base + width + j))
+    last = 1 + (layers - 1) * width
+    edges.extend((last + i, sink) for i in range(width))
+    return _graph(vertices, edges, rng, directed=True)
@@ -0,0 +1,374 @@
+from array import array
+
+from spatial_index import SpatialGrid
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ================== CSR (COMPRESSED SPARSE ROW) ==================
+class CSRGraph:
+    # offsets[u]..offsets[u+1] là khoảng chỉ số trong targets/weights/slot_edges
+    # chứa các cạnh ra của u; eu/ev/ew là danh sách cạnh đánh số liên tục.
+    # CSR dùng chỉ số liên tục 0..n-1; ids/edge_ids đổi về mã đỉnh/mã cạnh ổn định
+    # của Graph, dense_of đổi mã đỉnh sang chỉ số liên tục (-1 nếu đã xóa)
+    def __init__(self, n, directed, offsets, targets, weights, slot_edges, eu, ev, ew,
+                 ids=None, dense_of=None, edge_ids=None):
+        self.n = n
+        self.m = len(eu)
+        self.directed = directed
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.slot_edges = slot_edges
+        self.eu = eu
+        self.ev = ev
+        self.ew = ew
+        self.min_weight = min(ew) if len(ew) else 0
+        self.ids = ids if ids is not None else array('l', range(n))
+        self.dense_of = dense_of if dense_of is not None else self.ids
+        self.edge_ids = edge_ids if edge_ids is not None else array('l', range(self.m))
+        self._reverse = None
+
+    def degree(self, u):
+        return self.offsets[u + 1] - self.offsets[u]
+
+    def neighbors(self, u):
+        return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+    def reverse(self):
+        # CSR của đồ thị chuyển vị (cạnh vào); đồ thị vô hướng dùng chính nó
+        if not self.directed:
+            return self
+        if self._reverse is None:
+            self._reverse = _build_csr_arrays(self.n, self.ev, self.eu, self.ew, True,
+                                              self.ids, self.dense_of, self.edge_ids)
+            self._reverse._reverse = self
+        return self._reverse
+
+    def in_degrees(self):
+        deg = [0] * self.n
+        for v in self.ev:
+            deg[v] += 1
+        return deg
+
+
+def build_csr(vertices, edges, edge_weights, directed):
+    # Bỏ qua các ô đã xóa (None) và đánh số lại liên tục
+    ids = array('l', (i for i, p in enumerate(vertices) if p is not None))
+    if len(ids) == len(vertices):
+        dense_of = ids
+    else:
+        dense_of = array('l', [-1]) * len(vertices)
+        for d, i in enumerate(ids):
+            dense_of[i] = d
+    edge_ids = array('l', (e for e, uv in enumerate(edges) if uv is not None))
+    eu = array('l', (dense_of[edges[e][0]] for e in edge_ids))
+    ev = array('l', (dense_of[edges[e][1]] for e in edge_ids))
+    ew = array('d', (1 if edge_weights[e] is None else edge_weights[e] for e in edge_ids))
+    return _build_csr_arrays(len(ids), eu, ev, ew, directed, ids, dense_of, edge_ids)
+
+
+def _build_csr_arrays(n, eu, ev, ew, directed, ids=None, dense_of=None, edge_ids=None):
+    m = len(eu)
+
+    counts = [0] * (n + 1)
+    for i in range(m):
+        counts[eu[i] + 1] += 1
+        if not directed:
+            counts[ev[i] + 1] += 1
+    for i in range(n):
+        counts[i + 1] += counts[i]
+    offsets = array('l', counts)
+
+    size = counts[n]
+    targets = array('l', [0]) * size
+    slot_weights = array('d', [0.0]) * size
+    slot_edges = array('l', [0]) * size
+
+    # Điền theo thứ tự cạnh để thứ tự kề giống danh sách kề cũ
+    pos = counts[:n]
+    for i in range(m):
+        u, v, w = eu[i], ev[i], ew[i]
+        p = pos[u]
+        targets[p] = v
+        slot_weights[p] = w
+        slot_edges[p] = i
+        pos[u] = p + 1
+        if not directed:
+            p = pos[v]
+            targets[p] = u
+            slot_weights[p] = w
+            slot_edges[p] = i
+            pos[v] = p + 1
+
+    return CSRGraph(n, directed, offsets, targets, slot_weights, slot_edges, eu, ev, ew,
+                    ids, dense_of, edge_ids)
+
+
+# ================== EDGE INDEX ==================
+class EdgeIndex:
+    # Bảng băm khóa cạnh -> danh sách mã cạnh (hỗ trợ đa đồ thị) và tập cạnh
+    # liên thuộc của từng đỉnh (dict giữ thứ tự, xóa O(1));
+    # đồ thị vô hướng dùng khóa chuẩn (min, max)
+    def __init__(self, directed=False):
+        self.directed = directed
+        self.by_key = {}
+        self.incident = []
+
+    def key(self, u, v):
+        if self.directed or u <= v:
+            return (u, v)
+        return (v, u)
+
+    def add_vertex(self):
+        self.incident.append({})
+
+    def add(self, eid, u, v):
+        self.by_key.setdefault(self.key(u, v), []).append(eid)
+        self.incident[u][eid] = None
+        self.incident[v][eid] = None
+
+    def remove(self, eid, u, v):
+        key = self.key(u, v)
+        ids = self.by_key[key]
+        ids.remove(eid)
+        if not ids:
+            del self.by_key[key]
+        self.incident[u].pop(eid, None)
+        self.incident[v].pop(eid, None)
+
+    def ids(self, u, v):
+        return self.by_key.get(self.key(u, v), ())
+
+    def rebuild(self, n, edges, directed):
+        self.directed = directed
+        self.by_key = {}
+        self.incident = [{} for _ in range(n)]
+        for eid, uv in enumerate(edges):
+            if uv is not None:
+                self.add(eid, *uv)
+
+
+# ================== GRAPH ==================
+class Graph:
+    # Mã đỉnh và mã cạnh ổn định: xóa chỉ đánh dấu ô là None (tombstone) và chạm
+    # tới các cạnh liên thuộc; đánh số liên tục chỉ được dựng khi cần (CSR, lưu file)
+    def __init__(self, directed=False, weighted=False):
+        self.vertices = []
+        self.edges = []
+        self.edge_weights = []
+        self.vertex_count = 0
+        self.edge_count = 0
+        self.directed = directed
+        self.weighted = weighted
+        self._index = EdgeIndex(directed)
+        self.spatial = SpatialGrid()
+        self.version = 0
+        self.layout_version = 0
+        self._csr = None
+        self._csr_version = -1
+
+    def _touch(self):
+        self.version += 1
+
+    @property
+    def index(self):
+        # Bảng băm cạnh chỉ được dựng khi lần đầu cần tới, nên tải một đồ thị lớn
+        # để xem hoặc chạy thuật toán không phải trả chi phí dựng bảng
+        if self._index is None:
+            self._index = EdgeIndex(self.directed)
+            self._index.rebuild(len(self.vertices), self.edges, self.directed)
+        return self._index
+
+    def num_vertices(self):
+        return self.vertex_count
+
+    def num_edges(self):
+        return self.edge_count
+
+    def is_vertex(self, v):
+        return 0 <= v < len(self.vertices) and self.vertices[v] is not None
+
+    def vertex_ids(self):
+        return self.csr().ids
+
+    def edge_items(self):
+        # (mã cạnh, u, v) của các cạnh còn tồn tại
+        return ((eid, uv[0], uv[1]) for eid, uv in enumerate(self.edges) if uv is not None)
+
+    def clear(self):
+        self.vertices = []
+        self.edges = []
+        self.edge_weights = []
+        self.vertex_count = 0
+        self.edge_count = 0
+        self._index = None
+        self.spatial.clear()
+        self._touch()
+
+    def set_directed(self, directed):
+        if directed != self.directed:
+            self.directed = directed
+            self._index = None
+            self._touch()
+
+    def add_vertex(self, x, y):
+        v = len(self.vertices)
+        self.vertices.append((x, y))
+        self.vertex_count += 1
+        self.index.add_vertex()
+        self.spatial.insert(v, x, y)
+        self._touch()
+        return v
+
+    def move_vertex(self, v, x, y):
+        # Vị trí không ảnh hưởng tới cấu trúc kề nên không làm mất hiệu lực CSR
+        self.vertices[v] = (x, y)
+        self.spatial.move(v, x, y)
+        self.layout_version += 1
+
+    def set_positions(self, ids, xs, ys):
+        # Đặt lại vị trí hàng loạt (bố cục tự động); ids là mã đỉnh ứng với xs, ys
+        for v, x, y in zip(ids, xs, ys):
+            self.vertices[v] = (x, y)
+        self.spatial.rebuild(self.vertices)
+        self.layout_version += 1
+
+    def find_vertex(self, x, y, radius):
+        return self.spatial.hit(x, y, radius)
+
+    def nearest_vertex(self, x, y, max_dist=float("inf")):
+        return self.spatial.nearest(x, y, max_dist)
+
+    def has_edge(self, u, v):
+        return bool(self.index.ids(u, v))
+
+    def edge_ids(self, u, v):
+        return self.index.ids(u, v)
+
+    def incident_edges(self, v):
+        return self.index.incident[v]
+
+    def add_edge(self, u, v, weight=None, allow_parallel=False):
+        # Trả về mã cạnh mới, hoặc None nếu cạnh đã tồn tại
+        if not allow_parallel and self.has_edge(u, v):
+            return None
+        eid = len(self.edges)
+        self.edges.append((u, v))
+        self.edge_weights.append(weight)
+        self.edge_count += 1
+        self.index.add(eid, u, v)
+        self._touch()
+        return eid
+
+    def remove_edge(self, eid):
+        u, v = self.edges[eid]
+        self.index.remove(eid, u, v)
+        self.edges[eid] = None
+        self.edge_weights[eid] = None
+        self.edge_count -= 1
+        self._touch()
+
+    def edge_weight(self, eid):
+        w = self.edge_weights[eid]
+        return 1 if w is None else w
+
+    def set_edge_weight(self, eid, weight):
+        self.edge_weights[eid] = weight
+        self._touch()
+
+    def weight(self, u, v):
+        ids = self.index.ids(u, v)
+        return self.edge_weight(ids[0]) if ids else 1
+
+    def remove_vertex(self, v):
+        # O(bậc của v); trả về danh sách mã cạnh bị xóa theo
+        removed = list(self.index.incident[v])
+        for eid in removed:
+            self.remove_edge(eid)
+        self.spatial.remove(v)
+        self.vertices[v] = None
+        self.vertex_count -= 1
+        self._touch()
+        return removed
+
+    def needs_compaction(self):
+        return len(self.vertices) - self.vertex_count > max(32, self.vertex_count)
+
+    def compact(self):
+        # Đánh số lại liên tục, bỏ các ô đã xóa; trả về bảng mã cũ -> mã mới (-1 nếu đã xóa)
+        csr = self.csr()
+        remap = list(csr.dense_of)
+        self.vertices = [self.vertices[i] for i in csr.ids]
+        self.edges = [(remap[self.edges[e][0]], remap[self.edges[e][1]]) for e in csr.edge_ids]
+        self.edge_weights = [self.edge_weights[e] for e in csr.edge_ids]
+        self._index = None
+        self.spatial.rebuild(self.vertices)
+        self._touch()
+        return remap
+
+    def csr(self):
+        if self._csr is None or self._csr_version != self.version:
+            self._csr = build_csr(self.vertices, self.edges, self.edge_weights, self.directed)
+            self._csr_version = self.version
+        return self._csr
+
+    # ================== JSON SCHEMA ==================
+    def to_dict(self):
+        # File luôn dùng đánh số liên tục
+        csr = self.csr()
+        dense_of = csr.dense_of
+        weights = {}
+        for k, e in enumerate(csr.edge_ids):
+            if self.edge_weights[e] is not None:
+                weights[f"{csr.eu[k]},{csr.ev[k]}"] = self.edge_weights[e]
+        return {
+            "vertices": [self.vertices[i] for i in csr.ids],
+            "edges": [(dense_of[self.edges[e][0]], dense_of[self.edges[e][1]]) for e in csr.edge_ids],
+            "weights": weights,
+            "is_directed": self.directed,
+            "is_weighted": self.weighted
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        g = cls(data.get("is_directed", False), data.get("is_weighted", False))
+        g.vertices = [tuple(p) for p in data["vertices"]]
+        g.vertex_count = len(g.vertices)
+        g.spatial.rebuild(g.vertices)
+        weights = {tuple(map(int, k.split(','))): v for k, v in data.get("weights", {}).items()}
+        g.edges = [tuple(e) for e in data["edges"]]
+        g.edge_weights = [weights.get(e) for e in g.edges]
+        g.edge_count = len(g.edges)
+        g._index = None
+        return g
+
+    @classmethod
+    def from_arrays(cls, vertices, eu, ev, weights, directed=False, weighted=False):
+        # Dựng từ các mảng đã có sẵn (file nhị phân, nhập danh sách cạnh);
+        # weights[i] là None nếu cạnh i chưa đặt trọng số
+        g = cls(directed, weighted)
+        g.vertices = vertices
+        g.vertex_count = len(vertices)
+        g.spatial.rebuild(vertices)
+        g.edges = list(zip(eu, ev))
+        g.edge_weights = weights
+        g.edge_count = len(g.edges)
+        g._index = None
+        return g
+
+
+def fmt_num(x):
+    # Trọng số lưu dạng số thực trong CSR; hiển thị số nguyên cho gọn
+    if isinstance(x, float) and x.is_integer():
+        return str(int(x))
+    return str(x)
+
+
+def np_view(arr):
+    # Xem array.array như mảng numpy mà không sao chép (cần numpy)
+    if len(arr) == 0:
+        return np.zeros(0, dtype=arr.typecode)
+    return np.frombuffer(arr, dtype=arr.typecode)
@@ -0,0 +1,136 @@
+import json
+import os
+import struct
+import sys
+from array import array
+
+from graph_core import Graph
+
+# ================== BINARY GRAPH FORMAT (.grb) ==================
+# Tiêu đề 24 byte (little-endian): magic, phiên bản, cờ, số đỉnh n, số cạnh m
+# rồi các mảng liền nhau (đánh số đỉnh liên tục như file JSON):
+#   x[n], y[n]                 float64 tọa độ
+#   u[m], v[m]                 int64 đầu/cuối cạnh
+#   w[m]                       float64 trọng số
+#   coord_kind[n]              1 byte: bit 0 = x nguyên, bit 1 = y nguyên
+#   weight_kind[m]             1 byte: 0 = chưa đặt, 1 = số nguyên, 2 = số thực
+# Hai mảng kiểu cuối giúp đổi qua lại với JSON mà không mất thông tin.
+EXTENSION = ".grb"
+MAGIC = b"GRPB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQQ")
+FLAG_DIRECTED = 1
+FLAG_WEIGHTED = 2
+
+NO_WEIGHT, INT_WEIGHT, FLOAT_WEIGHT = 0, 1, 2
+
+
+def _number_kind(x):
+    return INT_WEIGHT if isinstance(x, int) else FLOAT_WEIGHT
+
+
+def _write_array(f, arr):
+    if sys.byteorder != "little":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    arr.tofile(f)
+
+
+def save_binary(graph, path):
+    csr = graph.csr()
+    points = [graph.vertices[i] for i in csr.ids]
+    weights = [graph.edge_weights[e] for e in csr.edge_ids]
+    flags = (FLAG_DIRECTED if graph.directed else 0) | (FLAG_WEIGHTED if graph.weighted else 0)
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, len(points), len(weights)))
+        _write_array(f, array('d', (p[0] for p in points)))
+        _write_array(f, array('d', (p[1] for p in points)))
+        _write_array(f, array('q', csr.eu))
+        _write_array(f, array('q', csr.ev))
+        _write_array(f, array('d', (0.0 if w is None else w for w in weights)))
+        f.write(bytes(isinstance(x, int) | isinstance(y, int) << 1 for x, y in points))
+        f.write(bytes(NO_WEIGHT if w is None else _number_kind(w) for w in weights))
+
+
+def _read_array(f, count, typecode):
+    # Đọc thẳng vào mảng kiểu cố định (không tạo đối tượng Python cho từng phần tử);
+    # chỉ phải đảo byte khi máy dùng big-endian
+    arr = array(typecode)
+    arr.fromfile(f, count)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr
+
+
+def load_binary(path):
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError("File đồ thị nhị phân không hợp lệ!")
+        magic, version, flags, n, m = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("File đồ thị nhị phân không hợp lệ!")
+        if os.fstat(f.fileno()).st_size < HEADER.size + 16 * n + 24 * m + n + m:
+            raise ValueError("File đồ thị nhị phân bị cắt cụt!")
+
+        xs = _read_array(f, n, 'd')
+        ys = _read_array(f, n, 'd')
+        eu = _read_array(f, m, 'q')
+        ev = _read_array(f, m, 'q')
+        ew = _read_array(f, m, 'd')
+        coord_kind = f.read(n)
+        weight_kind = f.read(m)
+
+    # Trường hợp thường gặp (toàn số nguyên / toàn chưa đặt) đi đường nhanh
+    if coord_kind.count(3) == n:
+        vertices = list(zip(map(int, xs), map(int, ys)))
+    else:
+        vertices = [(int(x) if k & 1 else x, int(y) if k & 2 else y)
+                    for x, y, k in zip(xs, ys, coord_kind)]
+    if weight_kind.count(NO_WEIGHT) == m:
+        weights = [None] * m
+    elif weight_kind.count(INT_WEIGHT) == m:
+        weights = list(map(int, ew))
+    else:
+        weights = [None if k == NO_WEIGHT else int(w) if k == INT_WEIGHT else w
+                   for w, k in zip(ew, weight_kind)]
+    return Graph.from_arrays(vertices, eu, ev, weights,
+                             bool(flags & FLAG_DIRECTED), bool(flags & FLAG_WEIGHTED))
+
+
+def load_graph_file(path):
+    # Chọn định dạng theo phần mở rộng
+    if path.lower().endswith(EXTENSION):
+        return load_binary(path)
+    with open(path, "r", encoding='utf-8') as f:
+        return Graph.from_dict(json.load(f))
+
+
+def save_graph_file(graph, path):
+    if path.lower().endswith(EXTENSION):
+        save_binary(graph, path)
+        return
+    with open(path, "w", encoding='utf-8') as f:
+        json.dump(graph.to_dict(), f, indent=2, ensure_ascii=False)
+
+
+# ================== CHUYỂN ĐỔI JSON <-> NHỊ PHÂN ==================
+def json_to_binary(src, dst):
+    with open(src, "r", encoding='utf-8') as f:
+        save_binary(Graph.from_dict(json.load(f)), dst)
+
+
+def binary_to_json(src, dst):
+    with open(dst, "w", encoding='utf-8') as f:
+        json.dump(load_binary(src).to_dict(), f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    # python graph_file.py vao.json ra.grb  (hoặc ngược lại)
+    if len(sys.argv) != 3:
+        sys.exit("Cách dùng: python graph_file.py <nguồn> <đích>")
+    if sys.argv[1].lower().endswith(EXTENSION):
+        binary_to_json(sys.argv[1], sys.argv[2])
+    else:
+        json_to_binary(sys.argv[1], sys.argv[2])
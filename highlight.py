@@ -0,0 +1,65 @@
+# ================== HIGHLIGHT STATE ==================
+# Vai trò tô màu hiện tại của từng đỉnh/cạnh (theo mã ổn định), tách khỏi canvas.
+# Các thao tác tô chỉ ghi vào bảng chờ; flush() so với trạng thái đang hiển thị và
+# chỉ trả về những phần tử thực sự đổi, nên giữa hai khung hình (hoặc khi tua qua
+# nhiều bước) mỗi item trên canvas được cập nhật nhiều nhất một lần.
+# Vai trò 'default' không được lưu: phần tử vắng mặt trong bảng là màu mặc định.
+DEFAULT = 'default'
+
+
+class HighlightState:
+    def __init__(self):
+        self.vertices = {}
+        self.edges = {}
+        self._pending_v = {}
+        self._pending_e = {}
+
+    def vertex(self, v):
+        return self.vertices.get(v, DEFAULT)
+
+    def edge(self, eid):
+        # (vai trò, độ dày); độ dày None nghĩa là độ dày mặc định khi vẽ
+        return self.edges.get(eid, (DEFAULT, None))
+
+    def set_vertex(self, v, role):
+        self._pending_v[v] = role
+
+    def set_edge(self, eid, role, width=None):
+        self._pending_e[eid] = (DEFAULT, None) if role == DEFAULT else (role, width)
+
+    def clear(self):
+        self.vertices = {}
+        self.edges = {}
+        self._pending_v = {}
+        self._pending_e = {}
+
+    def discard(self, v, eids=()):
+        # Bỏ trạng thái của đỉnh/cạnh đã bị xóa khỏi đồ thị
+        for table in (self.vertices, self._pending_v):
+            table.pop(v, None)
+        for eid in eids:
+            for table in (self.edges, self._pending_e):
+                table.pop(eid, None)
+
+    def flush(self):
+        # Áp bảng chờ vào trạng thái hiển thị; trả về ([(đỉnh, vai trò)], [(cạnh, vai trò, độ dày)])
+        # chỉ gồm các phần tử có trạng thái khác trước
+        changed_v = []
+        for v, role in self._pending_v.items():
+            if self.vertices.get(v, DEFAULT) != role:
+                if role == DEFAULT:
+                    del self.vertices[v]
+                else:
+                    self.vertices[v] = role
+                changed_v.append((v, role))
+        changed_e = []
+        for eid, state in self._pending_e.items():
+            if self.edges.get(eid, (DEFAULT, None)) != state:
+                if state[0] == DEFAULT:
+                    del self.edges[eid]
+                else:
+                    self.edges[eid] = state
+                changed_e.append((eid,) + state)
+        self._pending_v = {}
+        self._pending_e = {}
+        return changed_v, changed_e
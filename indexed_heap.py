@@ -0,0 +1,74 @@
+from array import array
+
+# ================== INDEXED D-ARY HEAP ==================
+class IndexedHeap:
+    # Hàng đợi ưu tiên nhỏ nhất trên các phần tử 0..n-1, mỗi phần tử xuất hiện
+    # tối đa một lần; pos[v] là vị trí của v trong heap (-1 nếu không có) nên
+    # giảm khóa chỉ cần vun lên từ vị trí đó
+    def __init__(self, n, d=4):
+        self.d = d
+        self.heap = []
+        self.key = [0] * n
+        self.pos = array('l', [-1]) * n
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, v):
+        return self.pos[v] != -1
+
+    def push(self, v, key):
+        # Thêm v hoặc giảm khóa nếu key nhỏ hơn khóa hiện tại; trả về True nếu có thay đổi
+        i = self.pos[v]
+        if i == -1:
+            self.heap.append(v)
+            i = len(self.heap) - 1
+        elif key >= self.key[v]:
+            return False
+        self.key[v] = key
+        self._sift_up(i, v)
+        return True
+
+    def pop(self):
+        heap, pos = self.heap, self.pos
+        top = heap[0]
+        last = heap.pop()
+        pos[top] = -1
+        if heap:
+            self._sift_down(0, last)
+        return self.key[top], top
+
+    def _sift_up(self, i, v):
+        heap, pos, key, d = self.heap, self.pos, self.key, self.d
+        k = key[v]
+        while i > 0:
+            p = (i - 1) // d
+            u = heap[p]
+            if key[u] <= k:
+                break
+            heap[i] = u
+            pos[u] = i
+            i = p
+        heap[i] = v
+        pos[v] = i
+
+    def _sift_down(self, i, v):
+        heap, pos, key, d = self.heap, self.pos, self.key, self.d
+        n = len(heap)
+        k = key[v]
+        while True:
+            first = d * i + 1
+            if first >= n:
+                break
+            best = first
+            for c in range(first + 1, min(first + d, n)):
+                if key[heap[c]] < key[heap[best]]:
+                    best = c
+            u = heap[best]
+            if key[u] >= k:
+                break
+            heap[i] = u
+            pos[u] = i
+            i = best
+        heap[i] = v
+        pos[v] = i
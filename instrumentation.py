@@ -0,0 +1,106 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# ================== INSTRUMENTATION ==================
+# Đo hiệu năng một lần chạy thuật toán (chỉ bật khi người dùng chọn):
+#   - thời gian theo pha: tiền xử lý (dựng CSR, bảng mọi cặp...), tính toán, vẽ
+#     (tổng thời gian cập nhật canvas qua mọi khung hình của hoạt ảnh)
+#   - bộ đếm do thuật toán ghi vào dict stats (cùng cách truyền như steps)
+#   - bộ nhớ cấp phát đỉnh (tracemalloc) trong pha tiền xử lý và tính toán
+# tracemalloc làm chậm mọi lần cấp phát (thuật toán Python thuần chậm đi vài lần)
+# nên chỉ bật khi tạo Profile với memory=True; khi đó thời gian đo được không còn
+# so sánh được với lần chạy không đo bộ nhớ.
+PHASES = {
+    "preprocessing": "Tiền xử lý",
+    "compute": "Tính toán",
+    "render": "Vẽ",
+}
+
+COUNTERS = {
+    "vertices_settled": "Số đỉnh đã chốt",
+    "edges_relaxed": "Số cạnh đã xét",
+    "heap_pushes": "Số lần đẩy vào heap",
+    "heap_pops": "Số lần lấy khỏi heap",
+    "levels": "Số tầng BFS",
+    "dsu_finds": "Số lần tìm gốc (DSU)",
+    "augmenting_paths": "Số đường tăng luồng",
+    "bfs_phases": "Số pha BFS",
+    "pushes": "Số lần đẩy luồng",
+    "relabels": "Số lần nâng nhãn",
+    "canvas_updates": "Số item canvas cập nhật",
+}
+
+
+def fmt_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class Profile:
+    def __init__(self, algorithm, n=0, m=0, memory=False):
+        self.algorithm = algorithm
+        self.n = n
+        self.m = m
+        self.memory = memory
+        self.phases = {}
+        self.calls = {}
+        self.counters = {}
+        self.peak_memory = None
+
+    @contextmanager
+    def phase(self, name, memory=True):
+        # Cộng dồn thời gian của pha (một pha có thể được gọi nhiều lần, ví dụ mỗi khung hình)
+        memory = memory and self.memory
+        owns = memory and not tracemalloc.is_tracing()
+        if owns:
+            tracemalloc.start()
+        if memory:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        began = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - began
+            self.calls[name] = self.calls.get(name, 0) + 1
+            if memory:
+                peak = tracemalloc.get_traced_memory()[1] - base
+                self.peak_memory = max(self.peak_memory or 0, peak)
+            if owns:
+                tracemalloc.stop()
+
+    def count(self, name, k=1):
+        self.counters[name] = self.counters.get(name, 0) + k
+
+    def to_dict(self):
+        return {
+            "algorithm": self.algorithm,
+            "n": self.n,
+            "m": self.m,
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "phase_calls": dict(self.calls),
+            "counters": dict(self.counters),
+            "peak_memory_bytes": self.peak_memory,
+        }
+
+    def save(self, path):
+        with open(path, "w", encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def summary(self):
+        lines = [f"--- Đo hiệu năng ({self.n} đỉnh, {self.m} cạnh) ---"]
+        for name, seconds in self.phases.items():
+            line = f"{PHASES.get(name, name)}: {seconds * 1000:.2f} ms"
+            if self.calls[name] > 1:
+                line += f" ({self.calls[name]} lần)"
+            lines.append(line)
+        if self.peak_memory is not None:
+            lines.append(f"Bộ nhớ đỉnh: {fmt_bytes(self.peak_memory)} (thời gian bị chậm đi do đo bộ nhớ)")
+        for name, value in self.counters.items():
+            lines.append(f"{COUNTERS.get(name, name)}: {value}")
+        return "\n".join(lines)
@@ -0,0 +1,341 @@
+import math
+import random
+import threading
+
+from graph_core import np_view
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ================== FORCE-DIRECTED LAYOUT ==================
+# Mô hình lò xo - điện (Fruchterman–Reingold): mọi cặp đỉnh đẩy nhau với lực
+# C·k² / d (C = REPULSION), hai đầu mỗi cạnh hút nhau với lực d² / k (k là độ dài
+# cạnh mong muốn), thêm lực kéo nhẹ về tâm để các thành phần rời nhau không trôi
+# ra xa mãi.
+# Lực đẩy tính bằng Barnes–Hut: cây tứ phân dựng từ mã Morton đã sắp, mỗi nút
+# giữ số đỉnh và trọng tâm; nút ở đủ xa (cạnh ô < THETA · khoảng cách) được coi
+# như một đỉnh đặt tại trọng tâm. Cây được duyệt cho mọi đỉnh cùng lúc bằng mảng
+# các cặp (đỉnh, nút) nên mỗi vòng lặp chỉ gồm vài phép toán vector, chi phí
+# O(n log n) thay vì O(n²).
+# Đa mức (Yifan Hu): đồ thị được thu gọn nhiều lần (mỗi đỉnh gộp vào một đỉnh
+# của tập độc lập cực đại kề nó), bố cục đồ thị nhỏ nhất trước rồi trải dần ra
+# các mức lớn hơn; mỗi mức sau chỉ tinh chỉnh tối đa REFINE_ITERATIONS vòng.
+# Bước dịch chuyển tự điều chỉnh theo năng lượng: năng lượng giảm liên tiếp thì
+# bước tăng, tăng thì bước giảm; một mức dừng khi bước nhỏ hơn TOLERANCE · k.
+# Không có numpy thì tính lực đẩy trực tiếp mọi cặp (chỉ hợp với đồ thị nhỏ).
+EDGE_LENGTH = 60
+THETA = 1.5
+REPULSION = 0.2
+GRAVITY = 0.05
+TOLERANCE = 0.01
+MAX_ITERATIONS = 300
+REFINE_ITERATIONS = 30
+STEP_RATIO = 0.9
+REFINE_STEP = 0.2
+COARSEST = 100
+MIN_SHRINK = 0.8
+DEPTH = 16
+
+
+def _morton(cx, cy):
+    # Xen kẽ bit của hai tọa độ ô (mỗi tọa độ tối đa 16 bit)
+    def spread(v):
+        v = (v | (v << 8)) & 0x00FF00FF
+        v = (v | (v << 4)) & 0x0F0F0F0F
+        v = (v | (v << 2)) & 0x33333333
+        v = (v | (v << 1)) & 0x55555555
+        return v
+    return spread(cx) | (spread(cy) << 1)
+
+
+class QuadTree:
+    # Các nút được đánh số theo tầng; con của nút i là dải [lo[i], lo[i] + count[i])
+    # ở tầng sau (các đỉnh đã sắp theo mã Morton nên con của một nút nằm liền nhau).
+    # Đỉnh cũng được xử lý theo thứ tự Morton để các lần truy cập mảng gần nhau.
+    def __init__(self, pos, theta=THETA):
+        low = pos.min(axis=0)
+        span = float((pos.max(axis=0) - low).max()) or 1.0
+        cells = ((pos - low) * (((1 << DEPTH) - 1) / span)).astype(np.int64)
+        code = _morton(cells[:, 0], cells[:, 1])
+        self.order = np.argsort(code, kind='stable')
+        code = code[self.order]
+        self.x = pos[self.order, 0]
+        self.y = pos[self.order, 1]
+        n = len(pos)
+
+        # Dừng chia khi mọi ô chỉ còn một đỉnh (hoặc tới độ sâu DEPTH)
+        starts, mass, cx, cy, size = [], [], [], [], []
+        for level in range(DEPTH + 1):
+            prefix = code >> (2 * (DEPTH - level))
+            first = np.concatenate(([0], np.flatnonzero(np.diff(prefix)) + 1))
+            count = np.diff(np.append(first, n))
+            starts.append(first)
+            mass.append(count)
+            cx.append(np.add.reduceat(self.x, first) / count)
+            cy.append(np.add.reduceat(self.y, first) / count)
+            size.append(np.full(len(first), span / (1 << level)))
+            if len(first) == n:
+                break
+        depth = len(starts) - 1
+        base = np.cumsum([0] + [len(s) for s in starts])
+        lo = [base[level + 1] + np.searchsorted(starts[level + 1], starts[level])
+              for level in range(depth)]
+        hi = [np.append(c[1:], base[level + 2]) for level, c in enumerate(lo)]
+        leaves = np.zeros(len(starts[depth]), dtype=np.int64)
+        self.lo = np.concatenate(lo + [leaves])
+        self.count = np.concatenate(hi + [leaves]) - self.lo
+        self.mass = np.concatenate(mass)
+        self.cx = np.concatenate(cx)
+        self.cy = np.concatenate(cy)
+        # Nút được nhận khi limit < d²; nút một đỉnh hoặc lá luôn được nhận
+        self.limit = (np.concatenate(size) / theta) ** 2
+        self.limit[(self.mass == 1) | (self.count == 0)] = -1.0
+
+    def repulsion(self, k2):
+        # Tổng lực đẩy k2 / d lên từng đỉnh (theo thứ tự ban đầu)
+        n = len(self.x)
+        fx, fy = np.zeros(n), np.zeros(n)
+        weight = k2 * self.mass
+        pts = np.arange(n)
+        nodes = np.zeros(n, dtype=np.int64)
+        while pts.size:
+            dx = self.x.take(pts) - self.cx.take(nodes)
+            dy = self.y.take(pts) - self.cy.take(nodes)
+            d2 = dx * dx + dy * dy
+            accept = self.limit.take(nodes) < d2
+            near = np.flatnonzero(~accept)
+            accept = np.flatnonzero(accept)
+            hit = pts.take(accept)
+            # Cặp (đỉnh, chính nó) có dx = dy = 0 nên không góp lực
+            scale = weight.take(nodes.take(accept)) / np.maximum(d2.take(accept), 1e-12)
+            fx += np.bincount(hit, weights=dx.take(accept) * scale, minlength=n)
+            fy += np.bincount(hit, weights=dy.take(accept) * scale, minlength=n)
+
+            # Nút ở quá gần: thay bằng các nút con
+            pts, nodes = pts.take(near), nodes.take(near)
+            count = self.count.take(nodes)
+            first = np.repeat(self.lo.take(nodes) - (np.cumsum(count) - count), count)
+            nodes = np.arange(len(first)) + first
+            pts = np.repeat(pts, count)
+        force = np.empty((n, 2))
+        force[self.order, 0] = fx
+        force[self.order, 1] = fy
+        return force
+
+
+def _coarsen(n, eu, ev, rng):
+    # Chọn tập độc lập cực đại (Luby: đỉnh có ưu tiên nhỏ nhất trong các láng giềng
+    # chưa quyết định), mỗi đỉnh còn lại gộp vào láng giềng được chọn có ưu tiên nhỏ
+    # nhất. Trả về (đỉnh cha ở mức thô, số đỉnh thô, cạnh thô)
+    src, dst = np.concatenate((eu, ev)), np.concatenate((ev, eu))
+    order = np.argsort(src, kind='stable')
+    src, dst = src[order], dst[order]
+    has = np.bincount(src, minlength=n) > 0
+    starts = np.searchsorted(src, np.arange(n))[has]
+    priority = rng.random(n)
+
+    def neighbor_min(values):
+        best = np.full(n, np.inf)
+        if src.size:
+            best[has] = np.minimum.reduceat(values, starts)
+        return best
+
+    chosen = np.zeros(n, dtype=bool)
+    undecided = np.ones(n, dtype=bool)
+    while undecided.any():
+        pick = undecided & (priority < neighbor_min(np.where(undecided[dst], priority[dst], np.inf)))
+        chosen |= pick
+        undecided &= ~pick
+        undecided[dst[pick[src]]] = False
+    owner_priority = np.where(chosen[dst], priority[dst], np.inf)
+    best = neighbor_min(owner_priority)
+    owner = np.arange(n)
+    joins = (owner_priority == best[src]) & ~chosen[src] & chosen[dst]
+    owner[src[joins]] = dst[joins]
+    # Đỉnh được chọn mà không ai gộp vào thì tự gộp vào cụm của một láng giềng
+    alone = has & (np.bincount(owner, minlength=n) == 1)
+    owner[alone] = owner[dst[starts[alone[has]]]]
+    _, parent = np.unique(owner, return_inverse=True)
+    nc = int(parent.max()) + 1
+
+    cu, cv = parent[eu], parent[ev]
+    keep = cu != cv
+    code = np.unique(np.minimum(cu[keep], cv[keep]) * nc + np.maximum(cu[keep], cv[keep]))
+    return parent, nc, code // nc, code % nc
+
+
+def _forces(pos, eu, ev, k, theta):
+    n = len(pos)
+    force = QuadTree(pos, theta).repulsion(REPULSION * k * k) if n > 1 else np.zeros((n, 2))
+    delta = pos[eu] - pos[ev]
+    pull = delta * (np.sqrt(np.einsum('ij,ij->i', delta, delta)) / k)[:, None]
+    for axis in (0, 1):
+        force[:, axis] += np.bincount(ev, weights=pull[:, axis], minlength=n)
+        force[:, axis] -= np.bincount(eu, weights=pull[:, axis], minlength=n)
+    force -= GRAVITY * (pos - pos.mean(axis=0))
+    return force
+
+
+def _adapt(energy, new_energy, step, progress):
+    # Điều chỉnh bước theo năng lượng (Yifan Hu)
+    if new_energy < energy:
+        progress += 1
+        if progress >= 5:
+            progress = 0
+            step /= STEP_RATIO
+    else:
+        progress = 0
+        step *= STEP_RATIO
+    return new_energy, step, progress
+
+
+def _refine(pos, eu, ev, k, step, max_iterations, theta):
+    energy = math.inf
+    progress = 0
+    for _ in range(max_iterations):
+        force = _forces(pos, eu, ev, k, theta)
+        norm = np.sqrt(np.einsum('ij,ij->i', force, force))
+        moving = norm > 0
+        pos[moving] += force[moving] * (step / norm[moving])[:, None]
+        energy, step, progress = _adapt(energy, float(np.dot(norm, norm)), step, progress)
+        yield pos
+        if step < TOLERANCE * k:
+            return
+
+
+def _initial_positions(xs, ys, k, seed):
+    # Giữ bố cục hiện có (co giãn về diện tích ~ n·k²), thêm nhiễu nhỏ để tách các đỉnh trùng nhau
+    rng = random.Random(seed)
+    n = len(xs)
+    side = k * math.sqrt(max(n, 1))
+    x0, y0 = min(xs, default=0), min(ys, default=0)
+    span = max(max(xs, default=0) - x0, max(ys, default=0) - y0) or 1.0
+    return ([(x - x0) / span * side + rng.uniform(-0.01, 0.01) * k for x in xs],
+            [(y - y0) / span * side + rng.uniform(-0.01, 0.01) * k for y in ys])
+
+
+def force_layout(csr, xs, ys, k=EDGE_LENGTH, max_iterations=MAX_ITERATIONS, theta=THETA, seed=0):
+    # Generator: sau mỗi vòng lặp trả về (vòng lặp, xs, ys) theo chỉ số CSR.
+    # Trong lúc còn ở mức thô, mỗi đỉnh được đặt tại vị trí đỉnh thô chứa nó
+    xs, ys = _initial_positions(xs, ys, k, seed)
+    if np is None:
+        yield from _force_layout_python(csr, xs, ys, k, max_iterations)
+        return
+    rng = np.random.default_rng(seed)
+    eu, ev = np_view(csr.eu).astype(np.int64), np_view(csr.ev).astype(np.int64)
+    loops = eu != ev
+    levels = [(csr.n, eu[loops], ev[loops])]
+    parents = []
+    while levels[-1][0] > COARSEST:
+        parent, nc, cu, cv = _coarsen(*levels[-1], rng)
+        if nc > MIN_SHRINK * levels[-1][0]:
+            break
+        parents.append(parent)
+        levels.append((nc, cu, cv))
+    # maps[i]: đỉnh gốc -> đỉnh ở mức i
+    maps = [np.arange(csr.n)]
+    for parent in parents:
+        maps.append(parent[maps[-1]])
+
+    # Vị trí ban đầu của đỉnh thô là trọng tâm các đỉnh nó gộp (giữ hình dạng bố cục cũ)
+    pos = np.column_stack((xs, ys))
+    n = levels[-1][0]
+    if n < csr.n:
+        counts = np.bincount(maps[-1], minlength=n)
+        pos = np.column_stack([np.bincount(maps[-1], weights=pos[:, axis], minlength=n) / counts
+                               for axis in (0, 1)])
+        pos *= math.sqrt(n / csr.n)
+    iteration = 0
+    for level in range(len(levels) - 1, -1, -1):
+        n, eu, ev = levels[level]
+        if level == len(levels) - 1:
+            step, limit = k, max_iterations
+        else:
+            step, limit = REFINE_STEP * k, min(max_iterations, REFINE_ITERATIONS)
+        for pos in _refine(pos, eu, ev, k, step, limit, theta):
+            iteration += 1
+            where = maps[level]
+            yield iteration, pos[where, 0].tolist(), pos[where, 1].tolist()
+        if level:
+            # Trải ra mức lớn hơn: đỉnh con đặt quanh đỉnh cha, giãn để giữ mật độ
+            parent = parents[level - 1]
+            fine = levels[level - 1][0]
+            pos = pos[parent] * math.sqrt(fine / n) + rng.uniform(-0.1, 0.1, (fine, 2)) * k
+
+
+def _force_layout_python(csr, xs, ys, k, max_iterations):
+    n = csr.n
+    k2 = REPULSION * k * k
+    edges = [(u, v) for u, v in zip(csr.eu, csr.ev) if u != v]
+    step = k
+    energy = math.inf
+    progress = 0
+    for iteration in range(1, max_iterations + 1):
+        fx, fy = [0.0] * n, [0.0] * n
+        for i in range(n):
+            for j in range(i + 1, n):
+                dx, dy = xs[i] - xs[j], ys[i] - ys[j]
+                d2 = dx * dx + dy * dy
+                if d2 > 0:
+                    f = k2 / d2
+                    fx[i] += dx * f
+                    fy[i] += dy * f
+                    fx[j] -= dx * f
+                    fy[j] -= dy * f
+        for u, v in edges:
+            dx, dy = xs[u] - xs[v], ys[u] - ys[v]
+            f = math.hypot(dx, dy) / k
+            fx[u] -= dx * f
+            fy[u] -= dy * f
+            fx[v] += dx * f
+            fy[v] += dy * f
+        cx, cy = sum(xs) / n, sum(ys) / n
+        new_energy = 0.0
+        for i in range(n):
+            fx[i] -= GRAVITY * (xs[i] - cx)
+            fy[i] -= GRAVITY * (ys[i] - cy)
+            norm = math.hypot(fx[i], fy[i])
+            new_energy += norm * norm
+            if norm > 0:
+                xs[i] += fx[i] * step / norm
+                ys[i] += fy[i] * step / norm
+        energy, step, progress = _adapt(energy, new_energy, step, progress)
+        yield iteration, list(xs), list(ys)
+        if step < TOLERANCE * k:
+            return
+
+
+# ================== BACKGROUND WORKER ==================
+class LayoutWorker:
+    # Chạy force_layout trong luồng nền; giao diện đọc latest() theo nhịp của mình.
+    # Luồng nền chỉ làm việc trên bản sao tọa độ, không chạm tới Tkinter hay Graph
+    def __init__(self, csr, xs, ys, **options):
+        self.csr = csr
+        self.iteration = 0
+        self.done = False
+        self._latest = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(xs, ys, options), daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def latest(self):
+        # (vòng lặp, xs, ys) mới nhất chưa được đọc, hoặc None
+        latest, self._latest = self._latest, None
+        return latest
+
+    def _run(self, xs, ys, options):
+        try:
+            for latest in force_layout(self.csr, xs, ys, **options):
+                if self._stop.is_set():
+                    return
+                self.iteration = latest[0]
+                self._latest = latest
+        finally:
+            self.done = True
@@ -0,0 +1,439 @@
+import multiprocessing
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+EPS = 1e-9
+INF = float("inf")
+
+METHODS = {
+    "Dinic": "dinic",
+    "Đẩy - nâng nhãn (FIFO)": "push_relabel",
+    "Edmonds-Karp": "edmonds_karp",
+}
+
+
+# ================== RESIDUAL GRAPH ==================
+class ResidualGraph:
+    # Cạnh e (u -> v, sức chứa c) sinh hai cung: 2e (u -> v) và 2e+1 (v -> u).
+    # Cung ngược có sức chứa 0 với đồ thị có hướng, c với đồ thị vô hướng.
+    # Cung của mỗi đỉnh lưu liên tục: arcs[start[u]:start[u+1]]
+    def __init__(self, csr):
+        n, m = csr.n, csr.m
+        self.n = n
+        self.csr = csr
+        self.to = array('l', [0]) * (2 * m)
+        self.cap = [0.0] * (2 * m)
+        counts = [0] * (n + 1)
+        for e in range(m):
+            u, v, c = csr.eu[e], csr.ev[e], csr.ew[e]
+            self.to[2 * e] = v
+            self.to[2 * e + 1] = u
+            self.cap[2 * e] = c
+            self.cap[2 * e + 1] = 0.0 if csr.directed else c
+            counts[u + 1] += 1
+            counts[v + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        self.start = counts
+        self.arcs = array('l', [0]) * (2 * m)
+        pos = counts[:n]
+        for e in range(m):
+            u, v = csr.eu[e], csr.ev[e]
+            self.arcs[pos[u]] = 2 * e
+            pos[u] += 1
+            self.arcs[pos[v]] = 2 * e + 1
+            pos[v] += 1
+
+    def push(self, a, f):
+        self.cap[a] -= f
+        self.cap[a ^ 1] += f
+
+    def edge_flows(self):
+        # Luồng trên từng cạnh (theo chỉ số cạnh của CSR); âm nghĩa là chảy v -> u
+        csr = self.csr
+        return [csr.ew[e] - self.cap[2 * e] for e in range(csr.m)]
+
+    def source_side(self, s):
+        # Các đỉnh còn tới được từ s trong đồ thị thặng dư = phía s của lát cắt hẹp nhất
+        seen = [False] * self.n
+        seen[s] = True
+        q = deque([s])
+        while q:
+            u = q.popleft()
+            for i in range(self.start[u], self.start[u + 1]):
+                a = self.arcs[i]
+                v = self.to[a]
+                if not seen[v] and self.cap[a] > EPS:
+                    seen[v] = True
+                    q.append(v)
+        return seen
+
+
+def _path_step(res, s, path_arcs):
+    path = [s] + [res.to[a] for a in path_arcs]
+    step = [('v', x, 'current') for x in path]
+    step += [('e', path[i-1], path[i], 'path', 4) for i in range(1, len(path))]
+    return step
+
+
+# ================== EDMONDS-KARP ==================
+def edmonds_karp(res, s, t, steps=None, stats=None):
+    n, to, cap, arcs, start = res.n, res.to, res.cap, res.arcs, res.start
+    flow = 0
+    paths = 0
+    while True:
+        parent_arc = [-1] * n
+        parent_arc[s] = -2
+        q = deque([s])
+        while q and parent_arc[t] == -1:
+            u = q.popleft()
+            for i in range(start[u], start[u + 1]):
+                a = arcs[i]
+                v = to[a]
+                if parent_arc[v] == -1 and cap[a] > EPS:
+                    parent_arc[v] = a
+                    q.append(v)
+        if parent_arc[t] == -1:
+            if stats is not None:
+                stats.update(augmenting_paths=paths, bfs_phases=paths + 1)
+            return flow
+
+        path_arcs = []
+        v = t
+        while v != s:
+            a = parent_arc[v]
+            path_arcs.append(a)
+            v = to[a ^ 1]
+        path_arcs.reverse()
+        f = min(cap[a] for a in path_arcs)
+        for a in path_arcs:
+            res.push(a, f)
+        flow += f
+        paths += 1
+        if steps is not None:
+            steps.append(_path_step(res, s, path_arcs))
+
+
+# ================== DINIC ==================
+def dinic(res, s, t, steps=None, stats=None):
+    n, to, cap, arcs, start = res.n, res.to, res.cap, res.arcs, res.start
+    flow = 0
+    paths = 0
+    phases = 0
+    while True:
+        phases += 1
+        level = [-1] * n
+        level[s] = 0
+        q = deque([s])
+        while q:
+            u = q.popleft()
+            for i in range(start[u], start[u + 1]):
+                a = arcs[i]
+                v = to[a]
+                if level[v] < 0 and cap[a] > EPS:
+                    level[v] = level[u] + 1
+                    q.append(v)
+        if level[t] < 0:
+            if stats is not None:
+                stats.update(augmenting_paths=paths, bfs_phases=phases)
+            return flow
+
+        # Luồng chặn: DFS bằng ngăn xếp tường minh với con trỏ cung hiện tại
+        it = start[:n]
+        path_arcs = []
+        u = s
+        while True:
+            if u == t:
+                f = min(cap[a] for a in path_arcs)
+                for a in path_arcs:
+                    res.push(a, f)
+                flow += f
+                paths += 1
+                if steps is not None:
+                    steps.append(_path_step(res, s, path_arcs))
+                # Quay lui về đỉnh ngay trước cung đầu tiên bị bão hòa
+                k = next(k for k, a in enumerate(path_arcs) if cap[a] <= EPS)
+                u = to[path_arcs[k] ^ 1]
+                del path_arcs[k:]
+                continue
+
+            end = start[u + 1]
+            i = it[u]
+            while i < end:
+                a = arcs[i]
+                v = to[a]
+                if cap[a] > EPS and level[v] == level[u] + 1:
+                    break
+                i += 1
+            it[u] = i
+            if i < end:
+                path_arcs.append(arcs[i])
+                u = to[arcs[i]]
+            else:
+                level[u] = -1
+                if not path_arcs:
+                    break
+                a = path_arcs.pop()
+                u = to[a ^ 1]
+                it[u] += 1
+
+
+# ================== PUSH-RELABEL (FIFO) ==================
+def push_relabel(res, s, t, steps=None, stats=None):
+    n, to, cap, arcs, start = res.n, res.to, res.cap, res.arcs, res.start
+    excess = [0.0] * n
+    pushes = 0
+    relabels = 0
+
+    # Nhãn ban đầu = khoảng cách tới t trong đồ thị thặng dư (global relabel)
+    height = [2 * n] * n
+    height[t] = 0
+    q = deque([t])
+    while q:
+        v = q.popleft()
+        for i in range(start[v], start[v + 1]):
+            a = arcs[i]
+            u = to[a]
+            if height[u] == 2 * n and cap[a ^ 1] > EPS:
+                height[u] = height[v] + 1
+                q.append(u)
+    height[s] = n
+    count = [0] * (2 * n + 1)
+    for h in height:
+        count[h] += 1
+
+    active = deque()
+    in_queue = [False] * n
+    for i in range(start[s], start[s + 1]):
+        a = arcs[i]
+        f = cap[a]
+        if f > EPS:
+            v = to[a]
+            res.push(a, f)
+            excess[v] += f
+            excess[s] -= f
+            if v != t and not in_queue[v]:
+                in_queue[v] = True
+                active.append(v)
+
+    it = start[:n]
+    while active:
+        u = active.popleft()
+        in_queue[u] = False
+        end = start[u + 1]
+        while excess[u] > EPS:
+            if it[u] == end:
+                # Nâng nhãn
+                old = height[u]
+                new = 2 * n
+                for i in range(start[u], end):
+                    a = arcs[i]
+                    if cap[a] > EPS:
+                        new = min(new, height[to[a]] + 1)
+                count[old] -= 1
+                height[u] = new
+                count[new] += 1
+                it[u] = start[u]
+                relabels += 1
+                # Khe hở: không còn đỉnh nào ở độ cao old thì các đỉnh cao hơn (dưới n) không tới được t
+                if count[old] == 0 and old < n:
+                    for v in range(n):
+                        if old < height[v] < n:
+                            count[height[v]] -= 1
+                            height[v] = n + 1
+                            count[n + 1] += 1
+                if height[u] >= 2 * n:
+                    break
+                continue
+            a = arcs[it[u]]
+            v = to[a]
+            if cap[a] > EPS and height[u] == height[v] + 1:
+                f = min(excess[u], cap[a])
+                res.push(a, f)
+                excess[u] -= f
+                excess[v] += f
+                pushes += 1
+                if v != s and v != t and not in_queue[v]:
+                    in_queue[v] = True
+                    active.append(v)
+            else:
+                it[u] += 1
+    if stats is not None:
+        stats.update(pushes=pushes, relabels=relabels)
+    return excess[t]
+
+
+# ================== ENGINE ==================
+def max_flow(csr, s, t, method="dinic", steps=None, stats=None):
+    # Trả về (giá trị luồng, luồng trên từng cạnh CSR, mảng đánh dấu phía s của lát cắt, các cạnh cắt)
+    res = ResidualGraph(csr)
+    solver = {"dinic": dinic, "push_relabel": push_relabel, "edmonds_karp": edmonds_karp}[method]
+    value = solver(res, s, t, steps, stats)
+    flows = res.edge_flows()
+    side = res.source_side(s)
+    cut = [e for e in range(csr.m) if side[csr.eu[e]] != side[csr.ev[e]]
+           and (not csr.directed or side[csr.eu[e]])]
+
+    if steps is not None:
+        # Bước cuối: các cạnh có luồng và lát cắt hẹp nhất
+        final = [('v', v, 'current') for v in range(csr.n) if side[v]]
+        final += [('e', csr.eu[e], csr.ev[e], 'path', 3) for e in range(csr.m) if abs(flows[e]) > EPS]
+        final += [('e', csr.eu[e], csr.ev[e], 'selected', 4) for e in cut]
+        steps.append(final)
+    return value, flows, side, cut
+
+
+# ================== GOMORY-HU ==================
+POOL_MIN_VERTICES = 200
+
+_worker_csr = None
+
+
+def _init_worker(csr):
+    global _worker_csr
+    _worker_csr = csr
+
+
+def _min_cut(pair):
+    # Trả về (giá trị lát cắt s-t, phía s dưới dạng bytes 0/1)
+    s, t = pair
+    res = ResidualGraph(_worker_csr)
+    value = dinic(res, s, t)
+    return value, bytes(res.source_side(s))
+
+
+class GomoryHuTree:
+    # Cây cắt: parent[v] là cha của v (gốc 0 có cha -1), weight[v] là giá trị lát cắt
+    # nhỏ nhất giữa v và parent[v]; bỏ cạnh (v, parent[v]) khỏi cây thì hai thành
+    # phần còn lại chính là một lát cắt hẹp nhất giữa v và parent[v] trong đồ thị gốc.
+    # flow_runs: số lần tính luồng thực tế đã dùng để dựng cây
+    def __init__(self, parent, weight, flow_runs=0):
+        self.n = len(parent)
+        self.flow_runs = flow_runs
+        self.parent = parent
+        self.weight = weight
+        self.children = [[] for _ in range(self.n)]
+        for v in range(self.n):
+            if parent[v] >= 0:
+                self.children[parent[v]].append(v)
+        self.depth = [0] * self.n
+        stack = [v for v in range(self.n) if parent[v] < 0]
+        while stack:
+            u = stack.pop()
+            for v in self.children[u]:
+                self.depth[v] = self.depth[u] + 1
+                stack.append(v)
+
+    def min_cut_edge(self, u, v):
+        # Cạnh cây nhẹ nhất trên đường u - v, đại diện bởi đỉnh con của cạnh đó
+        best = None
+        while u != v:
+            if self.depth[u] < self.depth[v]:
+                u, v = v, u
+            if best is None or self.weight[u] < self.weight[best]:
+                best = u
+            u = self.parent[u]
+        return best
+
+    def min_cut_value(self, u, v):
+        if u == v:
+            return INF
+        return self.weight[self.min_cut_edge(u, v)]
+
+    def cut_side(self, u, v):
+        # Mảng đánh dấu các đỉnh cùng phía với u sau khi bỏ cạnh cây nhẹ nhất
+        c = self.min_cut_edge(u, v)
+        below = [False] * self.n
+        below[c] = True
+        stack = [c]
+        while stack:
+            for w in self.children[stack.pop()]:
+                below[w] = True
+                stack.append(w)
+        if below[u]:
+            return below
+        return [not x for x in below]
+
+    def cut_edges(self, csr, u, v):
+        side = self.cut_side(u, v)
+        return self.min_cut_value(u, v), side, [e for e in range(csr.m) if side[csr.eu[e]] != side[csr.ev[e]]]
+
+
+def gomory_hu(csr, processes=None):
+    # Thuật toán Gusfield: tính luồng trên đồ thị gốc, không cần co đỉnh.
+    # Các lần tính luồng được chạy song song theo lô: kết quả của đỉnh s chỉ được
+    # áp dụng nếu cha của s vẫn chưa đổi, ngược lại s được tính lại ở lô sau
+    # (áp dụng theo thứ tự nào cũng là một cách đánh số khác của Gusfield).
+    # Chạy tuần tự thì đúng n - 1 lần; chạy theo lô có thể nhiều hơn do phải tính lại,
+    # số lần thực tế được ghi vào flow_runs của cây
+    if csr.directed:
+        raise ValueError("Cây Gomory-Hu chỉ áp dụng cho đồ thị vô hướng!")
+    n = csr.n
+    parent = [0] * n
+    weight = [0.0] * n
+    if n:
+        parent[0] = -1
+    pending = list(range(1, n))
+    runs = 0
+
+    pool = None
+    batch = 1
+    if n >= POOL_MIN_VERTICES and processes != 1:
+        processes = processes or os.cpu_count() or 1
+        if processes > 1:
+            # "spawn": tiến trình con không thừa hưởng luồng/khóa của tiến trình giao diện (fork dễ treo)
+            pool = ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn"),
+                                       initializer=_init_worker, initargs=(csr,))
+            batch = processes * 2
+    if pool is None:
+        _init_worker(csr)
+
+    try:
+        while pending:
+            chunk, pending = pending[:batch], pending[batch:]
+            pairs = [(s, parent[s]) for s in chunk]
+            runs += len(pairs)
+            results = pool.map(_min_cut, pairs) if pool else map(_min_cut, pairs)
+            stale = []
+            for (s, t), (value, side) in zip(pairs, results):
+                if parent[s] != t:
+                    stale.append(s)
+                    continue
+                weight[s] = value
+                for i in range(n):
+                    if i != s and side[i] and parent[i] == t:
+                        parent[i] = s
+                if parent[t] >= 0 and side[parent[t]]:
+                    parent[s] = parent[t]
+                    parent[t] = s
+                    weight[s], weight[t] = weight[t], value
+            pending = stale + pending
+    finally:
+        if pool:
+            pool.shutdown()
+    return GomoryHuTree(parent, weight, runs)
+
+
+# ================== ENGINE (CÂY CẮT) ==================
+class MinCutEngine:
+    # Giữ cây Gomory-Hu của đồ thị vô hướng, chỉ dựng lại khi đồ thị thay đổi;
+    # mỗi truy vấn cặp đỉnh sau đó chỉ duyệt cây (O(n))
+    def __init__(self, graph):
+        self.graph = graph
+        self._tree = None
+        self._version = -1
+
+    def has_tree(self):
+        return self._tree is not None and self._version == self.graph.version
+
+    def tree(self, processes=None):
+        if not self.has_tree():
+            self._tree = gomory_hu(self.graph.csr(), processes)
+            self._version = self.graph.version
+        return self._tree
+
+    def query(self, source, target):
+        # Trả về (giá trị lát cắt, mảng đánh dấu phía source, các cạnh cắt theo chỉ số CSR)
+        return self.tree().cut_edges(self.graph.csr(), source, target)
@@ -0,0 +1,117 @@
+from graph_core import fmt_num
+
+# ================== BIỂU DIỄN ĐỒ THỊ THEO DÒNG ==================
+# Mỗi nguồn sinh từng dòng văn bản theo yêu cầu từ CSR, không dựng sẵn ma trận
+# hay chuỗi kết quả; khung xem chỉ hỏi các dòng/cột đang hiển thị, còn xuất file
+# thì ghi lần lượt từng khối dòng.
+#   title            tiêu đề
+#   header(c0, c1)   dòng tiêu đề cột (cắt theo cột ký tự c0..c1), None nếu không có
+#   n_rows           số dòng
+#   line(i, c0, c1)  ký tự c0..c1 của dòng i
+#   width            độ dài dòng dài nhất đã biết (ký tự)
+EXPORT_CHUNK = 4096
+
+
+class AdjacencyMatrixSource:
+    def __init__(self, csr):
+        self.csr = csr
+        self.title = "MA TRẬN KỀ:"
+        self.n_rows = csr.n
+        labels = [str(i) for i in csr.ids]
+        values = [fmt_num(w) for w in set(csr.ew)]
+        self.label_width = max(2, max(map(len, labels), default=0))
+        self.cell = max(3, max(map(len, labels), default=0), max(map(len, map(str, values)), default=0))
+        self.width = self.label_width + 1 + (self.cell + 1) * csr.n
+
+    def _cells(self, c0, c1):
+        # Chỉ số các ô có ký tự nằm trong khoảng cột c0..c1
+        start = self.label_width + 1
+        first = max(0, (c0 - start) // (self.cell + 1))
+        last = min(self.csr.n, (c1 - start) // (self.cell + 1) + 1)
+        return first, last
+
+    def _join(self, prefix, cells, first, c0, c1):
+        # Ghép tiền tố và các ô từ ô first rồi cắt đúng cột c0..c1 của dòng đầy đủ
+        offset = self.label_width + 1 + first * (self.cell + 1)
+        text = " ".join(f"{x:>{self.cell}}" for x in cells)
+        if c0 < offset:
+            return (prefix + " " * (offset - len(prefix)) + text)[c0:c1]
+        return text[c0 - offset:c1 - offset]
+
+    def header(self, c0=0, c1=None):
+        c1 = self.width if c1 is None else c1
+        first, last = self._cells(c0, c1)
+        ids = self.csr.ids
+        return self._join("", (ids[j] for j in range(first, last)), first, c0, c1)
+
+    def row(self, i):
+        # Ô của dòng i: {đỉnh kề: trọng số}; cạnh song song lấy cạnh sau cùng như trước
+        csr = self.csr
+        return {csr.targets[k]: csr.weights[k] for k in range(csr.offsets[i], csr.offsets[i + 1])}
+
+    def line(self, i, c0=0, c1=None):
+        c1 = self.width if c1 is None else c1
+        first, last = self._cells(c0, c1)
+        row = self.row(i)
+        cells = (fmt_num(row[j]) if j in row else 0 for j in range(first, last))
+        return self._join(f"{self.csr.ids[i]:{self.label_width}}", cells, first, c0, c1)
+
+
+class AdjacencyListSource:
+    def __init__(self, csr, weighted):
+        self.csr = csr
+        self.weighted = weighted
+        self.title = "DANH SÁCH KỀ:"
+        self.n_rows = csr.n
+        self.width = 80
+
+    def header(self, c0=0, c1=None):
+        return None
+
+    def line(self, u, c0=0, c1=None):
+        csr = self.csr
+        ids = csr.ids
+        neighbors = []
+        for i in range(csr.offsets[u], csr.offsets[u + 1]):
+            v = ids[csr.targets[i]]
+            if self.weighted:
+                neighbors.append(f"{v}(w={fmt_num(csr.weights[i])})")
+            else:
+                neighbors.append(str(v))
+        text = f"Đỉnh {ids[u]}: " + (" → ".join(neighbors) if neighbors else "∅")
+        self.width = max(self.width, len(text))
+        return text[c0:c1]
+
+
+class EdgeListSource:
+    def __init__(self, csr, weighted):
+        self.csr = csr
+        self.weighted = weighted
+        self.title = "DANH SÁCH CẠNH:"
+        self.n_rows = csr.m
+        self.width = 60
+
+    def header(self, c0=0, c1=None):
+        return None
+
+    def line(self, i, c0=0, c1=None):
+        csr = self.csr
+        u, v = csr.ids[csr.eu[i]], csr.ids[csr.ev[i]]
+        if self.weighted:
+            text = f"Cạnh {i+1}: ({u}, {v}) - Trọng số: {fmt_num(csr.ew[i])}"
+        else:
+            text = f"Cạnh {i+1}: ({u}, {v})"
+        self.width = max(self.width, len(text))
+        return text[c0:c1]
+
+
+def export(source, path, chunk=EXPORT_CHUNK):
+    # Ghi từng khối dòng, không dựng toàn bộ nội dung trong bộ nhớ
+    with open(path, "w", encoding='utf-8') as f:
+        f.write(source.title + "\n\n")
+        header = source.header()
+        if header is not None:
+            f.write(header + "\n")
+        for start in range(0, source.n_rows, chunk):
+            end = min(source.n_rows, start + chunk)
+            f.write("\n".join(source.line(i) for i in range(start, end)) + "\n")
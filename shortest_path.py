@@ -0,0 +1,353 @@
+import heapq
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import algorithms
+from graph_core import np_view
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INF = float("inf")
+
+METHODS = {
+    "Dijkstra": "dijkstra",
+    "Dijkstra hai chiều": "bidirectional",
+    "A* (tọa độ)": "astar",
+    "BFS (không trọng số)": "bfs",
+}
+
+
+def build_path(prev, target):
+    path = []
+    cur = target
+    while cur != -1:
+        path.append(cur)
+        cur = prev[cur]
+    path.reverse()
+    return path
+
+
+# ================== DIJKSTRA ==================
+def _heap_stats(stats, settled, relaxed, pushes, left):
+    # Mỗi mục đã đẩy vào heap hoặc đã được lấy ra, hoặc còn lại khi dừng sớm
+    if stats is not None:
+        stats.update(vertices_settled=settled, edges_relaxed=relaxed,
+                     heap_pushes=pushes, heap_pops=pushes - left)
+
+
+def dijkstra(csr, source, target=None, stats=None):
+    # Trả về (dist, prev, số đỉnh đã chốt); dừng sớm khi chốt được target
+    off, tgt, wts = csr.offsets, csr.targets, csr.weights
+    dist = [INF] * csr.n
+    prev = [-1] * csr.n
+    done = [False] * csr.n
+    dist[source] = 0
+    pq = [(0, source)]
+    settled = 0
+    relaxed = 0
+    pushes = 1
+
+    while pq:
+        d, u = heapq.heappop(pq)
+        if done[u]:
+            continue
+        done[u] = True
+        settled += 1
+        if u == target:
+            break
+        begin, end = off[u], off[u + 1]
+        relaxed += end - begin
+        for i in range(begin, end):
+            v = tgt[i]
+            nd = d + wts[i]
+            if nd < dist[v]:
+                dist[v] = nd
+                prev[v] = u
+                heapq.heappush(pq, (nd, v))
+                pushes += 1
+    _heap_stats(stats, settled, relaxed, pushes, len(pq))
+    return dist, prev, settled
+
+
+def bidirectional_dijkstra(csr, source, target, stats=None):
+    if source == target:
+        _heap_stats(stats, 1, 0, 1, 0)
+        return 0, [source], 1
+
+    graphs = (csr, csr.reverse())
+    dist = ([INF] * csr.n, [INF] * csr.n)
+    prev = ([-1] * csr.n, [-1] * csr.n)
+    done = ([False] * csr.n, [False] * csr.n)
+    dist[0][source] = 0
+    dist[1][target] = 0
+    heaps = ([(0, source)], [(0, target)])
+    best = INF
+    meet = -1
+    settled = 0
+    relaxed = 0
+    pushes = 2
+
+    while heaps[0] and heaps[1]:
+        # Điều kiện dừng: không còn đường nào qua hai biên ngắn hơn best
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        d, u = heapq.heappop(heaps[side])
+        if done[side][u]:
+            continue
+        done[side][u] = True
+        settled += 1
+
+        g = graphs[side]
+        off, tgt, wts = g.offsets, g.targets, g.weights
+        my_dist, my_prev, other_dist = dist[side], prev[side], dist[1 - side]
+        begin, end = off[u], off[u + 1]
+        relaxed += end - begin
+        for i in range(begin, end):
+            v = tgt[i]
+            nd = d + wts[i]
+            if nd < my_dist[v]:
+                my_dist[v] = nd
+                my_prev[v] = u
+                heapq.heappush(heaps[side], (nd, v))
+                pushes += 1
+            if other_dist[v] < INF and my_dist[v] + other_dist[v] < best:
+                best = my_dist[v] + other_dist[v]
+                meet = v
+
+    _heap_stats(stats, settled, relaxed, pushes, len(heaps[0]) + len(heaps[1]))
+    if meet == -1:
+        return INF, None, settled
+
+    path = build_path(prev[0], meet)
+    cur = prev[1][meet]
+    while cur != -1:
+        path.append(cur)
+        cur = prev[1][cur]
+    return best, path, settled
+
+
+# ================== A* ==================
+def geometric_scale(csr, xs, ys):
+    # Hệ số lớn nhất k sao cho k * độ dài Euclid <= trọng số với mọi cạnh,
+    # khi đó h(v) = k * |v - target| là heuristic chấp nhận được và nhất quán
+    scale = INF
+    for u, v, w in zip(csr.eu, csr.ev, csr.ew):
+        length = math.hypot(xs[u] - xs[v], ys[u] - ys[v])
+        if length > 0:
+            scale = min(scale, w / length)
+    if scale == INF or scale < 0:
+        return 0.0
+    return scale
+
+
+def astar(csr, xs, ys, scale, source, target, stats=None):
+    off, tgt, wts = csr.offsets, csr.targets, csr.weights
+    tx, ty = xs[target], ys[target]
+    hypot = math.hypot
+    dist = [INF] * csr.n
+    prev = [-1] * csr.n
+    done = [False] * csr.n
+    dist[source] = 0
+    pq = [(scale * hypot(xs[source] - tx, ys[source] - ty), 0, source)]
+    settled = 0
+    relaxed = 0
+    pushes = 1
+
+    while pq:
+        _, d, u = heapq.heappop(pq)
+        if done[u]:
+            continue
+        done[u] = True
+        settled += 1
+        if u == target:
+            _heap_stats(stats, settled, relaxed, pushes, len(pq))
+            return d, build_path(prev, target), settled
+        begin, end = off[u], off[u + 1]
+        relaxed += end - begin
+        for i in range(begin, end):
+            v = tgt[i]
+            nd = d + wts[i]
+            if nd < dist[v]:
+                dist[v] = nd
+                prev[v] = u
+                heapq.heappush(pq, (nd + scale * hypot(xs[v] - tx, ys[v] - ty), nd, v))
+                pushes += 1
+    _heap_stats(stats, settled, relaxed, pushes, len(pq))
+    return INF, None, settled
+
+
+# ================== ALL-PAIRS ==================
+POOL_MIN_VERTICES = 500
+DENSE_RATIO = 0.1
+
+
+def floyd_warshall(csr):
+    # Trả về (dist, pred) với pred[s][t] là đỉnh liền trước t trên đường đi s -> t
+    n = csr.n
+    if np is None:
+        return _floyd_warshall_python(csr)
+
+    eu, ev, ew = np_view(csr.eu), np_view(csr.ev), np_view(csr.ew)
+    if not csr.directed:
+        eu, ev = np.concatenate((eu, ev)), np.concatenate((ev, eu))
+        ew = np.concatenate((ew, ew))
+
+    dist = np.full((n, n), INF)
+    np.minimum.at(dist, (eu, ev), ew)
+    np.fill_diagonal(dist, 0)
+    pred = np.where(np.isfinite(dist), np.arange(n)[:, None], -1)
+    np.fill_diagonal(pred, -1)
+
+    for k in range(n):
+        alt = dist[:, k, None] + dist[None, k, :]
+        better = alt < dist
+        np.copyto(dist, alt, where=better)
+        np.copyto(pred, np.broadcast_to(pred[k], (n, n)), where=better)
+    return dist, pred
+
+
+def _floyd_warshall_python(csr):
+    n = csr.n
+    dist = [[INF] * n for _ in range(n)]
+    pred = [[-1] * n for _ in range(n)]
+    for u in range(n):
+        dist[u][u] = 0
+        for i in range(csr.offsets[u], csr.offsets[u + 1]):
+            v = csr.targets[i]
+            if csr.weights[i] < dist[u][v]:
+                dist[u][v] = csr.weights[i]
+                pred[u][v] = u
+
+    for k in range(n):
+        dk, pk = dist[k], pred[k]
+        for i in range(n):
+            dik = dist[i][k]
+            if dik == INF:
+                continue
+            di, pi = dist[i], pred[i]
+            for j in range(n):
+                if dik + dk[j] < di[j]:
+                    di[j] = dik + dk[j]
+                    pi[j] = pk[j]
+    return dist, pred
+
+
+_worker_csr = None
+
+
+def _init_worker(csr):
+    global _worker_csr
+    _worker_csr = csr
+
+
+def _dijkstra_rows(sources):
+    rows = []
+    for s in sources:
+        dist, prev, _ = dijkstra(_worker_csr, s)
+        rows.append((dist, prev))
+    return rows
+
+
+def repeated_dijkstra(csr, processes=None):
+    # Dijkstra từ mọi đỉnh; chia nguồn thành từng khối cho các tiến trình con
+    n = csr.n
+    if n < POOL_MIN_VERTICES or processes == 1:
+        _init_worker(csr)
+        rows = _dijkstra_rows(range(n))
+    else:
+        processes = processes or os.cpu_count() or 1
+        chunk = max(1, n // (processes * 4))
+        blocks = [range(i, min(n, i + chunk)) for i in range(0, n, chunk)]
+        # "spawn": tiến trình con không thừa hưởng luồng/khóa của tiến trình giao diện (fork dễ treo)
+        with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(csr,)) as pool:
+            rows = [row for block in pool.map(_dijkstra_rows, blocks) for row in block]
+
+    dist = [row[0] for row in rows]
+    pred = [row[1] for row in rows]
+    if np is not None:
+        return np.array(dist), np.array(pred)
+    return dist, pred
+
+
+def all_pairs(csr, method="auto", processes=None):
+    if csr.min_weight < 0:
+        raise ValueError("Dijkstra/A* không hỗ trợ trọng số âm!")
+    if method == "auto":
+        dense = csr.n and len(csr.targets) >= DENSE_RATIO * csr.n * csr.n
+        method = "floyd" if np is not None and dense else "dijkstra"
+    if method == "floyd":
+        return floyd_warshall(csr)
+    return repeated_dijkstra(csr, processes)
+
+
+# ================== ENGINE ==================
+class ShortestPathEngine:
+    def __init__(self, graph):
+        self.graph = graph
+        self._geometry = None
+        self._geometry_key = None
+        self._all_pairs = None
+        self._all_pairs_version = -1
+
+    def geometry(self):
+        key = (self.graph.version, self.graph.layout_version)
+        if self._geometry_key != key:
+            csr = self.graph.csr()
+            points = [self.graph.vertices[i] for i in csr.ids]
+            xs = [p[0] for p in points]
+            ys = [p[1] for p in points]
+            self._geometry = (xs, ys, geometric_scale(csr, xs, ys))
+            self._geometry_key = key
+        return self._geometry
+
+    def has_all_pairs(self):
+        return self._all_pairs is not None and self._all_pairs_version == self.graph.version
+
+    def ensure_all_pairs(self, method="auto", processes=None):
+        if not self.has_all_pairs():
+            self._all_pairs = all_pairs(self.graph.csr(), method, processes)
+            self._all_pairs_version = self.graph.version
+        return self._all_pairs
+
+    def lookup(self, source, target):
+        dist, pred = self._all_pairs
+        d = float(dist[source][target])
+        if d == INF:
+            return INF, None
+        path = [target]
+        cur = target
+        while cur != source:
+            cur = int(pred[source][cur])
+            path.append(cur)
+        path.reverse()
+        return d, path
+
+    def query(self, source, target, method="dijkstra", stats=None):
+        # source/target và đường đi dùng chỉ số liên tục của CSR
+        # Trả về (độ dài, đường đi hoặc None, số đỉnh đã chốt)
+        # Khi đã có bảng mọi cặp còn hiệu lực thì chỉ tra bảng (số đỉnh chốt là None)
+        csr = self.graph.csr()
+        if method == "bfs":
+            dist, path = algorithms.bfs_shortest_path(csr, source, target, stats)
+            return dist, path, None
+        if csr.min_weight < 0:
+            raise ValueError("Dijkstra/A* không hỗ trợ trọng số âm!")
+        if self.has_all_pairs():
+            return self.lookup(source, target) + (None,)
+        if method == "bidirectional":
+            return bidirectional_dijkstra(csr, source, target, stats)
+        if method == "astar":
+            xs, ys, scale = self.geometry()
+            return astar(csr, xs, ys, scale, source, target, stats)
+
+        dist, prev, settled = dijkstra(csr, source, target, stats)
+        if dist[target] == INF:
+            return INF, None, settled
+        return dist[target], build_path(prev, target), settled
@@ -0,0 +1,136 @@
+import math
+
+# ================== SPATIAL INDEX (UNIFORM GRID) ==================
+class SpatialGrid:
+    # Lưới ô vuông kích thước cell; mỗi ô giữ danh sách mã đỉnh nằm trong ô
+    def __init__(self, cell=40):
+        self.cell = cell
+        self.cells = {}
+        self.pos = {}
+        self.bounds = None
+
+    def __len__(self):
+        return len(self.pos)
+
+    def _key(self, x, y):
+        return (int(x // self.cell), int(y // self.cell))
+
+    def clear(self):
+        self.cells = {}
+        self.pos = {}
+        self.bounds = None
+
+    def rebuild(self, points):
+        # Dựng hàng loạt: tính biên một lần ở cuối thay vì sau mỗi lần chèn
+        self.clear()
+        cell = self.cell
+        cells = self.cells
+        for i, p in enumerate(points):
+            if p is None:
+                continue
+            x, y = p
+            key = (int(x // cell), int(y // cell))
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [i]
+            else:
+                bucket.append(i)
+        self.pos = {i: p for i, p in enumerate(points) if p is not None}
+        if cells:
+            kx = [k[0] for k in cells]
+            ky = [k[1] for k in cells]
+            self.bounds = [min(kx), min(ky), max(kx), max(ky)]
+
+    def insert(self, idx, x, y):
+        key = self._key(x, y)
+        self.cells.setdefault(key, []).append(idx)
+        self.pos[idx] = (x, y)
+        if self.bounds is None:
+            self.bounds = [key[0], key[1], key[0], key[1]]
+        else:
+            b = self.bounds
+            b[0] = min(b[0], key[0])
+            b[1] = min(b[1], key[1])
+            b[2] = max(b[2], key[0])
+            b[3] = max(b[3], key[1])
+
+    def remove(self, idx):
+        x, y = self.pos.pop(idx)
+        key = self._key(x, y)
+        bucket = self.cells[key]
+        bucket.remove(idx)
+        if not bucket:
+            del self.cells[key]
+
+    def move(self, idx, x, y):
+        old = self.pos[idx]
+        if self._key(*old) == self._key(x, y):
+            self.pos[idx] = (x, y)
+        else:
+            self.remove(idx)
+            self.insert(idx, x, y)
+
+    def hit(self, x, y, radius):
+        # Đỉnh có mã nhỏ nhất nằm trong bán kính radius (giống cách quét tuyến tính cũ)
+        cx0, cy0 = self._key(x - radius, y - radius)
+        cx1, cy1 = self._key(x + radius, y + radius)
+        best = None
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for idx in self.cells.get((cx, cy), ()):
+                    vx, vy = self.pos[idx]
+                    if math.hypot(vx - x, vy - y) <= radius and (best is None or idx < best):
+                        best = idx
+        return best
+
+    def query(self, x0, y0, x1, y1):
+        # Mã các đỉnh nằm trong hình chữ nhật; khi khung bao phủ nhiều ô hơn số ô
+        # đang có thì duyệt các ô có sẵn thay vì từng ô trong khung
+        cx0, cy0 = self._key(x0, y0)
+        cx1, cy1 = self._key(x1, y1)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self.cells):
+            keys = [k for k in self.cells if cx0 <= k[0] <= cx1 and cy0 <= k[1] <= cy1]
+        else:
+            keys = [(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)]
+        result = []
+        for key in keys:
+            for idx in self.cells.get(key, ()):
+                x, y = self.pos[idx]
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    result.append(idx)
+        return result
+
+    def nearest(self, x, y, max_dist=math.inf):
+        # Duyệt các vành ô quanh (x, y) cho tới khi vành tiếp theo chắc chắn xa hơn kết quả
+        if not self.pos:
+            return None
+        kx, ky = self._key(x, y)
+        b = self.bounds
+        max_ring = max(abs(kx - b[0]), abs(kx - b[2]), abs(ky - b[1]), abs(ky - b[3]))
+        best, best_d = None, max_dist
+        ring = 0
+        while ring <= max_ring:
+            if best is not None and (ring - 1) * self.cell > best_d:
+                break
+            if ring * self.cell - self.cell > max_dist:
+                break
+            for cx, cy in self._ring(kx, ky, ring):
+                for idx in self.cells.get((cx, cy), ()):
+                    vx, vy = self.pos[idx]
+                    d = math.hypot(vx - x, vy - y)
+                    if d < best_d or (d == best_d and best is not None and idx < best):
+                        best, best_d = idx, d
+            ring += 1
+        return best
+
+    @staticmethod
+    def _ring(kx, ky, r):
+        if r == 0:
+            yield (kx, ky)
+            return
+        for cx in range(kx - r, kx + r + 1):
+            yield (cx, ky - r)
+            yield (cx, ky + r)
+        for cy in range(ky - r + 1, ky + r):
+            yield (kx - r, cy)
+            yield (kx + r, cy)
@@ -0,0 +1,178 @@
+import math
+import os
+import re
+from array import array
+
+from graph_core import Graph, np_view
+from graph_file import FLOAT_WEIGHT, INT_WEIGHT, NO_WEIGHT
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ================== STREAMING TEXT IMPORT ==================
+# Hai định dạng văn bản, mỗi dòng một bản ghi; dòng trống và phần sau '#' hoặc '%'
+# được bỏ qua:
+#   danh sách cạnh:  u v [w]
+#   danh sách kề:    u: v1 v2:w2 ...     (dấu ':' sau u là tùy chọn)
+# Nhãn đỉnh là chuỗi bất kỳ; nếu mọi nhãn đều là số nguyên thì đỉnh được đánh số
+# theo thứ tự nhãn, ngược lại theo thứ tự xuất hiện.
+# File được đọc theo từng khối byte vào các mảng kiểu cố định (đầu/cuối cạnh, trọng số,
+# loại trọng số như file .grb); cạnh trùng chỉ bị loại một lần khi dựng đồ thị.
+CHUNK_SIZE = 1 << 20
+SPACING = 60
+
+FORMATS = ("edges", "adjacency")
+INTEGER = re.compile(rb"-?\d+")
+
+
+def _number(token):
+    try:
+        return int(token)
+    except ValueError:
+        return float(token)
+
+
+class TextImporter:
+    def __init__(self, path, fmt="edges", directed=False, chunk_size=CHUNK_SIZE):
+        if fmt not in FORMATS:
+            raise ValueError(f"Định dạng không hỗ trợ: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.directed = directed
+        self.chunk_size = chunk_size
+        self.total = os.path.getsize(path)
+        self.done = 0
+        self.line_no = 0
+        self.labels = {}
+        self.eu = array('l')
+        self.ev = array('l')
+        self.ew = array('d')
+        self.weight_kind = bytearray()
+        self.weighted = False
+
+    def run(self):
+        # Generator: đọc một khối mỗi lần next(), trả về (số byte đã đọc, tổng số byte)
+        parse = self._parse_edge if self.fmt == "edges" else self._parse_adjacency
+        rest = b""
+        with open(self.path, "rb") as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                self.done += len(chunk)
+                lines = (rest + chunk).split(b"\n")
+                rest = lines.pop()
+                for line in lines:
+                    self._line(line, parse)
+                yield self.done, self.total
+        if rest:
+            self._line(rest, parse)
+        yield self.done, self.total
+
+    def read_all(self):
+        for _ in self.run():
+            pass
+        return self.graph()
+
+    def _line(self, line, parse):
+        self.line_no += 1
+        for mark in (b"#", b"%"):
+            cut = line.find(mark)
+            if cut != -1:
+                line = line[:cut]
+        tokens = line.split()
+        if tokens:
+            try:
+                parse(tokens)
+            except ValueError:
+                raise ValueError(f"Dòng {self.line_no} không hợp lệ: {line.decode(errors='replace').strip()}")
+
+    def _vertex(self, token):
+        v = self.labels.get(token)
+        if v is None:
+            v = self.labels[token] = len(self.labels)
+        return v
+
+    def _add(self, u, v, weight):
+        self.eu.append(u)
+        self.ev.append(v)
+        if weight is None:
+            self.ew.append(0.0)
+            self.weight_kind.append(NO_WEIGHT)
+        else:
+            self.ew.append(weight)
+            self.weight_kind.append(INT_WEIGHT if isinstance(weight, int) else FLOAT_WEIGHT)
+            self.weighted = True
+
+    def _parse_edge(self, tokens):
+        if len(tokens) not in (2, 3):
+            raise ValueError
+        weight = _number(tokens[2]) if len(tokens) == 3 else None
+        self._add(self._vertex(tokens[0]), self._vertex(tokens[1]), weight)
+
+    def _parse_adjacency(self, tokens):
+        u = self._vertex(tokens[0].rstrip(b":"))
+        for token in tokens[1:]:
+            if token == b":":
+                continue
+            label, sep, weight = token.partition(b":")
+            self._add(u, self._vertex(label), _number(weight) if sep else None)
+
+    def _unique_edges(self, n):
+        # Bỏ cạnh trùng như khi vẽ tay (đồ thị vô hướng coi (u, v) và (v, u) là một):
+        # gói mỗi cặp thành một khóa int64, giữ lần xuất hiện đầu tiên theo thứ tự trong file
+        n = max(1, n)
+        if np is not None:
+            u, v = np_view(self.eu).astype(np.int64), np_view(self.ev).astype(np.int64)
+            if not self.directed:
+                u, v = np.minimum(u, v), np.maximum(u, v)
+            _, first = np.unique(u * n + v, return_index=True)
+            first.sort()
+            return first
+        keys = array('q', (u * n + v if self.directed or u <= v else v * n + u
+                           for u, v in zip(self.eu, self.ev)))
+        keep = array('q')
+        last = None
+        for i in sorted(range(len(keys)), key=keys.__getitem__):
+            if keys[i] != last:
+                keep.append(i)
+                last = keys[i]
+        return sorted(keep)
+
+    def graph(self):
+        n = len(self.labels)
+        keep = self._unique_edges(n)
+        remap = None
+        if all(INTEGER.fullmatch(label) for label in self.labels):
+            # Nhãn số nguyên: đánh số lại theo thứ tự nhãn
+            order = sorted(self.labels, key=int)
+            remap = array('l', [0]) * n
+            for new, label in enumerate(order):
+                remap[self.labels[label]] = new
+        if np is not None:
+            eu, ev = np_view(self.eu)[keep], np_view(self.ev)[keep]
+            if remap is not None:
+                remap = np_view(remap)
+                eu, ev = remap[eu], remap[ev]
+            eu, ev = array('l', eu.tobytes()), array('l', ev.tobytes())
+        else:
+            eu = array('l', (self.eu[i] for i in keep))
+            ev = array('l', (self.ev[i] for i in keep))
+            if remap is not None:
+                eu = array('l', (remap[u] for u in eu))
+                ev = array('l', (remap[v] for v in ev))
+
+        kind, ew = self.weight_kind, self.ew
+        if not self.weighted:
+            weights = [None] * len(eu)
+        else:
+            weights = [None if kind[i] == NO_WEIGHT else int(ew[i]) if kind[i] == INT_WEIGHT else ew[i]
+                       for i in keep]
+
+        # Chưa có tọa độ: xếp các đỉnh thành lưới vuông
+        cols = max(1, math.ceil(math.sqrt(n)))
+        vertices = [(SPACING // 2 + (i % cols) * SPACING, SPACING // 2 + (i // cols) * SPACING)
+                    for i in range(n)]
+        return Graph.from_arrays(vertices, eu, ev, weights, self.directed, self.weighted)
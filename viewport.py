@@ -0,0 +1,139 @@
+import math
+
+from graph_core import np_view
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ================== VIEWPORT (ZOOM / PAN) ==================
+# Tọa độ đỉnh lưu trong hệ "thế giới"; màn hình = (thế giới - gốc) * tỉ lệ.
+# Mỗi lần vẽ chỉ tạo item cho phần đồ thị nằm trong khung nhìn, với mức chi tiết
+# giảm dần khi thu nhỏ hoặc khi có quá nhiều phần tử nhìn thấy:
+#   'full'     đỉnh, nhãn, trọng số, cạnh đủ độ dày
+#   'simple'   bỏ nhãn và trọng số, cạnh mảnh
+#   'cluster'  gom các đỉnh cùng một ô lưới màn hình thành một chấm, cạnh nối các chấm
+MIN_SCALE = 0.02
+MAX_SCALE = 8.0
+ZOOM_STEP = 1.2
+LABEL_SCALE = 0.6
+CLUSTER_SCALE = 0.25
+CLUSTER_PX = 24
+MAX_LABELED_VERTICES = 1500
+MAX_PLAIN_VERTICES = 5000
+MAX_PLAIN_EDGES = 20000
+MAX_CLUSTER_EDGES = 5000
+
+
+class Viewport:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.scale = 1.0
+        self.ox = 0.0
+        self.oy = 0.0
+
+    def to_screen(self, x, y):
+        return (x - self.ox) * self.scale, (y - self.oy) * self.scale
+
+    def to_world(self, sx, sy):
+        return sx / self.scale + self.ox, sy / self.scale + self.oy
+
+    def zoom_at(self, sx, sy, factor):
+        # Giữ nguyên điểm thế giới nằm dưới con trỏ
+        wx, wy = self.to_world(sx, sy)
+        self.scale = min(MAX_SCALE, max(MIN_SCALE, self.scale * factor))
+        self.ox = wx - sx / self.scale
+        self.oy = wy - sy / self.scale
+
+    def pan(self, dx, dy):
+        self.ox -= dx / self.scale
+        self.oy -= dy / self.scale
+
+    def fit(self, points, width, height, margin=40):
+        xs = [p[0] for p in points if p is not None]
+        ys = [p[1] for p in points if p is not None]
+        if not xs:
+            self.reset()
+            return
+        x0, x1, y0, y1 = min(xs), max(xs), min(ys), max(ys)
+        sx = (width - 2 * margin) / max(x1 - x0, 1)
+        sy = (height - 2 * margin) / max(y1 - y0, 1)
+        self.scale = min(MAX_SCALE, max(MIN_SCALE, min(sx, sy)))
+        self.ox = (x0 + x1) / 2 - width / 2 / self.scale
+        self.oy = (y0 + y1) / 2 - height / 2 / self.scale
+
+    def world_rect(self, width, height, margin=0):
+        x0, y0 = self.to_world(-margin, -margin)
+        x1, y1 = self.to_world(width + margin, height + margin)
+        return x0, y0, x1, y1
+
+    def level(self, n_vertices, n_edges):
+        if self.scale < CLUSTER_SCALE or n_vertices > MAX_PLAIN_VERTICES or n_edges > MAX_PLAIN_EDGES:
+            return 'cluster'
+        if self.scale < LABEL_SCALE or n_vertices > MAX_LABELED_VERTICES:
+            return 'simple'
+        return 'full'
+
+
+# ================== CULLING ==================
+class Scene:
+    # Mảng tọa độ theo chỉ số liên tục của CSR, dựng lại khi đồ thị hoặc bố cục đổi
+    def __init__(self, graph):
+        self.graph = graph
+        self._key = None
+
+    def arrays(self):
+        graph = self.graph
+        key = (id(graph), graph.version, graph.layout_version)
+        if self._key != key:
+            csr = graph.csr()
+            points = [graph.vertices[i] for i in csr.ids]
+            xs = [p[0] for p in points]
+            ys = [p[1] for p in points]
+            if np is not None:
+                xs, ys = np.array(xs, dtype=float), np.array(ys, dtype=float)
+            self._arrays = (csr, xs, ys)
+            self._key = key
+        return self._arrays
+
+
+def visible_edges(csr, xs, ys, rect):
+    # Chỉ số cạnh CSR có hộp bao cắt khung nhìn (kể cả cạnh có hai đầu đều ở ngoài)
+    x0, y0, x1, y1 = rect
+    if np is not None:
+        eu, ev = np_view(csr.eu), np_view(csr.ev)
+        ax, ay, bx, by = xs[eu], ys[eu], xs[ev], ys[ev]
+        mask = ((np.minimum(ax, bx) <= x1) & (np.maximum(ax, bx) >= x0)
+                & (np.minimum(ay, by) <= y1) & (np.maximum(ay, by) >= y0))
+        return np.flatnonzero(mask).tolist()
+    result = []
+    for e, (u, v) in enumerate(zip(csr.eu, csr.ev)):
+        ax, ay, bx, by = xs[u], ys[u], xs[v], ys[v]
+        if min(ax, bx) <= x1 and max(ax, bx) >= x0 and min(ay, by) <= y1 and max(ay, by) >= y0:
+            result.append(e)
+    return result
+
+
+def clusters(viewport, points, ids):
+    # Gom các đỉnh (mã ổn định) theo ô lưới CLUSTER_PX điểm ảnh trên màn hình;
+    # trả về {ô: [tổng x, tổng y, số đỉnh]} và hàm đổi tọa độ -> ô
+    cell = CLUSTER_PX / viewport.scale
+
+    def key(x, y):
+        return (math.floor(x / cell), math.floor(y / cell))
+
+    groups = {}
+    for v in ids:
+        x, y = points[v]
+        k = key(x, y)
+        g = groups.get(k)
+        if g is None:
+            groups[k] = [x, y, 1]
+        else:
+            g[0] += x
+            g[1] += y
+            g[2] += 1
+    return groups, key
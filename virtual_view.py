@@ -0,0 +1,112 @@
+import tkinter as tk
+from tkinter import filedialog, messagebox
+
+import representations
+
+# ================== VIRTUALIZED TEXT VIEW ==================
+# Cửa sổ xem chỉ vẽ các dòng/cột đang hiển thị của một nguồn trong
+# representations; cuộn chỉ đổi vị trí dòng/cột đầu rồi vẽ lại phần nhìn thấy.
+FONT = ('Courier', 10)
+
+
+class VirtualView:
+    def __init__(self, root, title, source):
+        self.source = source
+        self.top = 0
+        self.left = 0
+        self.window = tk.Toplevel(root)
+        self.window.title(title)
+        self.window.geometry("600x500")
+
+        bar = tk.Frame(self.window)
+        bar.pack(fill=tk.X, padx=10, pady=(10, 0))
+        tk.Label(bar, text=f"{source.title} {source.n_rows} dòng").pack(side=tk.LEFT)
+        tk.Button(bar, text="Xuất ra file...", command=self.export).pack(side=tk.RIGHT)
+
+        body = tk.Frame(self.window)
+        body.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.vbar = tk.Scrollbar(body, orient=tk.VERTICAL, command=self.on_yview)
+        self.vbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.hbar = tk.Scrollbar(body, orient=tk.HORIZONTAL, command=self.on_xview)
+        self.hbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.canvas = tk.Canvas(body, bg="white", highlightthickness=0)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+
+        probe = self.canvas.create_text(0, 0, text="0", font=FONT, anchor=tk.NW)
+        x0, y0, x1, y1 = self.canvas.bbox(probe) or (0, 0, 8, 15)
+        self.canvas.delete(probe)
+        self.char_w = max(1, x1 - x0)
+        self.line_h = max(1, y1 - y0 + 2)
+
+        self.canvas.bind("<Configure>", lambda e: self.render())
+        self.canvas.bind("<MouseWheel>", self.on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.scroll_rows(-3))
+        self.canvas.bind("<Button-5>", lambda e: self.scroll_rows(3))
+        self.render()
+
+    def visible(self):
+        rows = max(1, self.canvas.winfo_height() // self.line_h)
+        cols = max(1, self.canvas.winfo_width() // self.char_w)
+        return rows, cols
+
+    def render(self):
+        source = self.source
+        rows, cols = self.visible()
+        c0, c1 = self.left, self.left + cols
+        self.canvas.delete("row")
+        y = 0
+        header = source.header(c0, c1)
+        if header is not None:
+            self.canvas.create_text(0, y, text=header, font=FONT, anchor=tk.NW, tags="row", fill='#555')
+            y += self.line_h
+            rows -= 1
+        end = min(source.n_rows, self.top + rows)
+        for i in range(self.top, end):
+            self.canvas.create_text(0, y, text=source.line(i, c0, c1), font=FONT, anchor=tk.NW, tags="row")
+            y += self.line_h
+
+        total = max(1, source.n_rows)
+        self.vbar.set(self.top / total, end / total)
+        width = max(1, source.width)
+        self.hbar.set(min(1, c0 / width), min(1, c1 / width))
+
+    def _clamp(self):
+        rows, cols = self.visible()
+        self.top = max(0, min(self.top, self.source.n_rows - rows + 1))
+        self.left = max(0, min(self.left, self.source.width - cols + 1))
+
+    def _move(self, attr, total, page, args):
+        if args[0] == "moveto":
+            setattr(self, attr, int(float(args[1]) * total))
+        elif args[0] == "scroll":
+            step = page if args[2] == "pages" else 1
+            setattr(self, attr, getattr(self, attr) + int(args[1]) * step)
+        self._clamp()
+        self.render()
+
+    def on_yview(self, *args):
+        self._move("top", self.source.n_rows, self.visible()[0], args)
+
+    def on_xview(self, *args):
+        self._move("left", self.source.width, self.visible()[1], args)
+
+    def scroll_rows(self, k):
+        self.top += k
+        self._clamp()
+        self.render()
+
+    def on_wheel(self, event):
+        self.scroll_rows(-3 if event.delta > 0 else 3)
+
+    def export(self):
+        file = filedialog.asksaveasfilename(
+            parent=self.window,
+            defaultextension=".txt",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if file:
+            try:
+                representations.export(self.source, file)
+                messagebox.showinfo("Thành công", "Đã xuất ra file!", parent=self.window)
+            except Exception as e:
+                messagebox.showerror("Lỗi", f"Không thể xuất file: {str(e)}", parent=self.window)